@@ -1,27 +1,28 @@
 """Research Tools.
 
 This module provides search and content processing utilities for the research agent,
-using Tavily for URL discovery and fetching full webpage content.
+using Tavily for URL discovery and fetching the main content of webpages.
 """
 
 import httpx
 from langchain_core.tools import InjectedToolArg, tool
-from markdownify import markdownify
 from tavily import TavilyClient
 from typing_extensions import Annotated, Literal
 
+from research_agent.extract import extract_markdown
+
 tavily_client = TavilyClient()
 
 
 def fetch_webpage_content(url: str, timeout: float = 10.0) -> str:
-    """Fetch and convert webpage content to markdown.
+    """Fetch a webpage and convert its main content to markdown.
 
     Args:
         url: URL to fetch
         timeout: Request timeout in seconds
 
     Returns:
-        Webpage content as markdown
+        Main content of the webpage as markdown, within the extraction token budget
     """
     headers = {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
@@ -30,7 +31,7 @@ def fetch_webpage_content(url: str, timeout: float = 10.0) -> str:
     try:
         response = httpx.get(url, headers=headers, timeout=timeout)
         response.raise_for_status()
-        return markdownify(response.text)
+        return extract_markdown(response.text, url=url)
     except Exception as e:
         return f"Error fetching content from {url}: {str(e)}"
 
@@ -0,0 +1,83 @@
+"""Benchmark main-content extraction against markdownify over saved pages.
+
+Save a corpus of pages once (HTML files named after their URL):
+    uv run python -m scripts.bench_extract pages/ --save https://example.com/a https://example.com/b
+
+Then compare conversion time and output size:
+    uv run python -m scripts.bench_extract pages/ --max-tokens 4000
+
+extract_markdown is timed twice: without a token budget, so its timing is not
+helped by stopping early, and with the budget the search tool uses.
+"""
+
+import argparse
+import re
+import statistics
+import time
+from pathlib import Path
+
+from markdownify import markdownify
+
+from src.extract import MAX_PAGE_TOKENS, approx_tokens, extract_markdown
+from src.fetch import get_fetcher
+
+
+def save_pages(corpus: Path, urls: list[str]) -> None:
+    corpus.mkdir(parents=True, exist_ok=True)
+    for page in get_fetcher().fetch_many(urls):
+        if page.error is not None:
+            print(f"skip {page.url}: {page.error}")
+            continue
+        name = re.sub(r"[^A-Za-z0-9._-]+", "_", page.url.split("://", 1)[-1])[:150]
+        (corpus / f"{name}.html").write_text(page.text, encoding="utf-8")
+        print(f"saved {page.url}")
+
+
+def bench(converter, pages: list[str], repeat: int) -> dict:
+    times, tokens = [], []
+    for html in pages:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            markdown = converter(html)
+        times.append((time.perf_counter() - start) / repeat)
+        tokens.append(approx_tokens(markdown))
+    return {
+        "total_s": sum(times),
+        "median_ms": statistics.median(times) * 1000,
+        "max_ms": max(times) * 1000,
+        "tokens": sum(tokens),
+        "median_tokens": statistics.median(tokens),
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark extract_markdown against markdownify.")
+    parser.add_argument("corpus", type=Path, help="Directory of saved .html pages")
+    parser.add_argument("--save", nargs="+", metavar="URL", help="Fetch and save these pages into the corpus first")
+    parser.add_argument("--max-tokens", type=int, default=MAX_PAGE_TOKENS, help="Token budget of extract_markdown")
+    parser.add_argument("--repeat", type=int, default=3, help="Conversions per page (timings are averaged)")
+    args = parser.parse_args(argv)
+
+    if args.save:
+        save_pages(args.corpus, args.save)
+    pages = [path.read_text(encoding="utf-8", errors="replace") for path in sorted(args.corpus.glob("*.html"))]
+    if not pages:
+        parser.error(f"no .html pages in {args.corpus}")
+
+    results = {
+        "markdownify": bench(markdownify, pages, args.repeat),
+        "extract (no budget)": bench(lambda html: extract_markdown(html, max_tokens=None), pages, args.repeat),
+        f"extract ({args.max_tokens} tok)": bench(lambda html: extract_markdown(html, args.max_tokens), pages, args.repeat),
+    }
+    print(f"{len(pages)} pages, {sum(len(p) for p in pages) / 1e6:.1f} MB of HTML")
+    print(f"{'converter':<22}{'total s':>9}{'median ms':>11}{'max ms':>9}{'tokens':>10}{'median tok':>12}")
+    for name, r in results.items():
+        print(f"{name:<22}{r['total_s']:>9.2f}{r['median_ms']:>11.1f}{r['max_ms']:>9.1f}{r['tokens']:>10}{r['median_tokens']:>12.0f}")
+    base = results["markdownify"]
+    for name, r in list(results.items())[1:]:
+        print(f"{name}: speedup {base['total_s'] / max(r['total_s'], 1e-9):.1f}x, "
+              f"tokens {r['tokens'] / max(base['tokens'], 1):.0%} of markdownify")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+import copy
+import re
+from collections.abc import Iterator
+
+import lxml.html
+from lxml import etree
+
+MAX_PAGE_TOKENS = 4000
+CHARS_PER_TOKEN = 4
+# Main content shorter than this (characters) is treated as a failed pick
+MIN_CONTENT_CHARS = 200
+
+# Never content
+BOILERPLATE_TAGS = (
+    "script", "style", "noscript", "template", "iframe", "svg", "canvas",
+    "form", "button", "input", "select", "textarea", "nav", "footer", "aside",
+)
+
+# class/id patterns of page chrome, and of content containers
+UNLIKELY = re.compile(
+    r"banner|breadcrumb|comment|cookie|disqus|footer|header|legal|menu|modal|"
+    r"navbar|newsletter|outbrain|pagination|popup|promo|related|share|sidebar|"
+    r"skip|social|sponsor|subscribe|taboola|widget|advert",
+    re.I,
+)
+LIKELY = re.compile(r"article|body|content|entry|main|post|story|text", re.I)
+NEGATIVE = re.compile(
+    r"hidden|banner|comment|contact|foot|masthead|meta|promo|related|share|"
+    r"sidebar|sponsor|tags|widget|nav|menu|social|cookie|subscribe",
+    re.I,
+)
+POSITIVE = re.compile(r"article|body|content|entry|main|page|post|text|blog|story", re.I)
+
+BLOCK_TAGS = {
+    "address", "article", "blockquote", "dd", "details", "div", "dl", "dt",
+    "figcaption", "figure", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr",
+    "li", "main", "ol", "p", "pre", "section", "summary", "table", "tbody",
+    "thead", "tfoot", "tr", "ul",
+}
+PARAGRAPH_TAGS = ("p", "pre", "td", "blockquote", "div")
+TAG_WEIGHTS = {
+    "article": 10, "main": 10, "section": 3, "div": 5, "pre": 3, "td": 3,
+    "blockquote": 3, "ol": -3, "ul": -3, "dl": -3, "li": -3, "th": -5,
+    "h1": -5, "h2": -5, "h3": -5, "h4": -5, "h5": -5, "h6": -5,
+}
+
+_BREAK = "\x00"
+_whitespace = re.compile(r"\s+")
+
+
+def approx_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN
+
+
+def _squash(text: str) -> str:
+    return _whitespace.sub(" ", text).replace(f" {_BREAK} ", "\n").replace(_BREAK, "\n").strip()
+
+
+def _text_length(el) -> int:
+    return len(_whitespace.sub(" ", el.text_content()).strip())
+
+
+# ----- boilerplate removal and scoring -----
+
+
+def _clean(root, strip_unlikely: bool = True) -> None:
+    etree.strip_elements(root, *BOILERPLATE_TAGS, etree.Comment, with_tail=False)
+    for el in list(root.iter()):
+        if el.getparent() is None or not isinstance(el.tag, str):
+            continue
+        attrs = f"{el.get('class', '')} {el.get('id', '')}"
+        hidden = (
+            el.get("hidden") is not None
+            or el.get("aria-hidden") == "true"
+            or "display:none" in el.get("style", "").replace(" ", "")
+        )
+        unlikely = (
+            strip_unlikely
+            and el.tag not in ("html", "body", "article", "main", "a")
+            and UNLIKELY.search(attrs)
+            and not LIKELY.search(attrs)
+        )
+        if hidden or unlikely:
+            el.drop_tree()
+
+
+def _class_weight(el) -> int:
+    attrs = f"{el.get('class', '')} {el.get('id', '')}"
+    return (25 if POSITIVE.search(attrs) else 0) - (25 if NEGATIVE.search(attrs) else 0)
+
+
+def _link_density(el) -> float:
+    text_length = _text_length(el)
+    if not text_length:
+        return 1.0
+    return sum(_text_length(a) for a in el.iter("a")) / text_length
+
+
+def _main_content(root) -> list:
+    """Return the elements that make up the main content (readability-style scoring)."""
+    scores: dict = {}
+    for el in root.iter(*PARAGRAPH_TAGS):
+        if el.tag == "div" and any(child.tag in BLOCK_TAGS for child in el):
+            continue
+        text = _squash(el.text_content())
+        if len(text) < 25:
+            continue
+        score = 1 + text.count(",") + min(len(text) // 100, 3)
+        parent = el.getparent()
+        for ancestor, share in ((parent, 1.0), (parent.getparent() if parent is not None else None, 0.5)):
+            if ancestor is None or not isinstance(ancestor.tag, str):
+                continue
+            if ancestor not in scores:
+                scores[ancestor] = TAG_WEIGHTS.get(ancestor.tag, 0) + _class_weight(ancestor)
+            scores[ancestor] += score * share
+    if not scores:
+        body = root.find("body")
+        return [body if body is not None else root]
+
+    for el in scores:
+        scores[el] *= 1 - _link_density(el)
+    top = max(scores, key=scores.get)
+    parent = top.getparent()
+    if parent is None:
+        return [top]
+
+    threshold = max(10.0, scores[top] * 0.2)
+    content = []
+    for sibling in parent:
+        if not isinstance(sibling.tag, str):
+            continue
+        if sibling is top or scores.get(sibling, float("-inf")) >= threshold:
+            content.append(sibling)
+        elif sibling.tag == "p" and _text_length(sibling) >= 80 and _link_density(sibling) < 0.25:
+            content.append(sibling)
+    return content
+
+
+def _title(content: list):
+    """Return the closest h1 above the content (e.g. in an article header), unless the content has one."""
+    if not content or any(el.tag == "h1" or el.find(".//h1") is not None for el in content):
+        return None
+    for ancestor in content[0].iterancestors():
+        heading = ancestor.find(".//h1")
+        if heading is not None:
+            return heading
+    return None
+
+
+def _select(root, strip_unlikely: bool) -> list:
+    _clean(root, strip_unlikely)
+    content = _main_content(root)
+    title = _title(content)
+    return content if title is None else [title, *content]
+
+
+def _content_length(content: list) -> int:
+    return sum(_text_length(el) for el in content)
+
+
+# ----- markdown conversion -----
+
+
+def _inline(el) -> str:
+    parts = [el.text or ""]
+    for child in el:
+        parts.append(_inline_element(child))
+        parts.append(child.tail or "")
+    return "".join(parts)
+
+
+def _inline_element(el) -> str:
+    if not isinstance(el.tag, str):
+        return ""
+    if el.tag == "br":
+        return f" {_BREAK} "
+    text = _inline(el)
+    label = _squash(text)
+    if not label:
+        return text
+    if el.tag == "a":
+        href = el.get("href", "")
+        if href and not href.startswith(("#", "javascript:")):
+            return f"[{label}]({href})"
+    elif el.tag in ("strong", "b"):
+        return f" **{label}** "
+    elif el.tag in ("em", "i"):
+        return f" *{label}* "
+    elif el.tag == "code":
+        return f" `{label}` "
+    return text
+
+
+def _blocks(el, skip_lists: bool = False) -> Iterator[str]:
+    """Yield the markdown blocks of an element's content, in document order."""
+    buffer = [el.text or ""]
+    for child in el:
+        if skip_lists and child.tag in ("ul", "ol"):
+            pass
+        elif isinstance(child.tag, str) and child.tag in BLOCK_TAGS:
+            text = _squash("".join(buffer))
+            if text:
+                yield text
+            buffer = []
+            yield from _block(child)
+        else:
+            buffer.append(_inline_element(child))
+        buffer.append(child.tail or "")
+    text = _squash("".join(buffer))
+    if text:
+        yield text
+
+
+def _block(el) -> Iterator[str]:
+    tag = el.tag
+    if tag in ("h1", "h2", "h3", "h4", "h5", "h6"):
+        text = _squash(_inline(el))
+        if text:
+            yield f"{'#' * int(tag[1])} {text}"
+    elif tag == "pre":
+        text = el.text_content().strip("\n")
+        if text.strip():
+            yield f"```\n{text}\n```"
+    elif tag in ("ul", "ol"):
+        yield from _list(el, 0)
+    elif tag == "blockquote":
+        for block in _blocks(el):
+            yield "\n".join(f"> {line}" for line in block.splitlines())
+    elif tag == "table":
+        rows = [
+            [_squash(_inline(cell)).replace("|", "\\|") for cell in row if cell.tag in ("td", "th")]
+            for row in el.iter("tr")
+        ]
+        rows = [row for row in rows if any(row)]
+        if rows:
+            lines = [f"| {' | '.join(row)} |" for row in rows]
+            lines.insert(1, "|" + " --- |" * len(rows[0]))
+            yield "\n".join(lines)
+    elif tag == "hr":
+        yield "---"
+    else:
+        yield from _blocks(el)
+
+
+def _list(el, depth: int) -> Iterator[str]:
+    items = []
+    for index, item in enumerate((child for child in el if child.tag == "li"), 1):
+        marker = f"{index}." if el.tag == "ol" else "-"
+        text = " ".join(_blocks(item, skip_lists=True))
+        if text:
+            items.append(f"{'  ' * depth}{marker} {text}")
+        for child in item:
+            if child.tag in ("ul", "ol"):
+                items.extend(_list(child, depth + 1))
+    if items:
+        yield "\n".join(items)
+
+
+# ----- pipeline -----
+
+
+def _parse(html: str):
+    try:
+        return lxml.html.document_fromstring(html)
+    except ValueError:
+        # Pages with an XML encoding declaration must be parsed as bytes
+        return lxml.html.document_fromstring(html.encode("utf-8"))
+
+
+def extract_markdown(html: str, max_tokens: int | None = MAX_PAGE_TOKENS, url: str | None = None) -> str:
+    """Convert the main content of an HTML page to markdown within a token budget.
+
+    Boilerplate (scripts, navigation, footers, sidebars) is removed, the main
+    content is picked by text density, and conversion stops once `max_tokens`
+    (approximate) have been produced; `max_tokens=None` converts all of it.
+    """
+    try:
+        root = _parse(html)
+    except etree.ParserError:
+        return ""
+    if url:
+        root.make_links_absolute(url, handle_failures="discard")
+    # As in readability: drop page chrome by class/id first, and if that leaves
+    # too little text (the filter also matches wrappers such as "has-sidebar"
+    # or "menu-open" around the article), try again with the filter off
+    content = _select(copy.deepcopy(root), strip_unlikely=True)
+    if _content_length(content) < MIN_CONTENT_CHARS:
+        content = _select(root, strip_unlikely=False)
+    # Still too little text usually means the scorer picked a fragment; use the whole body
+    if _content_length(content) < MIN_CONTENT_CHARS:
+        body = root.find("body")
+        content = [body if body is not None else root]
+
+    blocks, used = [], 0
+    for element in content:
+        for block in _block(element):
+            cost = approx_tokens(block)
+            if max_tokens is not None and used + cost > max_tokens:
+                remaining = (max_tokens - used) * CHARS_PER_TOKEN
+                if remaining > 200:
+                    cut = block[:remaining].rsplit(" ", 1)[0] + " ..."
+                    # Close a cut code block so the note below is not part of it
+                    if block.startswith("```"):
+                        cut += "\n```"
+                    blocks.append(cut)
+                blocks.append(f"[Content truncated to about {max_tokens} tokens]")
+                return "\n\n".join(blocks)
+            blocks.append(block)
+            used += cost
+    return "\n\n".join(blocks)
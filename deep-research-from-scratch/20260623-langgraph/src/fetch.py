@@ -0,0 +1,136 @@
+import asyncio
+import importlib.util
+import threading
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+import httpx
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+
+MAX_CONNECTIONS = 20
+MAX_CONNECTIONS_PER_HOST = 4
+MAX_RESPONSE_BYTES = 2_000_000
+FETCH_TIMEOUT = 10.0
+
+# httpx only speaks HTTP/2 with the optional h2 package installed
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+@dataclass
+class FetchResult:
+    url: str
+    text: str = ""
+    error: str | None = None
+    truncated: bool = False
+
+
+class PageFetcher:
+    """Shared pooled HTTP/2 client for fetching many pages concurrently.
+
+    The client lives on a background event loop so synchronous tools can use it;
+    connections are reused across tool calls. Each host gets at most
+    `max_connections_per_host` concurrent requests, and response bodies are
+    streamed and cut off at `max_bytes`. Without the h2 package the client
+    falls back to HTTP/1.1.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = MAX_CONNECTIONS,
+        max_connections_per_host: int = MAX_CONNECTIONS_PER_HOST,
+        max_bytes: int = MAX_RESPONSE_BYTES,
+        timeout: float = FETCH_TIMEOUT,
+        http2: bool = HTTP2_AVAILABLE,
+    ):
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self._client = httpx.AsyncClient(
+            http2=http2,
+            follow_redirects=True,
+            headers={"User-Agent": USER_AGENT},
+            timeout=httpx.Timeout(timeout),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+        )
+        # Per-host semaphores, dropped once no request to the host is in flight
+        self._host_slots: dict[str, asyncio.Semaphore] = {}
+        self._host_users: dict[str, int] = {}
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="page-fetcher", daemon=True
+        )
+        self._thread.start()
+
+    @asynccontextmanager
+    async def _host_slot(self, host: str):
+        # Only touched from the fetcher's event loop, so no lock is needed
+        slot = self._host_slots.setdefault(
+            host, asyncio.Semaphore(self.max_connections_per_host)
+        )
+        self._host_users[host] = self._host_users.get(host, 0) + 1
+        try:
+            async with slot:
+                yield
+        finally:
+            self._host_users[host] -= 1
+            if not self._host_users[host]:
+                del self._host_users[host], self._host_slots[host]
+
+    async def _read_capped(self, response: httpx.Response) -> tuple[bytes, bool]:
+        chunks, size = [], 0
+        async for chunk in response.aiter_bytes():
+            chunk = chunk[: self.max_bytes - size]
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= self.max_bytes:
+                return b"".join(chunks), True
+        return b"".join(chunks), False
+
+    async def fetch(self, url: str, timeout: float | None = None) -> FetchResult:
+        """Fetch one page; errors are returned in the result instead of raised."""
+        try:
+            async with self._host_slot(urlsplit(url).netloc):
+                # Deadline for the whole request, so a host that trickles bytes
+                # cannot hold the tool call
+                async with asyncio.timeout(timeout or self.timeout):
+                    async with self._client.stream("GET", url) as response:
+                        response.raise_for_status()
+                        body, truncated = await self._read_capped(response)
+                        text = body.decode(response.encoding or "utf-8", errors="replace")
+            return FetchResult(url, text=text, truncated=truncated)
+        except Exception as e:
+            return FetchResult(url, error=str(e) or type(e).__name__)
+
+    async def fetch_all(
+        self, urls: list[str], timeout: float | None = None
+    ) -> list[FetchResult]:
+        """Fetch pages concurrently, returning results in the order of `urls`."""
+        return await asyncio.gather(*(self.fetch(url, timeout) for url in urls))
+
+    def fetch_many(
+        self, urls: list[str], timeout: float | None = None
+    ) -> list[FetchResult]:
+        """Fetch pages concurrently from synchronous code."""
+        future = asyncio.run_coroutine_threadsafe(
+            self.fetch_all(urls, timeout), self._loop
+        )
+        return future.result()
+
+
+_fetcher: PageFetcher | None = None
+_fetcher_lock = threading.Lock()
+
+
+def get_fetcher() -> PageFetcher:
+    """Return the process-wide page fetcher, creating it on first use."""
+    global _fetcher
+    with _fetcher_lock:
+        if _fetcher is None:
+            _fetcher = PageFetcher()
+    return _fetcher
@@ -1,12 +1,13 @@
 import os
 from typing import Annotated, Literal
 
-import httpx
 from dotenv import load_dotenv
 from langchain.tools import InjectedToolArg, tool
-from markdownify import markdownify
 from tavily import TavilyClient
 
+from src.extract import extract_markdown
+from src.fetch import FetchResult, get_fetcher
+
 load_dotenv()
 
 tavily_api_key = os.getenv("TAVILY_API_KEY")
@@ -16,17 +17,19 @@ if not tavily_api_key:
 tavily_client = TavilyClient(api_key=tavily_api_key)
 
 
+def page_to_markdown(page: FetchResult) -> str:
+    """Convert a fetched page to markdown, or describe why it could not be fetched."""
+    if page.error is not None:
+        return f"Error fetching {page.url}: {page.error}"
+    content = extract_markdown(page.text, url=page.url)
+    if page.truncated:
+        content += f"\n\n[Page truncated after {get_fetcher().max_bytes} bytes]"
+    return content
+
+
 def fetch_webpage_content(url: str, timeout: float = 10.0) -> str:
-    """Fetch webpage and convert HTML to markdown."""
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-    }
-    try:
-        response = httpx.get(url, headers=headers, timeout=timeout)
-        response.raise_for_status()
-        return markdownify(response.text)
-    except Exception as e:
-        return f"Error fetching {url}: {e!s}"
+    """Fetch webpage and convert its main content to markdown."""
+    return page_to_markdown(get_fetcher().fetch_many([url], timeout)[0])
 
 
 @tool(parse_docstring=True)
@@ -54,11 +57,14 @@ def tavily_search(
         max_results=max_results,
         topic=topic,
     )
+    results = search_results.get("results", [])
+    # Fetch all result pages at once; a slow host only delays its own page
+    pages = get_fetcher().fetch_many([result["url"] for result in results])
     result_texts = []
-    for result in search_results.get("results", []):
+    for result, page in zip(results, pages):
         url = result["url"]
         title = result["title"]
-        content = fetch_webpage_content(url)
+        content = page_to_markdown(page)
         result_texts.append(f"## {title}\n**URL:** {url}\n\n{content}\n---")
 
     return f"Found {len(result_texts)} result(s) for '{query}':\n\n" + "\n".join(
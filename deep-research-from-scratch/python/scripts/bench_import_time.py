@@ -0,0 +1,94 @@
+"""Import-time benchmark for the deep research package.
+
+Measures the cold-start cost of importing a module in a fresh interpreter and
+checks that no provider SDK or the SQLite checkpointer is loaded at import time
+(models and clients are created lazily by `deep_research_from_scratch.providers`).
+
+Usage:
+    uv run python scripts/bench_import_time.py
+    uv run python scripts/bench_import_time.py --module deep_research_from_scratch.research_agent_full --runs 7 --max-seconds 3.0
+
+Exits non-zero when the median import time exceeds --max-seconds or when a
+provider SDK is imported, so it can guard cold start in CI.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+# ===== CONFIGURATION =====
+
+# Modules that must only be imported on first use of a model, client or checkpointer
+provider_modules = ["langchain_openai", "langchain_anthropic", "openai", "anthropic", "tavily", "langgraph.checkpoint.sqlite"]
+
+_PROBE = """
+import sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+loaded = [m for m in {provider_modules!r} if m in sys.modules]
+print(elapsed)
+print(",".join(loaded))
+"""
+
+# ===== BENCHMARK =====
+
+def measure_import(module: str) -> tuple[float, list[str]]:
+    """Import a module in a fresh interpreter.
+
+    Returns:
+        Import time in seconds and the provider SDK modules that were loaded
+    """
+    probe = _PROBE.format(module=module, provider_modules=provider_modules)
+    result = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr}")
+    elapsed, loaded = result.stdout.splitlines()[-2:]
+    return float(elapsed), [m for m in loaded.split(",") if m]
+
+def top_imports(module: str, limit: int = 15) -> list[tuple[int, str]]:
+    """Return the slowest imports (cumulative microseconds, package) from `python -X importtime`."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], capture_output=True, text=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:limit]
+
+def main(argv=None) -> int:
+    """Run the benchmark and return the process exit code."""
+    parser = argparse.ArgumentParser(description="Benchmark the cold-start import time of the research graphs.")
+    parser.add_argument("--module", default="deep_research_from_scratch.research_agent_full", help="Module to import")
+    parser.add_argument("--runs", type=int, default=5, help="Number of fresh-interpreter imports to time")
+    parser.add_argument("--max-seconds", type=float, default=None, help="Fail if the median import time is above this")
+    parser.add_argument("--breakdown", action="store_true", help="Also print the slowest imports from -X importtime")
+    args = parser.parse_args(argv)
+
+    timings, loaded = [], set()
+    for _ in range(args.runs):
+        elapsed, providers = measure_import(args.module)
+        timings.append(elapsed)
+        loaded.update(providers)
+
+    median = statistics.median(timings)
+    sys.stdout.write(f"{args.module}: median {median:.3f}s, min {min(timings):.3f}s, max {max(timings):.3f}s over {args.runs} runs\n")
+
+    if args.breakdown:
+        sys.stdout.write("\nSlowest imports (cumulative):\n")
+        for cumulative, name in top_imports(args.module):
+            sys.stdout.write(f"  {cumulative / 1e6:8.3f}s  {name}\n")
+
+    failed = False
+    if loaded:
+        sys.stdout.write(f"FAIL: lazy modules imported eagerly: {', '.join(sorted(loaded))}\n")
+        failed = True
+    if args.max_seconds is not None and median > args.max_seconds:
+        sys.stdout.write(f"FAIL: median import time {median:.3f}s exceeds {args.max_seconds:.3f}s\n")
+        failed = True
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""Offline benchmark of a full research run replayed from a cassette.
+
+Record a cassette once (needs network and API keys):
+    uv run python -m deep_research_from_scratch.cli --record cassettes/coffee.jsonl "Compare the best coffee shops in SF"
+
+Then benchmark without network, e.g. graph overhead only (latency scale 0) or
+with the recorded latencies to compare concurrency settings:
+    uv run python scripts/bench_replay.py cassettes/coffee.jsonl --latency-scale 0 --runs 5
+    uv run python scripts/bench_replay.py cassettes/coffee.jsonl --latency-scale 1 --max-seconds 90
+
+Exits non-zero when the median run time exceeds --max-seconds or a run fails.
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+
+from langchain_core.messages import HumanMessage
+
+from deep_research_from_scratch.cassette import recorded_query, use_cassette
+
+
+async def replay_once(path: str, query: str, latency_scale: float) -> dict:
+    """Replay one run and return its wall time, cassette match counts, and state size."""
+    from deep_research_from_scratch.research_agent_full import compile_agent
+
+    cassette = use_cassette(path, "replay", latency_scale)
+    start = time.perf_counter()
+    result = await compile_agent().ainvoke({"messages": [HumanMessage(content=query)]})
+    return {
+        "seconds": time.perf_counter() - start,
+        "exact": cassette.exact_matches,
+        "fallback": cassette.fallback_matches,
+        "notes": len(result.get("notes", [])),
+        "report_chars": len(result.get("final_report", "")),
+    }
+
+def main(argv=None) -> int:
+    """Run the replay benchmark and return the process exit code."""
+    parser = argparse.ArgumentParser(description="Benchmark a research run replayed from a cassette.")
+    parser.add_argument("cassette", help="Cassette recorded with the CLI's --record")
+    parser.add_argument("--query", help="Query to replay (default: the one recorded in the cassette)")
+    parser.add_argument("--runs", type=int, default=3, help="Number of replays")
+    parser.add_argument("--latency-scale", type=float, default=0.0, help="Scale recorded latencies (0 = graph overhead only)")
+    parser.add_argument("--max-seconds", type=float, default=None, help="Fail if the median run time is above this")
+    args = parser.parse_args(argv)
+
+    query = args.query or recorded_query(args.cassette)
+    if not query:
+        parser.error("the cassette has no recorded query; pass --query")
+
+    runs = []
+    for index in range(args.runs):
+        run = asyncio.run(replay_once(args.cassette, query, args.latency_scale))
+        runs.append(run)
+        sys.stdout.write(f"run {index + 1}: {run['seconds']:.3f}s  matches exact {run['exact']} / fallback {run['fallback']}  "
+                         f"notes {run['notes']}  report {run['report_chars']} chars\n")
+
+    median = statistics.median(run["seconds"] for run in runs)
+    sys.stdout.write(f"median {median:.3f}s over {args.runs} runs (latency scale {args.latency_scale})\n")
+    if args.max_seconds is not None and median > args.max_seconds:
+        sys.stdout.write(f"FAIL: median run time {median:.3f}s exceeds {args.max_seconds:.3f}s\n")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
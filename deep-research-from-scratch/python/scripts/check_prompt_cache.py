@@ -0,0 +1,73 @@
+"""Check prompt cache breakpoint placement against the local stub provider.
+
+Runs two turns of the researcher's llm_call and of the supervisor with every
+model replaced by the prompt caching stub (no network or API keys), then checks
+that:
+- the static system prompt carries a breakpoint and is read from cache on the
+  second turn
+- the conversation of the first turn is read from cache on the second turn
+
+    uv run python scripts/check_prompt_cache.py
+
+Exits non-zero when a check fails.
+"""
+
+import asyncio
+import sys
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from deep_research_from_scratch import cascade, providers
+from deep_research_from_scratch.multi_agent_supervisor import supervisor
+from deep_research_from_scratch.research_agent import llm_call
+
+STUB_SPEC = {"model": "stub:prompt-cache", "min_cacheable_tokens": 256}
+
+def _turns(topic: str) -> tuple[list, list]:
+    """Return the conversation of a first turn and of the turn after it."""
+    first = [HumanMessage(content=f"Research {topic}.")]
+    call = {"name": "think_tool", "args": {"reflection": "Plan the searches."}, "id": "call-1"}
+    second = first + [
+        AIMessage(content="", tool_calls=[call]),
+        ToolMessage(content="Reflection recorded: Plan the searches. " * 20, name="think_tool", tool_call_id="call-1"),
+    ]
+    return first, second
+
+def check(name: str, requests: list[dict]) -> list[str]:
+    """Return the failed checks of two consecutive requests."""
+    failures = []
+    first, second = requests[-2:]
+    sys.stdout.write(f"{name}: breakpoints {first['breakpoints']} -> {second['breakpoints']}, "
+                     f"cache read {first['cache_read']} -> {second['cache_read']} of {second['input_tokens']} tokens\n")
+    if (0, 0) not in first["breakpoints"]:
+        failures.append(f"{name}: no breakpoint after the system prompt")
+    if not second["breakpoints"] or second["breakpoints"][-1][0] < 2:
+        failures.append(f"{name}: no breakpoint on the last message")
+    if second["cache_read"] < first["input_tokens"]:
+        failures.append(f"{name}: first turn was not read from cache on the second turn")
+    return failures
+
+def main() -> int:
+    """Run the checks and return the process exit code."""
+    cascade.cascade_enabled = False
+    for role in list(providers.model_specs):
+        providers.model_specs[role] = STUB_SPEC
+    providers.reset_providers()
+    stub = providers.get_model("research")
+
+    failures = []
+    first, second = _turns("prompt caching")
+    llm_call({"researcher_messages": first})
+    llm_call({"researcher_messages": second})
+    failures += check("researcher", stub.requests)
+
+    asyncio.run(supervisor({"supervisor_messages": first}))
+    asyncio.run(supervisor({"supervisor_messages": second, "research_iterations": 1}))
+    failures += check("supervisor", stub.requests)
+
+    for failure in failures:
+        sys.stderr.write(f"FAIL {failure}\n")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
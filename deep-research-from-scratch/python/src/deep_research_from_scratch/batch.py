@@ -0,0 +1,309 @@
+"""Batch Runner for Many Research Briefs.
+
+Usage:
+    python -m deep_research_from_scratch.batch briefs.jsonl --output-dir runs/nightly
+
+Each input line is a JSON object with an optional "id" and either:
+- "brief": a research brief, researched directly (no clarification step), or
+- "query": a user request, run through the full agent; requests that need
+  clarification are recorded as such instead of holding up the batch
+
+Key features:
+- At most `max_concurrent_briefs` briefs and `max_concurrent_research_units`
+  research units (across all briefs) run at once; rate limiting is turned on
+  and the provider rate limiters are shared by every brief
+- Shared caches: the LLM response cache and the research memory live in the
+  output directory, so later briefs (and later batches) reuse earlier work
+- Checkpointed: every brief runs under its own thread of a SQLite checkpointer
+  and finished briefs are appended to results.jsonl. Rerunning the same command
+  skips finished briefs, resumes interrupted ones and retries failed ones
+- Throughput summary (briefs per hour, latency percentiles, rate limiter waits),
+  printed at the end and written to summary.json
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+
+from langchain_core.messages import HumanMessage
+from typing_extensions import Callable, List, Optional
+
+from deep_research_from_scratch import research_scheduler
+from deep_research_from_scratch.rate_limiter import (
+    configure_rate_limiting,
+    get_rate_limiter_stats,
+)
+
+# ===== CONFIGURATION =====
+
+# Briefs researched at the same time
+max_concurrent_briefs = 4
+
+# Research units running at the same time across all briefs
+max_concurrent_research_units = 8
+
+# Files in the output directory
+RESULTS_FILE = "results.jsonl"
+SUMMARY_FILE = "summary.json"
+CHECKPOINT_FILE = "checkpoints.sqlite"
+LLM_CACHE_FILE = "llm_cache.sqlite"
+MEMORY_FILE = "memory.sqlite"
+
+def _status(text: str) -> None:
+    sys.stderr.write(text + "\n")
+    sys.stderr.flush()
+
+# ===== INPUT =====
+
+@dataclass
+class BatchItem:
+    """One line of the batch input."""
+    id: str
+    brief: str = ""
+    query: str = ""
+
+def load_batch(path: str) -> List[BatchItem]:
+    """Read batch items from a JSONL file.
+
+    Raises:
+        ValueError: If a line has neither "brief" nor "query", or an id is repeated
+    """
+    items, ids = [], set()
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            item = BatchItem(id=str(record.get("id") or line_number), brief=record.get("brief", ""), query=record.get("query", ""))
+            if not (item.brief or item.query):
+                raise ValueError(f"{path}:{line_number}: expected a 'brief' or 'query'")
+            if item.id in ids:
+                raise ValueError(f"{path}:{line_number}: duplicate id {item.id!r}")
+            ids.add(item.id)
+            items.append(item)
+    return items
+
+# ===== RESULTS =====
+
+def load_finished(results_path: str) -> dict[str, dict]:
+    """Return the results already written for a batch, by id (failed briefs excluded so they are retried)."""
+    finished = {}
+    if not os.path.exists(results_path):
+        return finished
+    with open(results_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # Last line cut off by an interruption
+                continue
+            if record.get("status") != "failed":
+                finished[record["id"]] = record
+    return finished
+
+def _percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile of a list of values (0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(q / 100 * len(ordered)) - 1))]
+
+@dataclass
+class BatchSummary:
+    """Outcome and throughput of a batch run."""
+    total: int = 0
+    already_finished: int = 0
+    completed: int = 0
+    needs_clarification: int = 0
+    failed: int = 0
+    resumed: int = 0
+    wall_time: float = 0.0
+    latencies: List[float] = field(default_factory=list)
+
+    @property
+    def processed(self) -> int:
+        """Briefs run in this invocation, whatever their outcome."""
+        return self.completed + self.needs_clarification + self.failed
+
+    def add(self, record: dict) -> None:
+        """Count a finished brief from its results.jsonl record."""
+        if record["status"] == "completed":
+            self.completed += 1
+        elif record["status"] == "needs_clarification":
+            self.needs_clarification += 1
+        else:
+            self.failed += 1
+        self.resumed += record.get("resumed", False)
+        self.latencies.append(record["elapsed"])
+
+    def to_dict(self) -> dict:
+        """Return the summary with throughput, latency percentiles and rate limiter waits, as written to summary.json."""
+        record = {k: v for k, v in asdict(self).items() if k != "latencies"}
+        record.update({
+            "briefs_per_hour": round(self.processed / self.wall_time * 3600, 2) if self.wall_time else 0.0,
+            "latency_mean": round(sum(self.latencies) / len(self.latencies), 2) if self.latencies else 0.0,
+            "latency_p50": round(_percentile(self.latencies, 50), 2),
+            "latency_p95": round(_percentile(self.latencies, 95), 2),
+            "rate_limiters": get_rate_limiter_stats(),
+        })
+        return record
+
+    def describe(self) -> str:
+        """Render the summary as a few lines of text."""
+        s = self.to_dict()
+        lines = [
+            f"Batch: {self.processed} briefs processed in {self.wall_time:.1f}s ({s['briefs_per_hour']} per hour), "
+            f"{self.already_finished} already finished",
+            f"  completed {self.completed}, needs clarification {self.needs_clarification}, failed {self.failed}, "
+            f"resumed {self.resumed}",
+            f"  latency per brief: mean {s['latency_mean']}s, p50 {s['latency_p50']}s, p95 {s['latency_p95']}s",
+        ]
+        for limiter in s["rate_limiters"]:
+            lines.append(f"  rate limiter {limiter['name']}: {limiter['admitted']} requests, waited {limiter['wait_time']}s")
+        return "\n".join(lines)
+
+# ===== RUNNER =====
+
+async def run_item(item: BatchItem, agent, brief_agent) -> dict:
+    """Research one batch item under its own checkpointed thread and return its result record.
+
+    A thread that was interrupted earlier is resumed from its last checkpoint;
+    a thread that already finished returns its final state without running again.
+    """
+    graph = brief_agent if item.brief else agent
+    config = {"configurable": {"thread_id": f"batch-{item.id}"}}
+    start = time.monotonic()
+    record = {"id": item.id, "brief": item.brief, "query": item.query, "resumed": False}
+    try:
+        snapshot = await graph.aget_state(config)
+        if snapshot.values and not snapshot.next:
+            state = snapshot.values
+        else:
+            if snapshot.next:
+                record["resumed"] = True
+                graph_input = None
+            elif item.brief:
+                graph_input = {
+                    "messages": [HumanMessage(content=item.brief)],
+                    "research_brief": item.brief,
+                    "supervisor_messages": [HumanMessage(content=f"{item.brief}.")],
+                }
+            else:
+                graph_input = {"messages": [HumanMessage(content=item.query)]}
+            state = await graph.ainvoke(graph_input, config=config)
+
+        if state.get("final_report"):
+            record.update(status="completed", research_brief=state.get("research_brief", ""), final_report=state["final_report"])
+        else:
+            # The scope step asked a question instead of researching
+            record.update(status="needs_clarification", question=str(state["messages"][-1].content))
+    except Exception as e:
+        record.update(status="failed", error=f"{type(e).__name__}: {e}")
+    record["elapsed"] = round(time.monotonic() - start, 2)
+    return record
+
+async def run_batch(
+    items: List[BatchItem],
+    output_dir: str,
+    max_briefs: int = max_concurrent_briefs,
+    max_research_units: Optional[int] = max_concurrent_research_units,
+    progress: Callable[[str], None] = _status,
+) -> BatchSummary:
+    """Research batch items concurrently, checkpointing progress to the output directory.
+
+    Args:
+        items: Briefs and queries to research
+        output_dir: Directory of results.jsonl, summary.json and the checkpoint database
+        max_briefs: Briefs researched at the same time
+        max_research_units: Research units running at the same time across all briefs
+        progress: Called with a progress line whenever a brief finishes
+
+    Returns:
+        Summary of the run (briefs finished in earlier runs are counted, not rerun)
+    """
+    from deep_research_from_scratch.checkpointing import open_checkpointer
+    from deep_research_from_scratch.research_agent_full import (
+        compile_agent,
+        compile_brief_agent,
+    )
+
+    os.makedirs(output_dir, exist_ok=True)
+    results_path = os.path.join(output_dir, RESULTS_FILE)
+    finished = load_finished(results_path)
+    pending = [item for item in items if item.id not in finished]
+    summary = BatchSummary(total=len(items), already_finished=len(items) - len(pending))
+    if finished:
+        progress(f"Skipping {summary.already_finished} briefs finished in an earlier run")
+
+    slots = asyncio.Semaphore(max(1, max_briefs))
+    previous_global_limit = research_scheduler.global_max_concurrency
+    research_scheduler.global_max_concurrency = max_research_units
+    start = time.monotonic()
+    try:
+        async with open_checkpointer(os.path.join(output_dir, CHECKPOINT_FILE)) as checkpointer:
+            agent, brief_agent = compile_agent(checkpointer), compile_brief_agent(checkpointer)
+            with open(results_path, "a", encoding="utf-8") as results_file:
+
+                async def process(item: BatchItem) -> None:
+                    async with slots:
+                        record = await run_item(item, agent, brief_agent)
+                    results_file.write(json.dumps(record) + "\n")
+                    results_file.flush()
+                    summary.add(record)
+                    progress(f"[{summary.processed}/{len(pending)}] {record['status']:<19} {item.id} ({record['elapsed']:.1f}s)"
+                             + (f" {record['error']}" if record.get("error") else ""))
+
+                await asyncio.gather(*(process(item) for item in pending))
+    finally:
+        research_scheduler.global_max_concurrency = previous_global_limit
+        summary.wall_time = time.monotonic() - start
+        with open(os.path.join(output_dir, SUMMARY_FILE), "w", encoding="utf-8") as f:
+            json.dump(summary.to_dict(), f, indent=2)
+    return summary
+
+# ===== COMMAND LINE =====
+
+def main(argv=None) -> None:
+    """Run a batch of research briefs from the command line."""
+    parser = argparse.ArgumentParser(description="Research a JSONL file of briefs with shared caches and checkpointing.")
+    parser.add_argument("input", help="JSONL file with one {\"id\", \"brief\"} or {\"id\", \"query\"} object per line")
+    parser.add_argument("--output-dir", required=True, help="Directory for results, summary, checkpoints and caches")
+    parser.add_argument("--max-briefs", type=int, default=max_concurrent_briefs, help="Briefs researched at the same time")
+    parser.add_argument("--max-research-units", type=int, default=max_concurrent_research_units,
+                        help="Research units running at the same time across all briefs")
+    parser.add_argument("--no-llm-cache", action="store_true", help="Do not cache LLM responses in the output directory")
+    parser.add_argument("--no-memory", action="store_true", help="Do not share research between briefs through the research memory")
+    parser.add_argument("--no-rate-limits", action="store_true",
+                        help="Do not rate limit provider calls (limits are set with DEEP_RESEARCH_RATE_LIMITS)")
+    args = parser.parse_args(argv)
+
+    items = load_batch(args.input)
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    from deep_research_from_scratch import llm_cache
+
+    configure_rate_limiting(not args.no_rate_limits)
+    if not args.no_llm_cache:
+        llm_cache.configure_llm_cache(os.path.join(args.output_dir, LLM_CACHE_FILE), llm_cache.llm_cache_roles)
+    if not args.no_memory:
+        from deep_research_from_scratch.research_memory import configure_research_memory
+
+        configure_research_memory(os.path.join(args.output_dir, MEMORY_FILE))
+
+    summary = asyncio.run(run_batch(items, args.output_dir, args.max_briefs, args.max_research_units))
+    _status("\n" + summary.describe())
+    if llm_cache.llm_cache_path:
+        _status(llm_cache.format_cache_stats())
+
+    from deep_research_from_scratch.cascade import cascade_enabled, format_cascade_stats
+
+    if cascade_enabled:
+        _status(format_cascade_stats())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Content-Addressed Blob Store for Raw Research Notes.
+
+Raw notes (full tool outputs and AI messages of every researcher) are large and
+were copied through graph state, checkpoints, and subgraph boundaries. This
+module writes them to a local content-addressed store instead, so state only
+carries short references like `blob:sha256:<digest>:<size>`, and the text is
+loaded lazily when it is actually needed.
+
+Blobs are zlib-compressed files named by the SHA-256 of their content, so
+identical notes are stored once and writes are idempotent.
+"""
+
+import hashlib
+import os
+import tempfile
+import zlib
+from functools import lru_cache
+from pathlib import Path
+
+from typing_extensions import List, Optional
+
+# ===== CONFIGURATION =====
+
+# Default store location; override with the DEEP_RESEARCH_BLOB_DIR environment variable
+default_blob_dir = Path.cwd() / ".deep_research" / "blobs"
+
+_REF_PREFIX = "blob:sha256:"
+
+# ===== STORE =====
+
+class BlobStore:
+    """Content-addressed store of compressed text blobs on the local filesystem."""
+
+    def __init__(self, root: Path):
+        """Use `root` as the store directory; it is created on the first write."""
+        self.root = Path(root)
+
+    def _path(self, digest: str) -> Path:
+        return self.root / digest[:2] / f"{digest}.z"
+
+    def put(self, text: str) -> str:
+        """Store text and return its reference; storing the same text twice is a no-op."""
+        data = text.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temp file and rename so readers never see a partial blob
+            fd, tmp = tempfile.mkstemp(dir=path.parent)
+            with os.fdopen(fd, "wb") as f:
+                f.write(zlib.compress(data))
+            os.replace(tmp, path)
+        return f"{_REF_PREFIX}{digest}:{len(data)}"
+
+    def get(self, ref: str) -> str:
+        """Load the text of a reference."""
+        return _read_blob(str(self._path(parse_ref(ref)[0])))
+
+@lru_cache(maxsize=256)
+def _read_blob(path: str) -> str:
+    with open(path, "rb") as f:
+        return zlib.decompress(f.read()).decode("utf-8")
+
+def is_blob_ref(value: str) -> bool:
+    """Check whether a string is a blob reference."""
+    return isinstance(value, str) and value.startswith(_REF_PREFIX)
+
+def parse_ref(ref: str) -> tuple[str, int]:
+    """Return the (digest, size in bytes) of a blob reference."""
+    digest, size = ref[len(_REF_PREFIX):].split(":")
+    return digest, int(size)
+
+# Global store variable - will be initialized lazily
+_store: Optional[BlobStore] = None
+
+def get_blob_store() -> BlobStore:
+    """Get or initialize the blob store."""
+    global _store
+    if _store is None:
+        _store = BlobStore(Path(os.environ.get("DEEP_RESEARCH_BLOB_DIR", default_blob_dir)))
+    return _store
+
+# ===== NOTE HELPERS =====
+
+def store_note(text: str) -> str:
+    """Store a raw note and return the reference to keep in state."""
+    return get_blob_store().put(text)
+
+def load_notes(notes: List[str]) -> List[str]:
+    """Resolve a list of notes, loading blob references and passing plain text through."""
+    store = get_blob_store()
+    return [store.get(note) if is_blob_ref(note) else note for note in notes]
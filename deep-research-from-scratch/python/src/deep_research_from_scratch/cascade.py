@@ -0,0 +1,215 @@
+"""Model Cascade for Cheap, Mostly Deterministic Steps.
+
+Several steps use a large model for work a small model usually gets right: the
+clarification yes/no, supervisor turns that only reflect with think_tool, and
+research compression. A cascade node first calls a small, fast model, checks
+its output, and only calls the large model when the check fails ("escalation").
+
+Each node is configured in `cascade_nodes` with its small and large model roles
+(see providers.model_specs). The acceptance check is specific to the node and
+passed in by the caller; helpers for the common checks live here:
+- `boolean_confidence`: probability the model gave a yes/no field, from logprobs
+- `source_coverage`: share of input URLs that survived in a summary
+
+Per-node statistics (escalation rate, latency saved) are kept for reporting.
+"""
+
+import math
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+
+from typing_extensions import Any, Awaitable, Callable, List, Optional, TypeVar
+
+from deep_research_from_scratch.providers import model_specs
+
+T = TypeVar("T")
+
+# ===== CONFIGURATION =====
+
+# Set to False to always use the large models
+cascade_enabled = True
+
+# Cascade per node: small model role tried first, large model role escalated to
+cascade_nodes: dict[str, dict[str, Any]] = {
+    # Clarification decision; accepted when the small model is confident about need_clarification
+    "clarify_with_user": {"enabled": True, "small": "scope_small", "large": "scope"},
+    # Supervisor turns right after research results; accepted only for a think_tool reflection
+    "supervisor": {"enabled": True, "small": "supervisor_small", "large": "supervisor"},
+    # Research compression; accepted when the summary keeps the sources it was given
+    "compress_research": {"enabled": True, "small": "compress_small", "large": "compress"},
+}
+
+# ===== STATISTICS =====
+
+@dataclass
+class CascadeStats:
+    """Escalations and latency of one cascade node."""
+    node: str
+    accepted: int = 0
+    escalated: int = 0
+    # Small model time on accepted and on escalated calls
+    small_time_accepted: float = 0.0
+    small_time_escalated: float = 0.0
+    # Large model calls (escalations and calls with the cascade disabled)
+    large_calls: int = 0
+    large_time: float = 0.0
+    escalation_reasons: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def escalation_rate(self) -> float:
+        """Share of small model calls that were escalated."""
+        total = self.accepted + self.escalated
+        return self.escalated / total if total else 0.0
+
+    @property
+    def saved_seconds(self) -> Optional[float]:
+        """Latency saved versus always using the large model (None until a large call was timed)."""
+        if not self.large_calls:
+            return None
+        mean_large = self.large_time / self.large_calls
+        return self.accepted * mean_large - self.small_time_accepted - self.small_time_escalated
+
+    def to_dict(self) -> dict:
+        """Return the statistics as a JSON-serializable dict for reporting."""
+        saved = self.saved_seconds
+        return {
+            "node": self.node,
+            "accepted": self.accepted,
+            "escalated": self.escalated,
+            "escalation_rate": round(self.escalation_rate, 3),
+            "saved_seconds": None if saved is None else round(saved, 2),
+            "escalation_reasons": dict(self.escalation_reasons),
+        }
+
+_stats_lock = threading.Lock()
+_stats: dict[str, CascadeStats] = {}
+
+def _node_stats(node: str) -> CascadeStats:
+    with _stats_lock:
+        if node not in _stats:
+            _stats[node] = CascadeStats(node)
+        return _stats[node]
+
+def get_cascade_stats() -> List[dict]:
+    """Return the statistics of every cascade node used so far."""
+    return [stats.to_dict() for stats in _stats.values()]
+
+def format_cascade_stats() -> str:
+    """Render cascade statistics as a short table."""
+    lines = ["Model cascade:"]
+    for s in get_cascade_stats():
+        saved = "n/a" if s["saved_seconds"] is None else f"{s['saved_seconds']:.1f}s"
+        reasons = ", ".join(f"{reason} {count}" for reason, count in sorted(s["escalation_reasons"].items()))
+        lines.append(f"  {s['node']:<18} accepted {s['accepted']:>4}  escalated {s['escalated']:>4} "
+                     f"({s['escalation_rate']:.0%})  saved {saved}" + (f"  [{reasons}]" if reasons else ""))
+    return "\n".join(lines)
+
+# ===== CASCADE =====
+
+def _cascade_roles(node: str) -> tuple[Optional[str], str]:
+    """Return the (small, large) roles of a node; small is None when the cascade is off."""
+    spec = cascade_nodes[node]
+    if not cascade_enabled or not spec.get("enabled", True) or spec.get("small") not in model_specs:
+        return None, spec["large"]
+    return spec["small"], spec["large"]
+
+def _record_small(stats: CascadeStats, elapsed: float, reason: Optional[str]) -> None:
+    with _stats_lock:
+        if reason is None:
+            stats.accepted += 1
+            stats.small_time_accepted += elapsed
+        else:
+            stats.escalated += 1
+            stats.small_time_escalated += elapsed
+            stats.escalation_reasons[reason] = stats.escalation_reasons.get(reason, 0) + 1
+
+def _record_large(stats: CascadeStats, elapsed: float) -> None:
+    with _stats_lock:
+        stats.large_calls += 1
+        stats.large_time += elapsed
+
+def invoke_cascade(
+    node: str,
+    call: Callable[[str], T],
+    check: Callable[[T], Optional[str]],
+    try_small: bool = True,
+) -> T:
+    """Run a node's model call through its cascade.
+
+    Args:
+        node: Key of `cascade_nodes`
+        call: Makes the model call with the model of the given role
+        check: Returns None to accept a small model result, or the reason to escalate
+        try_small: False goes straight to the large model, for calls whose
+            small model result the check would not accept anyway
+
+    Returns:
+        The accepted small model result, or the large model result
+    """
+    small, large = _cascade_roles(node)
+    stats = _node_stats(node)
+    if small is not None and try_small:
+        start = time.perf_counter()
+        try:
+            result = call(small)
+            reason = check(result)
+        except Exception as e:
+            result, reason = None, f"error: {type(e).__name__}"
+        _record_small(stats, time.perf_counter() - start, reason)
+        if reason is None:
+            return result
+    start = time.perf_counter()
+    result = call(large)
+    _record_large(stats, time.perf_counter() - start)
+    return result
+
+async def ainvoke_cascade(
+    node: str,
+    call: Callable[[str], Awaitable[T]],
+    check: Callable[[T], Optional[str]],
+    try_small: bool = True,
+) -> T:
+    """Async version of `invoke_cascade`."""
+    small, large = _cascade_roles(node)
+    stats = _node_stats(node)
+    if small is not None and try_small:
+        start = time.perf_counter()
+        try:
+            result = await call(small)
+            reason = check(result)
+        except Exception as e:
+            result, reason = None, f"error: {type(e).__name__}"
+        _record_small(stats, time.perf_counter() - start, reason)
+        if reason is None:
+            return result
+    start = time.perf_counter()
+    result = await call(large)
+    _record_large(stats, time.perf_counter() - start)
+    return result
+
+# ===== CHECKS =====
+
+_url_re = re.compile(r"https?://[^\s)\]>\"'<]+")
+
+def boolean_confidence(message: Any, field_name: str) -> Optional[float]:
+    """Return the probability the model gave to the true/false value of a JSON field.
+
+    Read from the token logprobs of the raw response (requires a model created
+    with logprobs=True); None when they are not available.
+    """
+    tokens = ((getattr(message, "response_metadata", None) or {}).get("logprobs") or {}).get("content") or []
+    text = ""
+    for token in tokens:
+        if f'"{field_name}"' in text and token["token"].strip(' ":,') in ("true", "false"):
+            return math.exp(token["logprob"])
+        text += token["token"]
+    return None
+
+def source_coverage(summary: str, source_text: str) -> float:
+    """Return the share of URLs in the source text that also appear in the summary (1.0 if there are none)."""
+    urls = {url.rstrip(".,;") for url in _url_re.findall(source_text)}
+    if not urls:
+        return 1.0
+    return sum(url in summary for url in urls) / len(urls)
@@ -0,0 +1,249 @@
+"""Record/Replay Cassettes for Offline Benchmarking.
+
+A cassette is a JSONL file holding every model response and Tavily search of a
+research run, together with how long each call took. In record mode a normal
+run writes the cassette; in replay mode the same run is served entirely from it,
+with the original latencies (optionally scaled), so it needs no network and no
+API keys. This makes graph overhead, concurrency settings, and state growth
+measurable deterministically.
+
+How calls are matched on replay:
+- Model calls are keyed by role, model string, and prompt, with per-run message
+  IDs and dates normalized away, so a cassette recorded on another day still matches
+- If a prompt has no exact match (e.g. parallel researchers finished in a
+  different order and the conversation diverged), the next unused response
+  recorded for the same role is served instead
+- Searches are keyed by their arguments, with the same in-order fallback
+
+Enable with DEEP_RESEARCH_CASSETTE=<path> and DEEP_RESEARCH_CASSETTE_MODE=record
+or replay (DEEP_RESEARCH_REPLAY_LATENCY_SCALE scales replay latencies; 0 replays
+instantly), or call `use_cassette` before the first model is created. MCP tool
+calls are not recorded.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import defaultdict, deque
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import dumps, loads
+from typing_extensions import Any, Optional
+
+from deep_research_from_scratch.llm_cache import strip_message_ids
+
+# ===== CONFIGURATION =====
+
+cassette_path: Optional[str] = os.environ.get("DEEP_RESEARCH_CASSETTE") or None
+cassette_mode: str = os.environ.get("DEEP_RESEARCH_CASSETTE_MODE", "replay")
+replay_latency_scale: float = float(os.environ.get("DEEP_RESEARCH_REPLAY_LATENCY_SCALE", "1.0"))
+
+# Dates as rendered by get_today_str, e.g. "Mon Oct 19, 2026"
+_DATE_PATTERN = re.compile(r"\b(?:Mon|Tue|Wed|Thu|Fri|Sat|Sun) (?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec) \d{1,2}, \d{4}\b")
+
+class CassetteMiss(LookupError):
+    """Raised in replay mode when a call has no recorded response."""
+
+def _normalize(text: str) -> str:
+    return _DATE_PATTERN.sub("<date>", text)
+
+def _llm_key(role: str, prompt: str, llm_string: str) -> str:
+    try:
+        prompt = json.dumps(strip_message_ids(json.loads(prompt)), sort_keys=True)
+    except ValueError:
+        pass
+    return hashlib.sha256(f"{role}\x00{llm_string}\x00{_normalize(prompt)}".encode()).hexdigest()
+
+def _search_key(kwargs: dict) -> str:
+    return hashlib.sha256(_normalize(json.dumps(kwargs, sort_keys=True, default=str)).encode()).hexdigest()
+
+# ===== CASSETTE =====
+
+class Cassette:
+    """Recorded interactions of one run, appended to or served from a JSONL file."""
+
+    def __init__(self, path: str, mode: str = "replay", latency_scale: float = 1.0):
+        """Open a cassette.
+
+        Args:
+            path: JSONL file; truncated in record mode, read in replay mode
+            mode: "record" or "replay"
+            latency_scale: Factor applied to recorded latencies on replay
+
+        Raises:
+            ValueError: If the mode is unknown
+        """
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.latency_scale = latency_scale
+        self._lock = threading.Lock()
+        # Replay indexes: exact key -> entries, and (kind, group) -> entries in recorded order
+        self._by_key: dict[str, deque] = defaultdict(deque)
+        self._by_group: dict[tuple, deque] = defaultdict(deque)
+        self._used: set[int] = set()
+        self.exact_matches = 0
+        self.fallback_matches = 0
+        if mode == "replay":
+            self._load()
+        else:
+            open(path, "w", encoding="utf-8").close()
+
+    def _load(self) -> None:
+        with open(self.path, encoding="utf-8") as f:
+            for index, line in enumerate(f):
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                entry["_index"] = index
+                self._by_key[entry["key"]].append(entry)
+                self._by_group[(entry["kind"], entry["group"])].append(entry)
+
+    def record(self, kind: str, group: str, key: str, payload: Any, latency: float) -> None:
+        """Append one interaction to the cassette file."""
+        line = json.dumps({"kind": kind, "group": group, "key": key, "payload": payload, "latency": latency})
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+    def take(self, kind: str, group: str, key: str) -> dict:
+        """Return the recorded interaction for a call, exact match first, then in recorded order."""
+        with self._lock:
+            for queue, exact in ((self._by_key[key], True), (self._by_group[(kind, group)], False)):
+                while queue and queue[0]["_index"] in self._used:
+                    queue.popleft()
+                if queue:
+                    entry = queue.popleft()
+                    self._used.add(entry["_index"])
+                    if exact:
+                        self.exact_matches += 1
+                    else:
+                        self.fallback_matches += 1
+                    return entry
+        raise CassetteMiss(f"No recorded {kind} interaction left for {group!r} in {self.path}")
+
+    def replay_delay(self, entry: dict) -> float:
+        """Return how long to wait before serving a recorded interaction."""
+        return entry["latency"] * self.latency_scale
+
+class CassetteLLMCache(BaseCache):
+    """LangChain cache that records model responses to, or replays them from, a cassette.
+
+    Attached to each model by the provider registry. Recording measures latency
+    from the cache miss to the update that follows the real call.
+    """
+
+    def __init__(self, cassette: Cassette, role: str):
+        """Create the cache of one model role on a cassette."""
+        self.cassette = cassette
+        self.role = role
+        self._started: dict[str, float] = {}
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        """Replay a recorded response, or start timing the real call in record mode.
+
+        Raises:
+            CassetteMiss: In replay mode, if no recorded response is left for the role
+        """
+        key = _llm_key(self.role, prompt, llm_string)
+        if self.cassette.mode == "record":
+            self._started[key] = time.perf_counter()
+            return None
+        entry = self.cassette.take("llm", self.role, key)
+        time.sleep(self.cassette.replay_delay(entry))
+        return [loads(generation) for generation in entry["payload"]]
+
+    async def alookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        """Async version of `lookup`; the replay delay does not block the event loop."""
+        key = _llm_key(self.role, prompt, llm_string)
+        if self.cassette.mode == "record":
+            self._started[key] = time.perf_counter()
+            return None
+        entry = self.cassette.take("llm", self.role, key)
+        await asyncio.sleep(self.cassette.replay_delay(entry))
+        return [loads(generation) for generation in entry["payload"]]
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        """Record a real response with its latency (record mode only)."""
+        if self.cassette.mode != "record":
+            return
+        key = _llm_key(self.role, prompt, llm_string)
+        latency = time.perf_counter() - self._started.pop(key, time.perf_counter())
+        self.cassette.record("llm", self.role, key, [dumps(generation) for generation in return_val], latency)
+
+    async def aupdate(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        """Async version of `update`."""
+        self.update(prompt, llm_string, return_val)
+
+    def clear(self, **kwargs: Any) -> None:
+        """Do nothing; a cassette is only replaced by recording a new one."""
+
+class CassetteSearchClient:
+    """Tavily client stand-in that records searches to, or replays them from, a cassette."""
+
+    def __init__(self, cassette: Cassette, client: Any = None):
+        """Wrap a Tavily client (record mode) or stand in for one (replay mode, client=None)."""
+        self.cassette = cassette
+        self.client = client
+
+    def search(self, query: str, **kwargs) -> dict:
+        """Run and record a search, or replay the recorded result for the same query and options.
+
+        Raises:
+            CassetteMiss: In replay mode, if no recorded search is left
+        """
+        key = _search_key({"query": query, **kwargs})
+        if self.cassette.mode == "record":
+            start = time.perf_counter()
+            result = self.client.search(query, **kwargs)
+            self.cassette.record("search", "tavily", key, result, time.perf_counter() - start)
+            return result
+        entry = self.cassette.take("search", "tavily", key)
+        time.sleep(self.cassette.replay_delay(entry))
+        return entry["payload"]
+
+def recorded_query(path: str) -> Optional[str]:
+    """Return the query a cassette was recorded with by the CLI, if any."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            entry = json.loads(line)
+            if entry["kind"] == "run":
+                return entry["payload"]
+    return None
+
+# ===== ACTIVE CASSETTE =====
+
+_cassette: Optional[Cassette] = None
+_caches: dict[str, CassetteLLMCache] = {}
+
+def get_cassette() -> Optional[Cassette]:
+    """Return the active cassette, opening the one configured by environment on first use."""
+    global _cassette
+    if _cassette is None and cassette_path:
+        _cassette = Cassette(cassette_path, cassette_mode, replay_latency_scale)
+    return _cassette
+
+def get_cassette_cache(role: str) -> Optional[CassetteLLMCache]:
+    """Return the cassette cache to attach to a role's model, or None without a cassette."""
+    cassette = get_cassette()
+    if cassette is None:
+        return None
+    if role not in _caches:
+        _caches[role] = CassetteLLMCache(cassette, role)
+    return _caches[role]
+
+def use_cassette(path: Optional[str], mode: str = "replay", latency_scale: float = 1.0) -> Optional[Cassette]:
+    """Activate a cassette (or deactivate with None) and re-create models to use it."""
+    global _cassette, cassette_path, cassette_mode, replay_latency_scale
+    from deep_research_from_scratch.providers import reset_providers
+
+    cassette_path, cassette_mode, replay_latency_scale = path, mode, latency_scale
+    _cassette = None
+    _caches.clear()
+    reset_providers()
+    return get_cassette()
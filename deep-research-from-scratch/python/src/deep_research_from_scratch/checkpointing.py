@@ -0,0 +1,153 @@
+"""Durable SQLite Checkpointing for Resumable Research Runs.
+
+This module provides a persistent checkpointer for the research graphs so a run
+interrupted by a crash, deploy, or provider outage can be resumed by thread ID.
+
+Key features:
+- AsyncSqliteSaver with a serializer that zlib-compresses large checkpoint blobs
+- A per-thread store of finished research units, so ConductResearch calls that
+  completed before the interruption are not run again on resume
+- Helpers to compile the full agent or supervisor with the checkpointer and to
+  resume a thread
+"""
+
+import json
+import sqlite3
+import zlib
+from contextlib import asynccontextmanager
+
+import aiosqlite
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.serde.base import SerializerProtocol
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+from typing_extensions import Any, AsyncIterator, Optional
+
+# ===== CONFIGURATION =====
+
+# Checkpoint blobs at least this large (bytes) are zlib-compressed
+compression_threshold = 1024
+compression_level = 6
+
+_COMPRESSED_PREFIX = "zlib+"
+
+# ===== SERIALIZATION =====
+
+class CompressedSerializer(SerializerProtocol):
+    """Checkpoint serializer that compresses large payloads.
+
+    Wraps `JsonPlusSerializer`; payloads above `compression_threshold` bytes are
+    zlib-compressed and their type tag is prefixed with `zlib+`, so small values
+    and checkpoints written before compression was enabled still load.
+    """
+
+    def __init__(self, inner: Optional[SerializerProtocol] = None):
+        """Wrap a serializer, by default `JsonPlusSerializer`."""
+        self.inner = inner or JsonPlusSerializer()
+
+    def dumps_typed(self, obj: Any) -> tuple[str, bytes]:
+        """Serialize a value, compressing it if it is at least `compression_threshold` bytes."""
+        type_, data = self.inner.dumps_typed(obj)
+        if len(data) >= compression_threshold:
+            return _COMPRESSED_PREFIX + type_, zlib.compress(data, compression_level)
+        return type_, data
+
+    def loads_typed(self, data: tuple[str, bytes]) -> Any:
+        """Deserialize a value written by `dumps_typed`, compressed or not."""
+        type_, payload = data
+        if type_.startswith(_COMPRESSED_PREFIX):
+            return self.inner.loads_typed((type_[len(_COMPRESSED_PREFIX):], zlib.decompress(payload)))
+        return self.inner.loads_typed(data)
+
+# ===== RESEARCH UNIT STORE =====
+
+class ResearchUnitStore:
+    """Finished research unit results, keyed by thread ID and tool call ID.
+
+    Only the fields the supervisor needs are stored (compressed research, raw
+    notes, tokens used), compressed, in a table next to the checkpoints.
+    """
+
+    def __init__(self, path: str):
+        """Open the database at `path` and create the research unit table if needed."""
+        self.path = path
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS research_units ("
+            "thread_id TEXT NOT NULL, unit_id TEXT NOT NULL, result BLOB NOT NULL, "
+            "PRIMARY KEY (thread_id, unit_id))"
+        )
+        self._conn.commit()
+
+    def get(self, thread_id: str, unit_id: str) -> Optional[dict]:
+        """Return a stored result, or None if the unit has not finished."""
+        row = self._conn.execute(
+            "SELECT result FROM research_units WHERE thread_id = ? AND unit_id = ?",
+            (thread_id, unit_id),
+        ).fetchone()
+        return json.loads(zlib.decompress(row[0])) if row else None
+
+    def put(self, thread_id: str, unit_id: str, result: dict) -> None:
+        """Store a finished research unit result."""
+        payload = zlib.compress(json.dumps(result).encode("utf-8"), compression_level)
+        self._conn.execute(
+            "INSERT OR REPLACE INTO research_units (thread_id, unit_id, result) VALUES (?, ?, ?)",
+            (thread_id, unit_id, payload),
+        )
+        self._conn.commit()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+# Global store - set while a checkpointer is open
+_unit_store: Optional[ResearchUnitStore] = None
+
+def get_research_unit_store() -> Optional[ResearchUnitStore]:
+    """Return the research unit store of the open checkpointer, if any."""
+    return _unit_store
+
+def get_thread_id(config: Optional[RunnableConfig]) -> Optional[str]:
+    """Return the thread ID of a run config, if set."""
+    return ((config or {}).get("configurable") or {}).get("thread_id")
+
+# ===== CHECKPOINTER =====
+
+@asynccontextmanager
+async def open_checkpointer(path: str = "deep_research_checkpoints.sqlite") -> AsyncIterator[AsyncSqliteSaver]:
+    """Open a persistent SQLite checkpointer with compressed serialization.
+
+    While open, finished research units are also recorded in the same database
+    so they are reused when a thread is resumed.
+
+    Args:
+        path: SQLite database file
+
+    Yields:
+        Checkpointer to pass to `compile_agent` or `compile_supervisor`
+    """
+    global _unit_store
+    async with aiosqlite.connect(path) as conn:
+        checkpointer = AsyncSqliteSaver(conn, serde=CompressedSerializer())
+        await checkpointer.setup()
+        _unit_store = ResearchUnitStore(path)
+        try:
+            yield checkpointer
+        finally:
+            _unit_store.close()
+            _unit_store = None
+
+async def resume_research(graph, thread_id: str, config: Optional[RunnableConfig] = None) -> dict:
+    """Resume an interrupted run of a checkpointed graph from its last checkpoint.
+
+    Args:
+        graph: Graph compiled with a persistent checkpointer
+        thread_id: Thread ID of the interrupted run
+        config: Optional extra run config
+
+    Returns:
+        Final state of the resumed run
+    """
+    config = {**(config or {}), "configurable": {**(config or {}).get("configurable", {}), "thread_id": thread_id}}
+    return await graph.ainvoke(None, config=config)
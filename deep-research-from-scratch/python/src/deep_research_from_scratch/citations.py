@@ -0,0 +1,112 @@
+"""Citation Utilities.
+
+This module parses and rewrites the numbered citations used throughout the
+research system: inline `[n]` markers in the text and a trailing
+`### Sources` list of `[n] Title: URL` lines. Documents that were numbered
+independently (research notes, report sections) can be merged into one
+consistent numbering where each unique URL gets a single number.
+"""
+
+import logging
+import re
+
+from typing_extensions import List, Tuple
+
+# A "### Sources" (or "## Sources", "**Sources**") heading and everything after it
+_sources_heading_re = re.compile(r"^\s*(?:#{1,6}\s*|\*\*)\s*(?:List of (?:All )?(?:Relevant )?)?Sources\b.*$", re.I | re.M)
+# "[3] Title: https://..." or "- [3] Title - https://..."
+_source_line_re = re.compile(r"^\s*(?:[-*]\s*)?\[(\d+)\]\s*(.*?)\s*[:\-–]?\s*<?(https?://[^\s>]+)>?\s*$")
+# Inline "[3]" or "[3, 4]" markers that are not markdown links
+_inline_ref_re = re.compile(r"\[(\d+(?:\s*,\s*\d+)*)\](?!\()")
+
+logger = logging.getLogger(__name__)
+
+def split_sources(text: str) -> Tuple[str, dict[int, Tuple[str, str]]]:
+    """Split a document into its body and its numbered sources list.
+
+    Returns:
+        (body, sources) where sources maps local citation number to (title, url).
+        If no sources list is found, the whole text is the body.
+    """
+    headings = list(_sources_heading_re.finditer(text))
+    if not headings:
+        return text, {}
+
+    heading = headings[-1]
+    sources = {}
+    for line in text[heading.end():].splitlines():
+        match = _source_line_re.match(line)
+        if match:
+            sources[int(match.group(1))] = (match.group(2).strip() or match.group(3), match.group(3))
+    if not sources:
+        return text, {}
+    return text[:heading.start()].rstrip(), sources
+
+def renumber_citations(body: str, mapping: dict[int, int]) -> str:
+    """Rewrite inline `[n]` markers using a local-to-global number mapping.
+
+    Only markers citing at least one mapped number are rewritten; numbers of
+    such a marker that are not in the mapping cite no known source and are
+    dropped. Brackets with no mapped number (e.g. `x[0]`) are left untouched.
+    """
+    def replace(match: re.Match) -> str:
+        numbers = [int(n) for n in re.split(r"\s*,\s*", match.group(1))]
+        renumbered = sorted({mapping[n] for n in numbers if n in mapping})
+        if not renumbered:
+            return match.group(0)
+        return "[" + ", ".join(str(n) for n in renumbered) + "]"
+
+    return _inline_ref_re.sub(replace, body)
+
+def cited_numbers(text: str) -> List[int]:
+    """Return the citation numbers referenced inline in text, in order of first use."""
+    numbers = []
+    for match in _inline_ref_re.finditer(text):
+        numbers.extend(int(n) for n in re.split(r"\s*,\s*", match.group(1)))
+    return list(dict.fromkeys(numbers))
+
+def merge_citations(documents: List[str]) -> Tuple[List[str], List[Tuple[str, str]]]:
+    """Merge independently numbered documents into one citation numbering.
+
+    Each unique URL gets a single global number, in order of first appearance.
+    Inline markers are rewritten and the per-document sources lists removed.
+    A document without a parseable sources list is returned unchanged, since
+    its markers can't be mapped to URLs.
+
+    Returns:
+        (bodies, sources) with the rewritten bodies and the global
+        (title, url) list, where source i has citation number i + 1
+    """
+    url_numbers: dict[str, int] = {}
+    sources: List[Tuple[str, str]] = []
+    bodies = []
+    for document in documents:
+        body, local_sources = split_sources(document)
+        if not local_sources:
+            if cited_numbers(body):
+                logger.warning("No sources list found in a document with citations; leaving its citations as they are")
+            bodies.append(body)
+            continue
+        mapping = {}
+        for local_number, (title, url) in sorted(local_sources.items()):
+            key = url.rstrip("/")
+            if key not in url_numbers:
+                sources.append((title, url))
+                url_numbers[key] = len(sources)
+            mapping[local_number] = url_numbers[key]
+        bodies.append(renumber_citations(body, mapping))
+    return bodies, sources
+
+def format_numbered_sources(sources: dict[int, Tuple[str, str]]) -> str:
+    """Format a `### Sources` section that keeps the given (global) citation numbers."""
+    if not sources:
+        return ""
+    lines = [f"[{number}] {title}: {url}" for number, (title, url) in sorted(sources.items())]
+    return "### Sources\n\n" + "\n".join(lines)
+
+def format_sources(sources: List[Tuple[str, str]]) -> str:
+    """Format a global sources list as a `### Sources` section."""
+    if not sources:
+        return ""
+    lines = [f"[{i}] {title}: {url}" for i, (title, url) in enumerate(sources, 1)]
+    return "### Sources\n\n" + "\n".join(lines)
@@ -0,0 +1,222 @@
+"""Command Line Interface for the Deep Research Agent.
+
+Usage:
+    python -m deep_research_from_scratch.cli "Compare the best coffee shops in SF"
+    python -m deep_research_from_scratch.cli --stream "Compare the best coffee shops in SF"
+
+With --stream, progress (scoping, brief, researchers) is printed to stderr as it
+happens and the report is printed to stdout while it is being written. Streamed
+sections carry their own citation numbers; use --output to also save the
+stitched report with one merged sources list.
+
+With --checkpoint-db, the run is checkpointed to SQLite under --thread-id and
+can be continued after an interruption with --resume (no query needed):
+    python -m deep_research_from_scratch.cli --checkpoint-db runs.sqlite --thread-id t1 "..."
+    python -m deep_research_from_scratch.cli --checkpoint-db runs.sqlite --thread-id t1 --resume
+
+With --record, every model response and search is saved to a cassette file;
+--replay serves a run from one without network access (see cassette.py):
+    python -m deep_research_from_scratch.cli --record run.jsonl "..."
+    python -m deep_research_from_scratch.cli --replay run.jsonl --latency-scale 0
+
+With --profile, a per-node trace (wall/queue time, tokens, cost, retries) is
+written to a JSONL file and a summary with the critical path is printed at the end.
+
+With --memory, past research is kept in a local SQLite store; subtopics it
+already covers are answered from it (with the date they were gathered) and only
+the gaps are researched live.
+
+The research brief is written speculatively while the request is checked for
+ambiguity (discarded if a clarifying question is asked); --no-speculation runs
+the two steps one after the other.
+
+Clarification, supervisor reflection turns and research compression try a
+small model first and escalate to the large one when its output fails a check
+(see cascade.py); --no-cascade always uses the large models.
+
+With --llm-cache, model responses are cached in a SQLite file so rerunning the
+same request is served from disk; hit/miss counts are printed at the end.
+"""
+
+import argparse
+import asyncio
+import sys
+import uuid
+from contextlib import asynccontextmanager
+
+from langchain_core.messages import HumanMessage
+
+
+def _status(text: str) -> None:
+    sys.stderr.write(text + "\n")
+    sys.stderr.flush()
+
+class _OrderedReportPrinter:
+    """Print concurrently written report sections to stdout in outline order.
+
+    Tokens of the lowest unfinished section are printed live; tokens of later
+    sections are buffered and flushed once every section before them is done.
+    """
+
+    def __init__(self):
+        self.cursor = 0
+        self.buffers: dict[int, list[str]] = {}
+        self.finished: set[int] = set()
+
+    def token(self, text: str, section_index) -> None:
+        if section_index is None or section_index == self.cursor:
+            sys.stdout.write(text)
+            sys.stdout.flush()
+        else:
+            self.buffers.setdefault(section_index, []).append(text)
+
+    def section_done(self, index: int) -> None:
+        self.finished.add(index)
+        while self.cursor in self.finished:
+            self.cursor += 1
+            sys.stdout.write("\n\n" + "".join(self.buffers.pop(self.cursor, [])))
+            sys.stdout.flush()
+
+@asynccontextmanager
+async def _open_graph(checkpoint_db: str = None):
+    """Yield the full agent, compiled with a SQLite checkpointer if a database is given."""
+    from deep_research_from_scratch.research_agent_full import agent, compile_agent
+
+    if not checkpoint_db:
+        yield agent
+        return
+
+    from deep_research_from_scratch.checkpointing import open_checkpointer
+
+    async with open_checkpointer(checkpoint_db) as checkpointer:
+        yield compile_agent(checkpointer)
+
+async def _run_streaming(query: str, config: dict, checkpoint_db: str = None, output: str = None) -> None:
+    from deep_research_from_scratch.streaming import stream_research
+
+    printer = _OrderedReportPrinter()
+    streamed_tokens = False
+    async with _open_graph(checkpoint_db) as graph:
+        async for event in stream_research(query, config=config, graph=graph):
+            if event.type == "scope_decision":
+                _status(("Clarification needed: " if event.need_clarification else "Scope: ") + event.message)
+            elif event.type == "brief_ready":
+                _status(f"Research brief:\n{event.research_brief}\n")
+            elif event.type == "researcher_started":
+                _status(f"[researcher started] {event.research_topic[:100]}")
+            elif event.type == "researcher_finished":
+                _status(f"[researcher {event.status}] {event.research_topic[:100]}")
+            elif event.type == "research_ended":
+                _status(f"Ending research: {event.reason}")
+            elif event.type == "notes_deduplicated":
+                _status(f"Deduplicated notes: {event.paragraphs_before} -> {event.paragraphs_after} paragraphs, "
+                        f"{event.chars_before} -> {event.chars_after} characters")
+            elif event.type == "report_outline":
+                _status(f"Writing report '{event.title}' ({len(event.sections)} sections)\n")
+            elif event.type == "report_token":
+                streamed_tokens = True
+                printer.token(event.text, event.section_index)
+            elif event.type == "report_section":
+                printer.section_done(event.index)
+            elif event.type == "report_ready":
+                if not streamed_tokens:
+                    sys.stdout.write(event.final_report + "\n")
+                _write_output(output, event.final_report)
+
+async def _run(query: str, config: dict, checkpoint_db: str = None, output: str = None) -> None:
+    async with _open_graph(checkpoint_db) as graph:
+        graph_input = None if query is None else {"messages": [HumanMessage(content=query)]}
+        result = await graph.ainvoke(graph_input, config=config)
+    report = result.get("final_report") or result["messages"][-1].content
+    sys.stdout.write(report + "\n")
+    _write_output(output, report)
+
+def _write_output(output: str, report: str) -> None:
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(report)
+        _status(f"\nReport saved to {output}")
+
+def main(argv=None) -> None:
+    """Run the deep research agent from the command line."""
+    parser = argparse.ArgumentParser(description="Run the deep research agent on a question.")
+    parser.add_argument("query", nargs="?", help="Research question or request")
+    parser.add_argument("--stream", action="store_true", help="Stream progress events and report tokens as they are generated")
+    parser.add_argument("--output", help="Also write the final report to this file")
+    parser.add_argument("--checkpoint-db", help="SQLite file to checkpoint the run to")
+    parser.add_argument("--thread-id", help="Thread ID of the checkpointed run (default: a new random ID)")
+    parser.add_argument("--resume", action="store_true", help="Resume the checkpointed run --thread-id instead of starting a new one")
+    parser.add_argument("--llm-cache", help="SQLite file to cache LLM responses in (default: $DEEP_RESEARCH_LLM_CACHE)")
+    parser.add_argument("--record", metavar="CASSETTE", help="Record all model and search calls to this cassette file")
+    parser.add_argument("--replay", metavar="CASSETTE", help="Replay a recorded cassette instead of calling providers")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="Scale replayed latencies (0 replays instantly)")
+    parser.add_argument("--profile", metavar="TRACE", help="Write a per-node profiling trace to this JSONL file")
+    parser.add_argument("--memory", help="SQLite file of the cross-run research memory (default: $DEEP_RESEARCH_MEMORY)")
+    parser.add_argument("--no-cascade", action="store_true", help="Always use the large models instead of trying small ones first")
+    parser.add_argument("--no-speculation", action="store_true", help="Write the research brief only after the clarification check")
+    args = parser.parse_args(argv)
+
+    if args.record and args.replay:
+        parser.error("--record and --replay are mutually exclusive")
+    if args.resume and not (args.checkpoint_db and args.thread_id):
+        parser.error("--resume requires --checkpoint-db and --thread-id")
+    if args.replay and not args.query:
+        from deep_research_from_scratch.cassette import recorded_query
+
+        args.query = recorded_query(args.replay)
+    if not args.resume and not args.query:
+        parser.error("a query is required unless --resume is given")
+
+    thread_id = args.thread_id or str(uuid.uuid4())
+    if args.checkpoint_db and not args.thread_id:
+        _status(f"Thread ID: {thread_id}")
+    config = {"configurable": {"thread_id": thread_id}} if args.checkpoint_db else {}
+
+    from deep_research_from_scratch import llm_cache
+
+    if args.llm_cache:
+        llm_cache.configure_llm_cache(args.llm_cache, llm_cache.llm_cache_roles)
+    if args.memory:
+        from deep_research_from_scratch.research_memory import configure_research_memory
+
+        configure_research_memory(args.memory)
+    if args.record or args.replay:
+        from deep_research_from_scratch.cassette import use_cassette
+
+        cassette = use_cassette(args.record or args.replay, "record" if args.record else "replay", args.latency_scale)
+        if args.record:
+            cassette.record("run", "cli", "query", args.query, 0.0)
+
+    from deep_research_from_scratch import research_agent_scope
+
+    if args.no_speculation:
+        research_agent_scope.speculative_brief = False
+
+    from deep_research_from_scratch import cascade
+
+    if args.no_cascade:
+        cascade.cascade_enabled = False
+
+    profiler = None
+    if args.profile:
+        from deep_research_from_scratch.profiler import ResearchProfiler
+
+        profiler = ResearchProfiler(args.profile)
+        config = {**config, "callbacks": [profiler]}
+
+    run = _run_streaming if args.stream else _run
+    query = None if args.resume else args.query
+    asyncio.run(run(query, config, checkpoint_db=args.checkpoint_db, output=args.output))
+
+    if profiler is not None:
+        _status("\n" + profiler.format_summary())
+
+    if llm_cache.llm_cache_path:
+        _status(llm_cache.format_cache_stats())
+    if research_agent_scope.speculative_brief:
+        _status(research_agent_scope.speculation_stats.describe())
+    if cascade.cascade_enabled:
+        _status(cascade.format_cascade_stats())
+
+if __name__ == "__main__":
+    main()
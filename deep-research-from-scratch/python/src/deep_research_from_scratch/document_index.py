@@ -0,0 +1,317 @@
+"""Local BM25 Document Index.
+
+This module implements a small on-disk search index over the local research
+files, so the MCP researcher can find the relevant passages of a document
+instead of listing and reading whole files through the filesystem server.
+
+Key features:
+- Paragraph-aware passage splitting with character offsets into the source file
+- BM25 ranking over an inverted index of passages
+- Postings stored in a flat binary file and read through mmap
+- Incremental, mtime-based refresh: only new or modified files are re-tokenized
+- Thread-safe: searches from concurrent tool calls never see a half-written index
+"""
+
+import hashlib
+import json
+import math
+import mmap
+import os
+import threading
+from array import array
+from collections import Counter
+from pathlib import Path
+
+from langchain_core.tools import tool
+from typing_extensions import List, Optional
+
+from deep_research_from_scratch.passage_filter import split_passages, tokenize
+from deep_research_from_scratch.utils import get_current_dir
+
+# ===== CONFIGURATION =====
+
+# Target passage size in characters; passages break on paragraph boundaries
+passage_chars = 1200
+
+# BM25 parameters
+bm25_k1 = 1.2
+bm25_b = 0.75
+
+# File types that are indexed
+indexed_suffixes = {".md", ".txt", ".rst", ".html", ".csv", ".json"}
+
+# Default index location (one subdirectory per indexed directory); override
+# with the DEEP_RESEARCH_INDEX_DIR environment variable
+default_index_dir = Path.cwd() / ".deep_research" / "document_index"
+
+# ===== INDEX =====
+
+class DocumentIndex:
+    """BM25 index over the files in a directory.
+
+    The index lives in `index_dir` as:
+    - `docs/<name>.json`: per-file passages and term frequencies, keyed by mtime
+    - `postings.bin`: all postings as uint32 (passage_id, term_frequency) pairs
+    - `lexicon.json`: term -> [offset, count] into `postings.bin`
+    - `passages.json`: passage metadata (path, start, end, length)
+
+    `refresh()` re-tokenizes only files whose mtime or size changed and then
+    rewrites the merged postings from the cached per-file data. Refreshing and
+    searching hold a lock, since the search tool runs in several threads at once
+    and a refresh replaces the postings mmap.
+    """
+
+    def __init__(self, root: Path, index_dir: Optional[Path] = None):
+        """Create an index over a directory; nothing is read until the first refresh or search.
+
+        Args:
+            root: Directory of the files to index
+            index_dir: Where the index is stored; defaults to a subdirectory of
+                DEEP_RESEARCH_INDEX_DIR (or `default_index_dir`) named after `root`
+        """
+        self.root = Path(root).resolve()
+        if index_dir is None:
+            base_dir = Path(os.environ.get("DEEP_RESEARCH_INDEX_DIR", default_index_dir))
+            root_id = hashlib.sha256(str(self.root).encode()).hexdigest()[:16]
+            index_dir = base_dir / f"{self.root.name}-{root_id}"
+        self.index_dir = Path(index_dir)
+        self._lock = threading.RLock()
+        self._lexicon: dict[str, list[int]] = {}
+        self._passages: list[dict] = []
+        self._avg_len = 0.0
+        self._postings_file = None
+        self._postings: Optional[mmap.mmap] = None
+        self._manifest: dict[str, list[float]] = {}
+
+    # --- building ---
+
+    def _doc_cache_path(self, rel_path: str) -> Path:
+        return self.index_dir / "docs" / (rel_path.replace("/", "__") + ".json")
+
+    def _index_file(self, path: Path, rel_path: str) -> dict:
+        text = path.read_text(encoding="utf-8", errors="replace")
+        passages = []
+        for start, end in split_passages(text, max_chars=passage_chars):
+            terms = tokenize(text[start:end])
+            passages.append({
+                "start": start,
+                "end": end,
+                "length": len(terms),
+                "tf": dict(Counter(terms)),
+            })
+        doc = {"path": rel_path, "passages": passages}
+        cache_path = self._doc_cache_path(rel_path)
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(json.dumps(doc))
+        return doc
+
+    def _scan(self) -> dict[str, list[float]]:
+        files = {}
+        for path in sorted(self.root.rglob("*")):
+            if path.is_file() and path.suffix.lower() in indexed_suffixes and not path.name.startswith("."):
+                stat = path.stat()
+                files[path.relative_to(self.root).as_posix()] = [stat.st_mtime, stat.st_size]
+        return files
+
+    def refresh(self) -> bool:
+        """Bring the index up to date with the files on disk.
+
+        Returns:
+            True if anything changed and the postings were rewritten
+        """
+        with self._lock:
+            return self._refresh()
+
+    def _refresh(self) -> bool:
+        manifest_path = self.index_dir / "manifest.json"
+        if not self._manifest and manifest_path.exists():
+            self._manifest = json.loads(manifest_path.read_text())
+
+        current = self._scan()
+        if current == self._manifest and (self.index_dir / "postings.bin").exists():
+            if self._postings is None:
+                self._load()
+            return False
+
+        docs = []
+        for rel_path, stamp in current.items():
+            cache_path = self._doc_cache_path(rel_path)
+            if self._manifest.get(rel_path) == stamp and cache_path.exists():
+                docs.append(json.loads(cache_path.read_text()))
+            else:
+                docs.append(self._index_file(self.root / rel_path, rel_path))
+        for rel_path in set(self._manifest) - set(current):
+            self._doc_cache_path(rel_path).unlink(missing_ok=True)
+
+        self._write(docs)
+        self._manifest = current
+        manifest_path.write_text(json.dumps(current))
+        self._load()
+        return True
+
+    def _write(self, docs: list[dict]) -> None:
+        passages = []
+        inverted: dict[str, list[tuple[int, int]]] = {}
+        for doc in docs:
+            for passage in doc["passages"]:
+                passage_id = len(passages)
+                passages.append({
+                    "path": doc["path"],
+                    "start": passage["start"],
+                    "end": passage["end"],
+                    "length": passage["length"],
+                })
+                for term, tf in passage["tf"].items():
+                    inverted.setdefault(term, []).append((passage_id, tf))
+
+        lexicon = {}
+        postings = array("I")
+        for term in sorted(inverted):
+            entries = inverted[term]
+            lexicon[term] = [len(postings), len(entries)]
+            for passage_id, tf in entries:
+                postings.append(passage_id)
+                postings.append(tf)
+
+        self._close()
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.index_dir / "postings.bin", "wb") as f:
+            postings.tofile(f)
+        (self.index_dir / "lexicon.json").write_text(json.dumps(lexicon))
+        (self.index_dir / "passages.json").write_text(json.dumps(passages))
+
+    def _load(self) -> None:
+        self._close()
+        self._lexicon = json.loads((self.index_dir / "lexicon.json").read_text())
+        self._passages = json.loads((self.index_dir / "passages.json").read_text())
+        self._avg_len = (
+            sum(p["length"] for p in self._passages) / len(self._passages) if self._passages else 0.0
+        )
+        postings_path = self.index_dir / "postings.bin"
+        if postings_path.stat().st_size:
+            self._postings_file = open(postings_path, "rb")
+            self._postings = mmap.mmap(self._postings_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self) -> None:
+        """Release the postings mmap."""
+        with self._lock:
+            self._close()
+
+    def _close(self) -> None:
+        if self._postings is not None:
+            self._postings.close()
+            self._postings = None
+        if self._postings_file is not None:
+            self._postings_file.close()
+            self._postings_file = None
+
+    # --- querying ---
+
+    def _read_postings(self, term: str) -> array:
+        entry = self._lexicon.get(term)
+        postings = array("I")
+        if entry is None or self._postings is None:
+            return postings
+        offset, count = entry
+        itemsize = postings.itemsize
+        postings.frombytes(self._postings[offset * itemsize:(offset + 2 * count) * itemsize])
+        return postings
+
+    def search(self, query: str, max_results: int = 5) -> List[dict]:
+        """Rank passages against a query with BM25.
+
+        Returns:
+            List of passage dicts (path, start, end, score), best first
+        """
+        with self._lock:
+            self._refresh()
+            return self._rank(query, max_results)
+
+    def _rank(self, query: str, max_results: int) -> List[dict]:
+        n_passages = len(self._passages)
+        if not n_passages:
+            return []
+
+        scores: dict[int, float] = {}
+        for term in set(tokenize(query)):
+            postings = self._read_postings(term)
+            df = len(postings) // 2
+            if not df:
+                continue
+            idf = math.log(1 + (n_passages - df + 0.5) / (df + 0.5))
+            for i in range(0, len(postings), 2):
+                passage_id, tf = postings[i], postings[i + 1]
+                length = self._passages[passage_id]["length"]
+                norm = bm25_k1 * (1 - bm25_b + bm25_b * length / (self._avg_len or 1))
+                scores[passage_id] = scores.get(passage_id, 0.0) + idf * tf * (bm25_k1 + 1) / (tf + norm)
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:max_results]
+        return [dict(self._passages[passage_id], score=score) for passage_id, score in ranked]
+
+    def read_slice(self, path: str, start: int, end: int) -> str:
+        """Read a character range from an indexed file."""
+        target = (self.root / path).resolve()
+        if self.root not in target.parents:
+            raise ValueError(f"Path '{path}' is outside the indexed directory")
+        text = target.read_text(encoding="utf-8", errors="replace")
+        return text[max(0, start):max(0, end)]
+
+# Global index variable - will be built lazily on first search
+_index = None
+
+def get_document_index() -> DocumentIndex:
+    """Get or initialize the index over the research files directory."""
+    global _index
+    if _index is None:
+        _index = DocumentIndex(get_current_dir() / "files")
+    return _index
+
+# ===== SEARCH TOOLS =====
+
+@tool(parse_docstring=True)
+def search_documents(query: str, max_results: int = 5) -> str:
+    """Search the local research files and return the most relevant passages.
+
+    Passages are ranked with BM25 and returned with their file path and character
+    offsets, so you can read around a passage with read_document_slice instead of
+    reading whole files.
+
+    Args:
+        query: Keywords or a question describing the information you need
+        max_results: Maximum number of passages to return
+
+    Returns:
+        Ranked passages with file paths, character offsets, and scores
+    """
+    index = get_document_index()
+    results = index.search(query, max_results=max_results)
+    if not results:
+        return f"No passages found for '{query}'."
+
+    output = f"Top {len(results)} passage(s) for '{query}':\n"
+    for i, result in enumerate(results, 1):
+        passage = index.read_slice(result["path"], result["start"], result["end"])
+        output += (
+            f"\n--- PASSAGE {i}: {result['path']} [chars {result['start']}-{result['end']}] "
+            f"(score {result['score']:.2f}) ---\n{passage}\n"
+        )
+    return output
+
+@tool(parse_docstring=True)
+def read_document_slice(path: str, start: int, end: int) -> str:
+    """Read a character range from a local research file.
+
+    Use this to expand around a passage returned by search_documents.
+
+    Args:
+        path: File path relative to the research files directory, as shown in search results
+        start: Start character offset
+        end: End character offset (exclusive)
+
+    Returns:
+        The requested text slice
+    """
+    try:
+        return get_document_index().read_slice(path, start, end)
+    except Exception as e:
+        return f"Error reading {path}[{start}:{end}]: {str(e)}"
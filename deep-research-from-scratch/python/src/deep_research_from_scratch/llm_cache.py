@@ -0,0 +1,194 @@
+"""Opt-in On-Disk LLM Response Cache.
+
+Re-running a research brief during development or after a failure repeats many
+identical model calls (scoping, brief, supervisor and researcher turns). This
+module provides a SQLite-backed LangChain cache that the provider registry
+attaches to every chat model it creates, so repeated calls are served from disk.
+
+Key features:
+- Entries keyed by a SHA-256 of the model string (model and parameters) and the
+  serialized prompt, with per-run message IDs stripped so reruns still hit
+- Enabled per model role (scoping, supervisor, researchers, ...)
+- Hit and miss counters per role
+
+The cache is off by default. Enable it by setting DEEP_RESEARCH_LLM_CACHE to a
+database path, optionally restricted to some roles with
+DEEP_RESEARCH_LLM_CACHE_ROLES (comma-separated, e.g. "scope,compress").
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from dataclasses import asdict, dataclass
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import dumps, loads
+from typing_extensions import Any, Optional, Sequence
+
+# ===== CONFIGURATION =====
+
+# Database path; None disables caching
+llm_cache_path: Optional[str] = os.environ.get("DEEP_RESEARCH_LLM_CACHE") or None
+
+# Roles to cache; None caches every role
+llm_cache_roles: Optional[set[str]] = (
+    {role.strip() for role in os.environ["DEEP_RESEARCH_LLM_CACHE_ROLES"].split(",") if role.strip()}
+    if os.environ.get("DEEP_RESEARCH_LLM_CACHE_ROLES") else None
+)
+
+# ===== STORE =====
+
+class LLMResponseStore:
+    """SQLite table of cached generations, shared by all roles."""
+
+    def __init__(self, path: str):
+        """Open (or create) the cache database at `path`."""
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_responses ("
+            "key TEXT PRIMARY KEY, role TEXT NOT NULL, llm_string TEXT NOT NULL, generations TEXT NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the serialized generations stored under a key, or None."""
+        with self._lock:
+            row = self._conn.execute("SELECT generations FROM llm_responses WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def put(self, key: str, role: str, llm_string: str, generations: str) -> None:
+        """Store serialized generations under a key, replacing any earlier entry."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_responses (key, role, llm_string, generations) VALUES (?, ?, ?, ?)",
+                (key, role, llm_string, generations),
+            )
+            self._conn.commit()
+
+    def clear(self, role: Optional[str] = None) -> None:
+        """Delete the entries of a role, or every entry when role is None."""
+        with self._lock:
+            if role is None:
+                self._conn.execute("DELETE FROM llm_responses")
+            else:
+                self._conn.execute("DELETE FROM llm_responses WHERE role = ?", (role,))
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+# ===== CACHE =====
+
+@dataclass
+class CacheStats:
+    """Hit and miss counts of one role."""
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of lookups served from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+def strip_message_ids(value: Any) -> Any:
+    """Remove per-run message IDs from a serialized prompt (class paths under "id" are kept)."""
+    if isinstance(value, list):
+        return [strip_message_ids(item) for item in value]
+    if isinstance(value, dict):
+        stripped = {k: strip_message_ids(v) for k, v in value.items()}
+        kwargs = stripped.get("kwargs")
+        if stripped.get("lc") and isinstance(kwargs, dict):
+            kwargs.pop("id", None)
+        return stripped
+    return value
+
+def cache_key(prompt: str, llm_string: str) -> str:
+    """Return the cache key of a serialized prompt and model string."""
+    try:
+        prompt = json.dumps(strip_message_ids(json.loads(prompt)), sort_keys=True)
+    except ValueError:
+        pass
+    return hashlib.sha256(f"{llm_string}\x00{prompt}".encode()).hexdigest()
+
+class RoleCache(BaseCache):
+    """LangChain cache for the models of one role, backed by the shared store."""
+
+    def __init__(self, store: LLMResponseStore, role: str):
+        """Create the cache of a role on top of the shared store."""
+        self.store = store
+        self.role = role
+        self.stats = CacheStats()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        """Return the cached generations of a prompt, counting the hit or miss."""
+        cached = self.store.get(cache_key(prompt, llm_string))
+        if cached is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return [loads(generation) for generation in json.loads(cached)]
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        """Store the generations of a prompt."""
+        generations = json.dumps([dumps(generation) for generation in return_val])
+        self.store.put(cache_key(prompt, llm_string), self.role, llm_string, generations)
+
+    def clear(self, **kwargs: Any) -> None:
+        """Delete the cached entries of this role only."""
+        self.store.clear(self.role)
+
+# Global cache state - initialized lazily
+_lock = threading.Lock()
+_store: Optional[LLMResponseStore] = None
+_role_caches: dict[str, RoleCache] = {}
+
+def get_llm_cache(role: str) -> Optional[RoleCache]:
+    """Return the cache to attach to a role's model, or None if caching is off for it."""
+    global _store
+    if not llm_cache_path or (llm_cache_roles is not None and role not in llm_cache_roles):
+        return None
+    with _lock:
+        if _store is None:
+            _store = LLMResponseStore(llm_cache_path)
+        if role not in _role_caches:
+            _role_caches[role] = RoleCache(_store, role)
+        return _role_caches[role]
+
+def configure_llm_cache(path: Optional[str], roles: Optional[Sequence[str]] = None) -> None:
+    """Enable (path) or disable (None) the cache at runtime, optionally for some roles only.
+
+    Models that were already created keep their old setting; this also resets
+    the provider registry so models are re-created with the new one.
+    """
+    global llm_cache_path, llm_cache_roles, _store
+    from deep_research_from_scratch.providers import reset_providers
+
+    with _lock:
+        if _store is not None:
+            _store.close()
+        _store = None
+        _role_caches.clear()
+        llm_cache_path = path
+        llm_cache_roles = set(roles) if roles is not None else None
+    reset_providers()
+
+def get_cache_stats() -> dict[str, dict]:
+    """Return hit/miss counts and hit rate per cached role."""
+    return {role: {**asdict(cache.stats), "hit_rate": cache.stats.hit_rate} for role, cache in _role_caches.items()}
+
+def format_cache_stats() -> str:
+    """Render cache statistics as a short table."""
+    stats = get_cache_stats()
+    if not stats:
+        return "LLM cache: disabled"
+    lines = ["LLM cache:"]
+    for role, s in sorted(stats.items()):
+        lines.append(f"  {role:<14} hits {s['hits']:>5}  misses {s['misses']:>5}  hit rate {s['hit_rate']:.0%}")
+    return "\n".join(lines)
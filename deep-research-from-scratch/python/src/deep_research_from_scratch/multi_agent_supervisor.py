@@ -10,23 +10,31 @@ The supervisor uses parallel research execution to improve efficiency while
 maintaining isolated context windows for each research topic.
 """
 
-import asyncio
+import time
 
-from typing_extensions import Literal
+from typing_extensions import Literal, Optional
 
-from langchain.chat_models import init_chat_model
+from langchain_core.runnables import RunnableConfig
 from langchain_core.messages import (
     HumanMessage, 
     BaseMessage, 
-    SystemMessage, 
     ToolMessage,
     filter_messages
 )
+from langgraph.config import get_stream_writer
 from langgraph.graph import StateGraph, START, END
 from langgraph.types import Command
 
+from deep_research_from_scratch.blob_store import load_notes
+from deep_research_from_scratch.cascade import ainvoke_cascade
+from deep_research_from_scratch.novelty import novelty_exhausted, novelty_score
+from deep_research_from_scratch.prompt_cache import cached_system_message, with_history_breakpoint
+from deep_research_from_scratch.providers import get_model_with_tools
+from deep_research_from_scratch.rate_limiter import PRIORITY_HIGH, request_priority
 from deep_research_from_scratch.prompts import lead_researcher_prompt
-from deep_research_from_scratch.research_agent import researcher_agent
+from deep_research_from_scratch.research_agent import researcher_agent_unit
+from deep_research_from_scratch.research_memory import format_known_sources, format_memory_note, get_research_memory
+from deep_research_from_scratch.research_scheduler import ResearchScheduler, ResearchUnitStats, count_tokens_used
 from deep_research_from_scratch.state_multi_agent_supervisor import (
     SupervisorState, 
     ConductResearch, 
@@ -67,9 +75,8 @@ except ImportError:
 
 # ===== CONFIGURATION =====
 
-supervisor_tools = [ConductResearch, ResearchComplete, think_tool]
-supervisor_model = init_chat_model(model="anthropic:claude-sonnet-4-20250514")
-supervisor_model_with_tools = supervisor_model.bind_tools(supervisor_tools)
+supervisor_tool_list = [ConductResearch, ResearchComplete, think_tool]
+# The "supervisor" model is created lazily by the provider registry and bound on first use
 
 # System constants
 # Maximum number of tool call iterations for individual researcher agents
@@ -77,9 +84,64 @@ supervisor_model_with_tools = supervisor_model.bind_tools(supervisor_tools)
 max_researcher_iterations = 6 # Calls to think_tool + ConductResearch
 
 # Maximum number of concurrent research agents the supervisor can launch
-# This is passed to the lead_researcher_prompt to limit parallel research tasks
+# This is passed to the lead_researcher_prompt and enforced by the ResearchScheduler;
+# extra ConductResearch calls wait in a queue
 max_concurrent_researchers = 3
 
+# Global research budgets across all supervisor iterations (None disables the limit)
+# Once spent, running researchers are cancelled, queued ones skipped, and supervision ends.
+# Tokens are charged when a researcher finishes, so the total can overshoot the
+# token budget by up to max_concurrent_researchers units
+research_token_budget = None  # Total tokens reported by researcher LLM calls
+research_time_budget = None  # Seconds since the first research units were launched
+
+# Novelty-based early stopping: each round of research is scored by how much
+# its findings add to the notes gathered so far (1.0 = all new); supervision
+# ends once `supervisor_novelty_patience` consecutive rounds score below the threshold.
+# Off by default: it can end supervision earlier than the supervisor would
+supervisor_novelty_stopping = False
+supervisor_novelty_threshold = 0.25
+supervisor_novelty_patience = 2
+
+# Model cascade (see cascade.py): the small model is only tried on the turn right
+# after research results, and its turn is only used when it is a think_tool
+# reflection of at least this many characters
+supervisor_min_reflection_chars = 200
+
+def _is_reflection_turn(message: BaseMessage) -> bool:
+    tool_calls = getattr(message, "tool_calls", None) or []
+    return bool(tool_calls) and all(call["name"] == "think_tool" for call in tool_calls)
+
+def expects_reflection(supervisor_messages: list) -> bool:
+    """Check whether the next supervisor turn should reflect on research results just returned.
+
+    Only those turns are tried with the small model: on any other turn the
+    supervisor decides what to research or whether to finish, which
+    `check_supervisor_turn` always escalates.
+    """
+    if not supervisor_messages or supervisor_messages[-1].type != "tool":
+        return False
+    previous = next((m for m in reversed(supervisor_messages) if m.type == "ai"), None)
+    tool_calls = getattr(previous, "tool_calls", None) or []
+    return any(call["name"] == "ConductResearch" for call in tool_calls)
+
+def check_supervisor_turn(response: BaseMessage, supervisor_messages: list) -> Optional[str]:
+    """Accept a small model supervisor turn only if it is a substantive reflection on new results.
+
+    Delegating research (ConductResearch) and finishing (ResearchComplete) are
+    left to the supervisor model, as are two reflections in a row.
+    """
+    if not getattr(response, "tool_calls", None):
+        return "no tool calls"
+    if not _is_reflection_turn(response):
+        return "research decision"
+    previous = next((m for m in reversed(supervisor_messages) if m.type == "ai"), None)
+    if previous is not None and _is_reflection_turn(previous):
+        return "repeated reflection"
+    if any(len(call["args"].get("reflection", "")) < supervisor_min_reflection_chars for call in response.tool_calls):
+        return "short reflection"
+    return None
+
 # ===== SUPERVISOR NODES =====
 
 async def supervisor(state: SupervisorState) -> Command[Literal["supervisor_tools"]]:
@@ -104,10 +166,22 @@ async def supervisor(state: SupervisorState) -> Command[Literal["supervisor_tool
         max_concurrent_research_units=max_concurrent_researchers,
         max_researcher_iterations=max_researcher_iterations
     )
-    messages = [SystemMessage(content=system_message)] + supervisor_messages
 
-    # Make decision about next research steps
-    response = await supervisor_model_with_tools.ainvoke(messages)
+    async def decide(role: str):
+        # Static system prompt and the conversation so far are cacheable prefixes
+        messages = [cached_system_message(role, system_message)] + with_history_breakpoint(role, supervisor_messages)
+        return await get_model_with_tools(role, supervisor_tool_list).ainvoke(messages)
+
+    # Make decision about next research steps; admitted ahead of queued researcher calls.
+    # A small model handles reflections on new research results; other turns go
+    # straight to the supervisor model
+    with request_priority(PRIORITY_HIGH):
+        response = await ainvoke_cascade(
+            "supervisor",
+            decide,
+            lambda r: check_supervisor_turn(r, supervisor_messages),
+            try_small=expects_reflection(supervisor_messages),
+        )
 
     return Command(
         goto="supervisor_tools",
@@ -117,17 +191,26 @@ async def supervisor(state: SupervisorState) -> Command[Literal["supervisor_tool
         }
     )
 
-async def supervisor_tools(state: SupervisorState) -> Command[Literal["supervisor", "__end__"]]:
+async def supervisor_tools(state: SupervisorState, config: RunnableConfig) -> Command[Literal["supervisor", "__end__"]]:
     """Execute supervisor decisions - either conduct research or end the process.
 
     Handles:
     - Executing think_tool calls for strategic reflection
-    - Launching parallel research agents for different topics
+    - Launching parallel research agents for different topics, at most
+      max_concurrent_researchers at a time and within the global budget
     - Aggregating research results
     - Determining when research is complete
 
+    When the graph runs with a persistent checkpointer (see checkpointing.py),
+    each finished research unit is recorded by thread ID and tool call ID, so
+    resuming an interrupted thread does not run completed units again.
+
+    With the research memory enabled (see research_memory.py), topics covered
+    by earlier runs are served from memory, and new findings are added to it.
+
     Args:
         state: Current supervisor state with messages and iteration count
+        config: Run config, used for the thread ID
 
     Returns:
         Command to continue supervision, end process, or handle errors
@@ -139,6 +222,8 @@ async def supervisor_tools(state: SupervisorState) -> Command[Literal["superviso
     # Initialize variables for single return pattern
     tool_messages = []
     all_raw_notes = []
+    completed_tool_messages = []  # Finished research kept as notes if the budget ends supervision
+    research_updates = {}
     next_step = "supervisor"  # Default next step
     should_end = False
 
@@ -181,19 +266,95 @@ async def supervisor_tools(state: SupervisorState) -> Command[Literal["superviso
 
             # Handle ConductResearch calls (asynchronous)
             if conduct_research_calls:
-                # Launch parallel research agents
-                coros = [
-                    researcher_agent.ainvoke({
-                        "researcher_messages": [
-                            HumanMessage(content=tool_call["args"]["research_topic"])
-                        ],
-                        "research_topic": tool_call["args"]["research_topic"]
-                    }) 
-                    for tool_call in conduct_research_calls
+                # Imported here so loading the graph does not load the SQLite checkpointer
+                from deep_research_from_scratch.checkpointing import (
+                    get_research_unit_store,
+                    get_thread_id,
+                )
+
+                started_at = state.get("research_started_at") or time.time()
+                scheduler = ResearchScheduler(
+                    max_concurrency=max_concurrent_researchers,
+                    token_budget=research_token_budget,
+                    tokens_used=state.get("research_tokens_used", 0),
+                    deadline=started_at + research_time_budget if research_time_budget is not None else None,
+                )
+
+                write_stream = get_stream_writer()
+                unit_store = get_research_unit_store()
+                memory = get_research_memory()
+                thread_id = get_thread_id(config)
+
+                async def run_research_unit(unit_id: str, topic: str) -> dict:
+                    """Run one researcher, reporting start and finish to streaming callers."""
+                    result = unit_store.get(thread_id, unit_id) if unit_store and thread_id else None
+                    if result is None:
+                        write_stream({"type": "researcher_started", "unit_id": unit_id, "research_topic": topic})
+                        known_sources = format_known_sources(memory.known_sources(topic)) if memory is not None else ""
+                        result = await researcher_agent_unit.ainvoke({
+                            "researcher_messages": [HumanMessage(content=topic + known_sources)],
+                            "research_topic": topic
+                        })
+                        if memory is not None and result.get("compressed_research"):
+                            memory.add_research(topic, result["compressed_research"], load_notes(result.get("raw_notes", [])))
+                        if unit_store and thread_id:
+                            unit_store.put(thread_id, unit_id, {
+                                "compressed_research": result.get("compressed_research", ""),
+                                "raw_notes": result.get("raw_notes", []),
+                                "tokens_used": count_tokens_used(result),
+                            })
+                    write_stream({
+                        "type": "researcher_finished",
+                        "unit_id": unit_id,
+                        "research_topic": topic,
+                        "status": "completed",
+                        "compressed_research": result.get("compressed_research", ""),
+                    })
+                    return result
+
+                # Topics covered by earlier runs are served from the research memory;
+                # only the gaps go to live researchers
+                remembered = {}
+                if memory is not None:
+                    for tool_call in conduct_research_calls:
+                        entry = memory.lookup_topic(tool_call["args"]["research_topic"])
+                        if entry is not None:
+                            remembered[tool_call["id"]] = entry
+                live_calls = [tool_call for tool_call in conduct_research_calls if tool_call["id"] not in remembered]
+
+                # Queue research agents; at most max_concurrent_researchers run at once
+                units = [
+                    (
+                        tool_call["id"],
+                        tool_call["args"]["research_topic"],
+                        lambda unit_id=tool_call["id"], topic=tool_call["args"]["research_topic"]: run_research_unit(unit_id, topic)
+                    )
+                    for tool_call in live_calls
                 ]
 
-                # Wait for all research to complete
-                tool_results = await asyncio.gather(*coros)
+                # Wait for all research to complete, be cancelled, or be skipped
+                outcomes = {
+                    tool_call["id"]: outcome
+                    for tool_call, outcome in zip(live_calls, await scheduler.run(units))
+                }
+                for tool_call in conduct_research_calls:
+                    entry = remembered.get(tool_call["id"])
+                    if entry is not None:
+                        outcomes[tool_call["id"]] = (
+                            {"compressed_research": format_memory_note(entry), "raw_notes": []},
+                            ResearchUnitStats(tool_call["id"], tool_call["args"]["research_topic"], status="memory"),
+                        )
+                scheduled = [outcomes[tool_call["id"]] for tool_call in conduct_research_calls]
+
+                for result, stats in scheduled:
+                    if result is None or stats.status == "memory":
+                        write_stream({
+                            "type": "researcher_finished",
+                            "unit_id": stats.unit_id,
+                            "research_topic": stats.research_topic,
+                            "status": stats.status,
+                            "compressed_research": result.get("compressed_research", "") if result else "",
+                        })
 
                 # Format research results as tool messages
                 # Each sub-agent returns compressed research findings in result["compressed_research"]
@@ -201,20 +362,62 @@ async def supervisor_tools(state: SupervisorState) -> Command[Literal["superviso
                 # the supervisor to later retrieve these findings via get_notes_from_tool_calls()
                 research_tool_messages = [
                     ToolMessage(
-                        content=result.get("compressed_research", "Error synthesizing research report"),
+                        content=(
+                            result.get("compressed_research", "Error synthesizing research report")
+                            if result is not None
+                            else f"Research {stats.status}: {stats.error or 'no result'}"
+                        ),
                         name=tool_call["name"],
-                        tool_call_id=tool_call["id"]
-                    ) for result, tool_call in zip(tool_results, conduct_research_calls)
+                        tool_call_id=tool_call["id"],
+                        status="success" if result is not None else "error",
+                    ) for (result, stats), tool_call in zip(scheduled, conduct_research_calls)
                 ]
 
                 tool_messages.extend(research_tool_messages)
+                completed_tool_messages = [
+                    message for message, (result, _) in zip(research_tool_messages, scheduled)
+                    if result is not None
+                ]
 
-                # Aggregate raw notes from all research
+                # Aggregate raw note references from all research (content stays in the blob store)
                 all_raw_notes = [
-                    "\n".join(result.get("raw_notes", [])) 
-                    for result in tool_results
+                    ref
+                    for result, _ in scheduled if result is not None
+                    for ref in result.get("raw_notes", [])
                 ]
 
+                # Score how much this round's findings add to the notes gathered so far
+                round_novelty = research_round_novelty(
+                    [message.content for message in completed_tool_messages],
+                    get_notes_from_tool_calls(supervisor_messages),
+                )
+                novelty_scores = list(state.get("research_novelty") or [])
+                if round_novelty is not None:
+                    novelty_scores.append(round_novelty)
+
+                research_updates = {
+                    "research_started_at": started_at,
+                    "research_tokens_used": scheduler.tokens_used,
+                    "research_unit_stats": [stats.to_dict() for _, stats in scheduled],
+                    "research_novelty": novelty_scores,
+                }
+
+                # Stop delegating once the global budget is spent
+                if scheduler.budget_exhausted():
+                    write_stream({"type": "research_ended", "reason": scheduler.exhausted_reason})
+                    should_end = True
+                    next_step = END
+                # ... or once research rounds stop adding new findings
+                elif supervisor_novelty_stopping and novelty_exhausted(
+                    novelty_scores, supervisor_novelty_threshold, supervisor_novelty_patience
+                ):
+                    write_stream({
+                        "type": "research_ended",
+                        "reason": f"novelty of the last round was {novelty_scores[-1]:.2f}",
+                    })
+                    should_end = True
+                    next_step = END
+
         except Exception as e:
             print(f"Error in supervisor tools: {e}")
             should_end = True
@@ -225,8 +428,10 @@ async def supervisor_tools(state: SupervisorState) -> Command[Literal["superviso
         return Command(
             goto=next_step,
             update={
-                "notes": get_notes_from_tool_calls(supervisor_messages),
-                "research_brief": state.get("research_brief", "")
+                "notes": get_notes_from_tool_calls(list(supervisor_messages) + completed_tool_messages),
+                "research_brief": state.get("research_brief", ""),
+                "raw_notes": all_raw_notes,
+                **research_updates
             }
         )
     else:
@@ -234,10 +439,25 @@ async def supervisor_tools(state: SupervisorState) -> Command[Literal["superviso
             goto=next_step,
             update={
                 "supervisor_messages": tool_messages,
-                "raw_notes": all_raw_notes
+                "raw_notes": all_raw_notes,
+                **research_updates
             }
         )
 
+def research_round_novelty(findings: list[str], notes: list[str]) -> Optional[float]:
+    """Return the mean novelty of a round's findings, or None if nothing completed.
+
+    Each finding is compared with the earlier notes and with the findings
+    before it in the same round, so overlapping parallel researchers count too.
+    """
+    if not findings:
+        return None
+    scores, seen = [], list(notes)
+    for finding in findings:
+        scores.append(novelty_score([finding], seen))
+        seen.append(finding)
+    return sum(scores) / len(scores)
+
 # ===== GRAPH CONSTRUCTION =====
 
 # Build supervisor graph
@@ -246,3 +466,7 @@ supervisor_builder.add_node("supervisor", supervisor)
 supervisor_builder.add_node("supervisor_tools", supervisor_tools)
 supervisor_builder.add_edge(START, "supervisor")
 supervisor_agent = supervisor_builder.compile()
+
+def compile_supervisor(checkpointer=None):
+    """Compile the supervisor graph with a checkpointer, e.g. from checkpointing.open_checkpointer."""
+    return supervisor_builder.compile(checkpointer=checkpointer)
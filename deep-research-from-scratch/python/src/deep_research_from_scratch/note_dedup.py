@@ -0,0 +1,117 @@
+"""Deduplication of Research Notes Before Report Generation.
+
+Researchers with overlapping topics report many of the same facts and sources,
+and each note numbers its citations independently. Before the notes reach the
+report writer, this module:
+1. Merges the citations of all notes into one numbering, so the same URL has
+   the same number everywhere
+2. Drops paragraphs that are near-duplicates (MinHash similarity) of a paragraph
+   already kept, adding the dropped paragraph's citations to the kept one
+3. Rebuilds each note with a sources list of only the citations it still uses
+
+Headings and short paragraphs are always kept so the notes stay readable. Notes
+without a parseable sources list are passed through unchanged, since their
+citations can't be mapped to URLs.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+from typing_extensions import List, Tuple
+
+from deep_research_from_scratch.citations import (
+    cited_numbers,
+    format_numbered_sources,
+    merge_citations,
+    split_sources,
+)
+from deep_research_from_scratch.novelty import max_similarities, min_chunk_chars
+
+# ===== CONFIGURATION =====
+
+# Paragraphs at least this similar (estimated Jaccard of word shingles) to a kept one are dropped
+dedup_similarity_threshold = 0.5
+
+# ===== DEDUPLICATION =====
+
+@dataclass
+class DedupStats:
+    """Size of the notes before and after deduplication."""
+    paragraphs_before: int = 0
+    paragraphs_after: int = 0
+    chars_before: int = 0
+    chars_after: int = 0
+
+    def describe(self) -> str:
+        """Summarize the reduction in one line."""
+        return (f"Deduplicated notes: {self.paragraphs_before} -> {self.paragraphs_after} paragraphs, "
+                f"{self.chars_before} -> {self.chars_after} characters")
+
+def _split_paragraphs(body: str) -> List[str]:
+    return [p.strip() for p in body.split("\n\n") if p.strip()]
+
+def _is_dedup_candidate(paragraph: str) -> bool:
+    return len(paragraph) >= min_chunk_chars and not paragraph.lstrip().startswith("#")
+
+def _add_citations(paragraph: str, numbers: List[int]) -> str:
+    missing = [n for n in numbers if n not in set(cited_numbers(paragraph))]
+    if not missing:
+        return paragraph
+    marker = f"[{', '.join(str(n) for n in missing)}]"
+    if paragraph.endswith("."):
+        return f"{paragraph[:-1]} {marker}."
+    return f"{paragraph} {marker}"
+
+def dedup_notes(notes: List[str], threshold: float = dedup_similarity_threshold) -> Tuple[List[str], DedupStats]:
+    """Merge citations across notes and drop near-duplicate paragraphs.
+
+    Args:
+        notes: Research notes, each with its own `[n]` citations and sources list
+        threshold: Similarity at or above which a paragraph counts as a duplicate
+
+    Returns:
+        (notes, stats): the deduplicated notes (same order, empty notes removed)
+        and their size before and after
+    """
+    bodies, sources = merge_citations(notes)
+    sourced = [bool(split_sources(note)[1]) for note in notes]
+    stats = DedupStats(chars_before=sum(len(note) for note in notes))
+
+    kept_texts: List[str] = []  # Candidate paragraphs kept so far, for comparison
+    kept_at: List[Tuple[int, int]] = []  # (note index, paragraph index) of each kept candidate
+    deduped: List[List[str]] = []
+    for note_index, body in enumerate(bodies):
+        paragraphs = []
+        for paragraph in _split_paragraphs(body):
+            stats.paragraphs_before += 1
+            if not sourced[note_index]:
+                paragraphs.append(paragraph)
+                continue
+            if _is_dedup_candidate(paragraph) and kept_texts:
+                similarities = max_similarities([paragraph], kept_texts)
+                if similarities[0] >= threshold:
+                    # Keep the first occurrence, crediting it with this paragraph's sources
+                    best = int(np.argmax(max_similarities(kept_texts, [paragraph])))
+                    kept_note, kept_paragraph = kept_at[best]
+                    target = deduped[kept_note] if kept_note < note_index else paragraphs
+                    target[kept_paragraph] = _add_citations(target[kept_paragraph], cited_numbers(paragraph))
+                    continue
+            if _is_dedup_candidate(paragraph):
+                kept_texts.append(paragraph)
+                kept_at.append((note_index, len(paragraphs)))
+            paragraphs.append(paragraph)
+        deduped.append(paragraphs)
+
+    result = []
+    for note_index, paragraphs in enumerate(deduped):
+        if not any(_is_dedup_candidate(p) for p in paragraphs):
+            continue
+        stats.paragraphs_after += len(paragraphs)
+        if not sourced[note_index]:
+            result.append(notes[note_index].strip())
+            continue
+        body = "\n\n".join(paragraphs)
+        used = {n: sources[n - 1] for n in cited_numbers(body) if 0 < n <= len(sources)}
+        result.append(f"{body}\n\n{format_numbered_sources(used)}".rstrip())
+    stats.chars_after = sum(len(note) for note in result)
+    return result, stats
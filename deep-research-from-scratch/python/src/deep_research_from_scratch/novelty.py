@@ -0,0 +1,101 @@
+"""Near-Duplicate Detection and Novelty Scoring with MinHash.
+
+Researchers often run extra searches that only return information they already
+have, and parallel researchers with overlapping topics report the same facts.
+This module estimates text overlap cheaply and locally with MinHash signatures
+over word shingles (no embedding model or network calls):
+- `novelty_score` measures how much of new content is not already covered by
+  content gathered earlier, used to stop research rounds that add little
+- `similarity` compares two chunks, used to deduplicate notes
+"""
+
+import re
+import zlib
+from functools import lru_cache
+
+import numpy as np
+from typing_extensions import List, Sequence
+
+from deep_research_from_scratch.passage_filter import tokenize
+
+# ===== CONFIGURATION =====
+
+# Number of hash functions per signature (estimate error is about 1/sqrt(n))
+num_permutations = 64
+# Words per shingle
+shingle_size = 3
+# Chunks shorter than this many characters are ignored
+min_chunk_chars = 80
+
+_PRIME = (1 << 61) - 1
+_rng = np.random.default_rng(20240601)
+# Universal hash parameters; uint64 products wrap around, which only adds mixing
+_hash_a = _rng.integers(1, _PRIME, size=num_permutations, dtype=np.uint64)
+_hash_b = _rng.integers(0, _PRIME, size=num_permutations, dtype=np.uint64)
+
+# Separators between sources in search tool output, and between paragraphs
+_source_re = re.compile(r"\n-{3} SOURCE \d+: ")
+_paragraph_re = re.compile(r"\n\s*\n")
+
+# ===== SIGNATURES =====
+
+def shingles(text: str) -> np.ndarray:
+    """Return the hashed word shingles of a text as unique uint64 values."""
+    terms = tokenize(text)
+    if len(terms) < shingle_size:
+        grams = [" ".join(terms)] if terms else []
+    else:
+        grams = [" ".join(terms[i:i + shingle_size]) for i in range(len(terms) - shingle_size + 1)]
+    return np.unique(np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64, count=len(grams)))
+
+@lru_cache(maxsize=8192)
+def minhash(text: str) -> bytes:
+    """Return the MinHash signature of a text (cached, as bytes)."""
+    values = shingles(text)
+    if values.size == 0:
+        return np.full(num_permutations, _PRIME, dtype=np.uint64).tobytes()
+    hashed = (_hash_a[:, None] * values[None, :] + _hash_b[:, None]) % np.uint64(_PRIME)
+    return hashed.min(axis=1).tobytes()
+
+def _signatures(chunks: Sequence[str]) -> np.ndarray:
+    if not chunks:
+        return np.empty((0, num_permutations), dtype=np.uint64)
+    return np.stack([np.frombuffer(minhash(chunk), dtype=np.uint64) for chunk in chunks])
+
+def similarity(a: str, b: str) -> float:
+    """Estimate the Jaccard similarity of the shingles of two texts."""
+    return float(np.mean(np.frombuffer(minhash(a), dtype=np.uint64) == np.frombuffer(minhash(b), dtype=np.uint64)))
+
+def max_similarities(chunks: Sequence[str], reference: Sequence[str]) -> np.ndarray:
+    """Return, for each chunk, its highest estimated similarity to any reference chunk."""
+    if not chunks or not reference:
+        return np.zeros(len(chunks))
+    new, seen = _signatures(chunks), _signatures(reference)
+    return (new[:, None, :] == seen[None, :, :]).mean(axis=2).max(axis=1)
+
+# ===== NOVELTY =====
+
+def split_chunks(text: str) -> List[str]:
+    """Split text into comparable chunks: search results per source, otherwise paragraphs."""
+    parts = _source_re.split(text) if _source_re.search(text) else _paragraph_re.split(text)
+    return [part.strip() for part in parts if len(part.strip()) >= min_chunk_chars]
+
+def novelty_score(new_texts: Sequence[str], seen_texts: Sequence[str]) -> float:
+    """Estimate the share of new content not already covered by seen content.
+
+    Each chunk of the new texts scores 1 minus its highest similarity to any
+    chunk seen before; the score is the mean over chunks (1.0 = all new,
+    0.0 = all repeated).
+
+    Returns:
+        Novelty in [0, 1]; 1.0 when nothing was seen yet, 0.0 when there is no new content
+    """
+    new_chunks = [chunk for text in new_texts for chunk in split_chunks(text)]
+    if not new_chunks:
+        return 0.0
+    seen_chunks = [chunk for text in seen_texts for chunk in split_chunks(text)]
+    return float(np.mean(1.0 - max_similarities(new_chunks, seen_chunks)))
+
+def novelty_exhausted(scores: Sequence[float], threshold: float, patience: int) -> bool:
+    """Check whether the last `patience` novelty scores all stayed below the threshold."""
+    return patience > 0 and len(scores) >= patience and all(score < threshold for score in scores[-patience:])
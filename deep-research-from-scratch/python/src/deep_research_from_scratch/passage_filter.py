@@ -0,0 +1,144 @@
+"""Query-Focused Passage Filtering.
+
+This module implements a cheap local pre-filter for webpage content: the page is
+split into passages, passages are scored against the search query and research
+topic with BM25, and only the best passages that fit a token budget are kept.
+The summarization model then sees a few relevant paragraphs instead of the
+whole raw page.
+"""
+
+import math
+import re
+
+import numpy as np
+from typing_extensions import List, Sequence
+
+# ===== CONFIGURATION =====
+
+# BM25 parameters
+bm25_k1 = 1.2
+bm25_b = 0.75
+
+_token_re = re.compile(r"[a-z0-9]+")
+
+_stopwords = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the "
+    "this to was were will with".split()
+)
+
+# ===== TEXT PROCESSING =====
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase and split text into alphanumeric terms, dropping stopwords."""
+    return [t for t in _token_re.findall(text.lower()) if t not in _stopwords]
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of LLM tokens in text (about four characters per token)."""
+    return math.ceil(len(text) / 4)
+
+def split_passages(text: str, max_chars: int = 1200) -> List[tuple[int, int]]:
+    """Split text into passages on blank-line boundaries.
+
+    Paragraphs are merged until a passage reaches `max_chars`; a single
+    paragraph longer than that is cut into `max_chars` pieces.
+
+    Returns:
+        List of (start, end) character offsets into `text`
+    """
+    spans = []
+    for match in re.finditer(r"\S(?:.*?)(?=\n\s*\n|\Z)", text, flags=re.S):
+        start, end = match.span()
+        while end - start > max_chars:
+            spans.append((start, start + max_chars))
+            start += max_chars
+        spans.append((start, end))
+
+    passages = []
+    for start, end in spans:
+        if passages and end - passages[-1][0] <= max_chars:
+            passages[-1] = (passages[-1][0], end)
+        else:
+            passages.append((start, end))
+    return passages
+
+# ===== SCORING =====
+
+def bm25_scores(passages: Sequence[List[str]], query: List[str]) -> np.ndarray:
+    """Score tokenized passages against a tokenized query with BM25.
+
+    The term-frequency matrix is built only over the query vocabulary, so the
+    cost is linear in the passage text and the scoring itself is vectorized.
+
+    Returns:
+        Array of one score per passage
+    """
+    vocab = {term: i for i, term in enumerate(dict.fromkeys(query))}
+    if not passages or not vocab:
+        return np.zeros(len(passages))
+
+    tf = np.zeros((len(passages), len(vocab)))
+    for row, terms in enumerate(passages):
+        for term in terms:
+            col = vocab.get(term)
+            if col is not None:
+                tf[row, col] += 1
+
+    lengths = np.array([len(terms) for terms in passages], dtype=float)
+    avg_len = lengths.mean() or 1.0
+    df = np.count_nonzero(tf, axis=0)
+    idf = np.log(1 + (len(passages) - df + 0.5) / (df + 0.5))
+    norm = bm25_k1 * (1 - bm25_b + bm25_b * lengths / avg_len)
+    return (idf * tf * (bm25_k1 + 1) / (tf + norm[:, None])).sum(axis=1)
+
+def select_passages(
+    text: str,
+    query: str,
+    research_topic: str = "",
+    token_budget: int = 3000,
+    topic_weight: float = 0.5,
+    passage_chars: int = 800,
+) -> str:
+    """Keep the passages of text most relevant to a query within a token budget.
+
+    Passages are ranked by BM25 against the query plus `topic_weight` times
+    BM25 against the research topic, greedily packed into the budget, and
+    returned in their original document order. Passages with no matching
+    terms are dropped unless nothing matches at all.
+
+    Args:
+        text: Full page content
+        query: Search query that produced the page
+        research_topic: Broader research topic, used as a secondary signal
+        token_budget: Maximum estimated tokens to keep
+        topic_weight: Weight of the research topic score relative to the query
+        passage_chars: Target passage size in characters
+
+    Returns:
+        Selected passages joined by blank lines
+    """
+    if estimate_tokens(text) <= token_budget:
+        return text
+
+    spans = split_passages(text, max_chars=passage_chars)
+    if not spans:
+        return ""
+    passages = [tokenize(text[start:end]) for start, end in spans]
+    scores = bm25_scores(passages, tokenize(query))
+    if research_topic:
+        scores = scores + topic_weight * bm25_scores(passages, tokenize(research_topic))
+
+    selected = []
+    used = 0
+    # Stable sort keeps earlier passages first among equal scores (e.g. no matches)
+    has_matches = bool(scores.max() > 0)
+    for index in np.argsort(-scores, kind="stable"):
+        if has_matches and scores[index] <= 0:
+            break
+        start, end = spans[index]
+        cost = estimate_tokens(text[start:end])
+        if used + cost > token_budget:
+            continue
+        selected.append(index)
+        used += cost
+
+    return "\n\n".join(text[spans[i][0]:spans[i][1]] for i in sorted(selected))
@@ -0,0 +1,291 @@
+"""Per-Node Tracing and Cost Profiling for Research Runs.
+
+`ResearchProfiler` is a LangChain callback handler that can be passed to any of
+the graphs (`agent`, `supervisor_agent`, `researcher_agent`) through the run
+config:
+
+    profiler = ResearchProfiler("trace.jsonl")
+    await agent.ainvoke(input, config={"callbacks": [profiler]})
+    print(profiler.format_summary())
+
+It records one span per graph node execution, LLM call, and tool call with:
+- wall time, and queue time (waiting for provider rate limiters; for research
+  units, waiting for a free researcher slot)
+- input/output tokens and estimated cost of LLM calls
+- retries and errors
+
+Spans are appended to a JSONL trace file as they finish. The summary aggregates
+them per node, model, and tool, and shows the critical path: the chain of spans
+that determined when the run finished.
+"""
+
+import json
+import threading
+import time
+from dataclasses import asdict, dataclass
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from typing_extensions import Any, List, Optional
+
+from deep_research_from_scratch.rate_limiter import track_run_wait, untrack_run_wait
+
+# ===== CONFIGURATION =====
+
+# USD per million (input, output) tokens, matched by model name prefix
+model_prices: dict[str, tuple[float, float]] = {
+    "claude-sonnet-4": (3.0, 15.0),
+    "claude-3-5-haiku": (0.8, 4.0),
+    "gpt-4.1-mini": (0.4, 1.6),
+    "gpt-4.1": (2.0, 8.0),
+}
+
+def estimate_cost(model: Optional[str], input_tokens: int, output_tokens: int) -> float:
+    """Estimate the USD cost of an LLM call (0 for unknown models)."""
+    for prefix, (input_price, output_price) in sorted(model_prices.items(), key=lambda item: -len(item[0])):
+        if model and model.startswith(prefix):
+            return (input_tokens * input_price + output_tokens * output_price) / 1e6
+    return 0.0
+
+# ===== SPANS =====
+
+@dataclass
+class Span:
+    """One node execution, LLM call, tool call, or research unit."""
+    kind: str
+    name: str
+    run_id: str
+    parent_id: Optional[str]
+    start: float
+    end: float = 0.0
+    queue_time: float = 0.0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cost: float = 0.0
+    retries: int = 0
+    error: Optional[str] = None
+    model: Optional[str] = None
+
+    @property
+    def wall_time(self) -> float:
+        """Seconds from start to end of the span."""
+        return max(0.0, self.end - self.start)
+
+    def to_dict(self) -> dict:
+        """Return the span as a JSON-serializable trace record."""
+        record = asdict(self)
+        record["wall_time"] = round(self.wall_time, 4)
+        return record
+
+# ===== PROFILER =====
+
+class ResearchProfiler(BaseCallbackHandler):
+    """Callback handler that records spans of a research run."""
+
+    # Run in the caller's thread/task so timings and rate limiter waits are accurate
+    run_inline = True
+
+    def __init__(self, trace_path: Optional[str] = None):
+        """Create a profiler; an existing trace file is truncated.
+
+        Args:
+            trace_path: Optional JSONL file that finished spans are appended to
+        """
+        self.trace_path = trace_path
+        self.spans: dict[str, Span] = {}
+        self.finished: List[Span] = []
+        # Parent links of every run, including the ones without a span (routers, wrappers)
+        self._parents: dict[str, Optional[str]] = {}
+        self._span_ids: set[str] = set()
+        # Context tokens of the model and tool runs whose limiter waits are tracked
+        self._wait_tokens: dict[str, Any] = {}
+        self._lock = threading.Lock()
+        if trace_path:
+            open(trace_path, "w", encoding="utf-8").close()
+
+    # ----- span bookkeeping -----
+
+    def _start(self, kind: str, name: str, run_id: UUID, parent_run_id: Optional[UUID], **extra) -> None:
+        run_id, parent_id = str(run_id), str(parent_run_id) if parent_run_id else None
+        with self._lock:
+            self._parents[run_id] = parent_id
+            self._span_ids.add(run_id)
+            self.spans[run_id] = Span(kind, name, run_id, self._span_ancestor(parent_id), time.time(), **extra)
+            if kind in ("llm", "tool"):
+                self._wait_tokens[run_id] = track_run_wait(run_id)
+
+    def _finish(self, run_id: UUID, error: Optional[BaseException] = None) -> Optional[Span]:
+        with self._lock:
+            span = self.spans.pop(str(run_id), None)
+            if span is None:
+                return None
+            span.end = time.time()
+            if span.run_id in self._wait_tokens:
+                span.queue_time += untrack_run_wait(span.run_id, self._wait_tokens.pop(span.run_id))
+            # Nodes and graphs queue for as long as the calls they made did
+            parent = self.spans.get(span.parent_id) if span.parent_id else None
+            if parent is not None:
+                parent.queue_time += span.queue_time
+            if error is not None:
+                span.error = f"{type(error).__name__}: {error}"[:300]
+            self.finished.append(span)
+        self._write(span)
+        return span
+
+    def _span_ancestor(self, run_id: Optional[str]) -> Optional[str]:
+        """Return the nearest ancestor run that has (or had) a span."""
+        while run_id is not None and run_id not in self._span_ids:
+            run_id = self._parents.get(run_id)
+        return run_id
+
+    def _write(self, span: Span) -> None:
+        if not self.trace_path:
+            return
+        with self._lock:
+            with open(self.trace_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(span.to_dict()) + "\n")
+
+    # ----- graphs and nodes -----
+
+    def on_chain_start(self, serialized: Optional[dict], inputs: Any, *, run_id: UUID, parent_run_id: Optional[UUID] = None,
+                       metadata: Optional[dict] = None, **kwargs: Any) -> None:
+        """Start a span for the root graph or a graph node; other chains only record their parent."""
+        name = kwargs.get("name") or (serialized or {}).get("name", "")
+        node = (metadata or {}).get("langgraph_node")
+        if parent_run_id is None:
+            self._start("graph", name or "graph", run_id, None)
+        elif node and name == node:
+            self._start("node", name, run_id, parent_run_id)
+        else:
+            with self._lock:
+                self._parents[str(run_id)] = str(parent_run_id)
+
+    def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        """Finish a graph or node span, adding research unit spans for supervisor_tools."""
+        span = self._finish(run_id)
+        if span is not None and span.kind == "node":
+            self._record_research_units(span, outputs)
+
+    def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        """Finish a graph or node span with its error."""
+        self._finish(run_id, error)
+
+    def _record_research_units(self, node: Span, outputs: Any) -> None:
+        """Add research unit spans (with scheduler queue time) reported by supervisor_tools."""
+        update = getattr(outputs, "update", outputs)
+        if not isinstance(update, dict):
+            return
+        for stats in update.get("research_unit_stats") or []:
+            end = node.start + stats.get("queue_wait", 0.0) + stats.get("run_time", 0.0)
+            span = Span("research_unit", stats.get("research_topic", "")[:80], f"{node.run_id}:{stats['unit_id']}", node.run_id,
+                        start=end - stats.get("run_time", 0.0), end=end, queue_time=stats.get("queue_wait", 0.0),
+                        error=stats.get("error") or (None if stats.get("status") == "completed" else stats.get("status")))
+            with self._lock:
+                self.finished.append(span)
+            self._write(span)
+
+    # ----- LLM calls -----
+
+    def on_chat_model_start(self, serialized: Optional[dict], messages: Any, *, run_id: UUID, parent_run_id: Optional[UUID] = None,
+                            metadata: Optional[dict] = None, **kwargs: Any) -> None:
+        """Start a span for a chat model call."""
+        model = (metadata or {}).get("ls_model_name") or ((serialized or {}).get("kwargs") or {}).get("model")
+        self._start("llm", model or kwargs.get("name") or "llm", run_id, parent_run_id, model=model)
+
+    def on_llm_start(self, serialized: Optional[dict], prompts: Any, *, run_id: UUID, parent_run_id: Optional[UUID] = None,
+                     metadata: Optional[dict] = None, **kwargs: Any) -> None:
+        """Start a span for a completion model call."""
+        model = (metadata or {}).get("ls_model_name")
+        self._start("llm", model or "llm", run_id, parent_run_id, model=model)
+
+    def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        """Finish a model call span with its token usage and estimated cost."""
+        span = self.spans.get(str(run_id))
+        if span is not None:
+            for generations in response.generations:
+                for generation in generations:
+                    usage = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+                    span.input_tokens += usage.get("input_tokens", 0)
+                    span.output_tokens += usage.get("output_tokens", 0)
+            span.cost = estimate_cost(span.model, span.input_tokens, span.output_tokens)
+        self._finish(run_id)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        """Finish a model call span with its error."""
+        self._finish(run_id, error)
+
+    # ----- tools -----
+
+    def on_tool_start(self, serialized: Optional[dict], input_str: str, *, run_id: UUID, parent_run_id: Optional[UUID] = None,
+                      **kwargs: Any) -> None:
+        """Start a span for a tool call."""
+        self._start("tool", kwargs.get("name") or (serialized or {}).get("name", "tool"), run_id, parent_run_id)
+
+    def on_tool_end(self, output: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        """Finish a tool call span."""
+        self._finish(run_id)
+
+    def on_tool_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        """Finish a tool call span with its error."""
+        self._finish(run_id, error)
+
+    # ----- retries -----
+
+    def on_retry(self, retry_state: Any, *, run_id: UUID, parent_run_id: Optional[UUID] = None, **kwargs: Any) -> None:
+        """Count a retry on the nearest open span."""
+        with self._lock:
+            span_id = self._span_ancestor(str(run_id))
+            span = self.spans.get(span_id) if span_id else None
+            if span is not None:
+                span.retries += 1
+
+    # ===== REPORTING =====
+
+    def summary(self) -> List[dict]:
+        """Aggregate finished spans per (kind, name)."""
+        groups: dict[tuple, dict] = {}
+        for span in self.finished:
+            if span.kind == "graph":
+                continue
+            group = groups.setdefault((span.kind, span.name), {
+                "kind": span.kind, "name": span.name, "count": 0, "wall_time": 0.0, "max_wall_time": 0.0,
+                "queue_time": 0.0, "input_tokens": 0, "output_tokens": 0, "cost": 0.0, "retries": 0, "errors": 0,
+            })
+            group["count"] += 1
+            group["wall_time"] += span.wall_time
+            group["max_wall_time"] = max(group["max_wall_time"], span.wall_time)
+            group["queue_time"] += span.queue_time
+            group["input_tokens"] += span.input_tokens
+            group["output_tokens"] += span.output_tokens
+            group["cost"] += span.cost
+            group["retries"] += span.retries
+            group["errors"] += span.error is not None
+        return sorted(groups.values(), key=lambda g: -g["wall_time"])
+
+    def critical_path(self) -> List[Span]:
+        """Return the chain of spans, from the root down, that finished last at each level."""
+        children: dict[Optional[str], List[Span]] = {}
+        for span in self.finished:
+            children.setdefault(span.parent_id, []).append(span)
+        path, level = [], children.get(None, [])
+        while level:
+            span = max(level, key=lambda s: s.end)
+            path.append(span)
+            level = children.get(span.run_id, [])
+        return path
+
+    def format_summary(self) -> str:
+        """Render the per-node summary table and the critical path."""
+        lines = [f"{'kind':<14}{'name':<34}{'count':>6}{'wall s':>10}{'max s':>9}{'queue s':>9}"
+                 f"{'in tok':>10}{'out tok':>9}{'cost $':>9}{'retry':>6}{'err':>5}"]
+        for g in self.summary():
+            lines.append(f"{g['kind']:<14}{g['name'][:33]:<34}{g['count']:>6}{g['wall_time']:>10.2f}{g['max_wall_time']:>9.2f}"
+                         f"{g['queue_time']:>9.2f}{g['input_tokens']:>10}{g['output_tokens']:>9}{g['cost']:>9.4f}"
+                         f"{g['retries']:>6}{g['errors']:>5}")
+        total_cost = sum(span.cost for span in self.finished)
+        lines.append(f"\nEstimated LLM cost: ${total_cost:.4f}")
+        lines.append("\nCritical path:")
+        for depth, span in enumerate(self.critical_path()):
+            lines.append(f"{'  ' * depth}{span.kind} {span.name[:60]}  {span.wall_time:.2f}s"
+                         + (f" (queued {span.queue_time:.2f}s)" if span.queue_time else ""))
+        return "\n".join(lines)
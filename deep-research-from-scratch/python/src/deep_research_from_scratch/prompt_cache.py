@@ -0,0 +1,146 @@
+"""Provider Prompt Caching for Static System Prompts.
+
+The researcher, supervisor, and compression prompts are large and do not change
+within a run, yet they are resent on every loop iteration. Providers can cache
+a repeated prompt prefix and skip reprocessing it, which cuts time to first
+token, but only if the prefix is byte-for-byte identical between requests.
+
+This module builds the messages of those calls so that:
+- The static system prompt comes first, unchanged between turns; per-turn
+  context (e.g. the research digest) follows it instead of being spliced in
+- For providers with explicit cache breakpoints (Anthropic), a breakpoint is
+  placed after the static system prompt and after the last message, so each
+  turn reads the previous turn's conversation from cache
+- Providers with automatic prefix caching (OpenAI) get the same stable
+  ordering without breakpoints
+
+`StubPromptCacheModel` is a local chat model that simulates a breakpoint-based
+cache, to verify breakpoint placement and cache hits without a provider (use
+the model spec "stub:prompt-cache").
+"""
+
+import hashlib
+import json
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, SystemMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import Field
+from typing_extensions import Any, List, Optional, Sequence
+
+from deep_research_from_scratch.providers import model_specs
+
+# ===== CONFIGURATION =====
+
+# Set to False to send plain messages without breakpoints
+prompt_caching_enabled = True
+
+# Providers (model spec prefixes) that take explicit cache breakpoints
+breakpoint_providers = {"anthropic", "stub"}
+
+CACHE_CONTROL = {"type": "ephemeral"}
+
+# ===== MESSAGE BUILDING =====
+
+def supports_breakpoints(role: str) -> bool:
+    """Check whether the model of a role takes explicit cache breakpoints."""
+    provider = model_specs[role]["model"].split(":", 1)[0]
+    return prompt_caching_enabled and provider in breakpoint_providers
+
+def _text_block(text: str, breakpoint: bool = False) -> dict:
+    block = {"type": "text", "text": text}
+    if breakpoint:
+        block["cache_control"] = CACHE_CONTROL
+    return block
+
+def cached_system_message(role: str, static_prompt: str, dynamic_context: str = "") -> SystemMessage:
+    """Build a system message with the static prompt as a cacheable prefix.
+
+    Args:
+        role: Model role the message is sent to (decides whether to add a breakpoint)
+        static_prompt: Prompt text that is identical on every turn of the run
+        dynamic_context: Per-turn text, placed after the static prompt
+
+    Returns:
+        System message; with a cache breakpoint after the static prompt when supported
+    """
+    if not supports_breakpoints(role):
+        return SystemMessage(content=static_prompt + dynamic_context)
+    blocks = [_text_block(static_prompt, breakpoint=True)]
+    if dynamic_context:
+        blocks.append(_text_block(dynamic_context))
+    return SystemMessage(content=blocks)
+
+def with_history_breakpoint(role: str, messages: Sequence[BaseMessage]) -> List[BaseMessage]:
+    """Mark the last message as a cache breakpoint so the next turn reads the conversation from cache.
+
+    The message is copied; graph state is not modified.
+    """
+    messages = list(messages)
+    if not supports_breakpoints(role) or not messages or messages[-1].type not in ("human", "tool"):
+        return messages
+    last = messages[-1]
+    if isinstance(last.content, str):
+        content = [_text_block(last.content, breakpoint=True)]
+    elif last.content and isinstance(last.content[-1], dict):
+        content = list(last.content[:-1]) + [{**last.content[-1], "cache_control": CACHE_CONTROL}]
+    else:
+        return messages
+    messages[-1] = last.model_copy(update={"content": content})
+    return messages
+
+# ===== STUB PROVIDER =====
+
+def _blocks(message: BaseMessage) -> List[dict]:
+    content = message.content
+    if isinstance(content, str):
+        return [{"type": "text", "text": content}]
+    return [block if isinstance(block, dict) else {"type": "text", "text": str(block)} for block in content]
+
+class StubPromptCacheModel(BaseChatModel):
+    """Local chat model that simulates breakpoint-based prompt caching.
+
+    Every request is recorded with its breakpoint positions and the number of
+    prompt tokens that a provider would read from cache: the longest prefix of
+    the request, ending at a breakpoint of an earlier request, that is repeated
+    unchanged. Responses are a fixed text without tool calls.
+    """
+
+    # Prefixes shorter than this (approximate tokens) are not cached, as with Anthropic
+    min_cacheable_tokens: int = 1024
+    response_text: str = "stub response"
+    requests: List[dict] = Field(default_factory=list)
+    cached_prefixes: dict[str, int] = Field(default_factory=dict)
+
+    @property
+    def _llm_type(self) -> str:
+        return "stub-prompt-cache"
+
+    def bind_tools(self, tools: Sequence[Any], **kwargs: Any) -> "StubPromptCacheModel":
+        """Return the model itself; the stub never calls tools."""
+        return self
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        digest, tokens, breakpoints, prefixes = hashlib.sha256(), 0, [], []
+        for message_index, message in enumerate(messages):
+            for block_index, block in enumerate(_blocks(message)):
+                serialized = json.dumps([message.type, {k: v for k, v in block.items() if k != "cache_control"}], sort_keys=True)
+                digest.update(serialized.encode("utf-8"))
+                tokens += len(serialized) // 4
+                if "cache_control" in block:
+                    breakpoints.append((message_index, block_index))
+                prefixes.append((digest.hexdigest(), tokens, "cache_control" in block))
+
+        cache_read = max((t for h, t, _ in prefixes if h in self.cached_prefixes), default=0)
+        cache_write = 0
+        for prefix_hash, prefix_tokens, is_breakpoint in prefixes:
+            if is_breakpoint and prefix_tokens >= self.min_cacheable_tokens and prefix_hash not in self.cached_prefixes:
+                self.cached_prefixes[prefix_hash] = prefix_tokens
+                cache_write = prefix_tokens - cache_read
+        self.requests.append({"breakpoints": breakpoints, "input_tokens": tokens, "cache_read": cache_read, "cache_write": max(0, cache_write)})
+
+        message = AIMessage(content=self.response_text, usage_metadata={
+            "input_tokens": tokens, "output_tokens": 2, "total_tokens": tokens + 2,
+            "input_token_details": {"cache_read": cache_read, "cache_creation": max(0, cache_write)},
+        })
+        return ChatResult(generations=[ChatGeneration(message=message)])
@@ -201,7 +201,9 @@ You can use any of the tools provided to you to find and read files that help an
 </Task>
 
 <Available Tools>
-You have access to file system tools and thinking tools:
+You have access to document search, file system tools and thinking tools:
+- **search_documents**: Ranked passages from all local files for a query, with file paths and character offsets
+- **read_document_slice**: Read a character range of a file, e.g. to expand around a search result
 - **list_allowed_directories**: See what directories you can access
 - **list_directory**: List files in directories
 - **read_file**: Read individual files
@@ -210,15 +212,16 @@ You have access to file system tools and thinking tools:
 - **think_tool**: For reflection and strategic planning during research
 
 **CRITICAL: Use think_tool after reading files to reflect on findings and plan next steps**
+**PREFER search_documents over reading whole files** - it returns only the relevant passages
 </Available Tools>
 
 <Instructions>
 Think like a human researcher with access to a document library. Follow these steps:
 
 1. **Read the question carefully** - What specific information does the user need?
-2. **Explore available files** - Use list_allowed_directories and list_directory to understand what's available
-3. **Identify relevant files** - Use search_files if needed to find documents matching the topic
-4. **Read strategically** - Start with most relevant files, use read_multiple_files for efficiency
+2. **Search first** - Use search_documents to find the passages that match the topic
+3. **Expand only where needed** - Use read_document_slice around promising passages; fall back to list_directory and read_file only if search finds nothing
+4. **Read strategically** - Start with the highest-ranked passages, use read_multiple_files only when you need whole documents
 5. **After reading, pause and assess** - Do I have enough to answer? What's still missing?
 6. **Stop when you can answer confidently** - Don't keep reading for perfection
 </Instructions>
@@ -349,6 +352,50 @@ The report should be structured like this:
 Critical Reminder: It is extremely important that any information that is even remotely relevant to the user's research topic is preserved verbatim (e.g. don't rewrite it, don't summarize it, don't paraphrase it).
 """
 
+fold_research_digest_prompt = """You are maintaining a running digest of research findings for a research assistant whose context window is being compacted. For context, today's date is {date}.
+
+RESEARCH TOPIC: {research_topic}
+
+<Current Digest>
+{digest}
+</Current Digest>
+
+<New Tool Outputs>
+{tool_outputs}
+</New Tool Outputs>
+
+<Task>
+Fold the new tool outputs into the current digest and return the updated digest.
+- Keep every fact, figure, name and date that is relevant to the research topic
+- Keep the URL and title of every source, and attach each fact to its source
+- Merge information that several sources agree on instead of repeating it
+- Drop think_tool reflections, navigation text and anything unrelated to the research topic
+- Return only the updated digest, without preamble
+</Task>
+"""
+
+fold_compressed_research_prompt = """You are incrementally compressing the findings of an AI researcher while the research is still running. For context, today's date is {date}.
+
+RESEARCH TOPIC: {research_topic}
+
+<Compressed Findings So Far>
+{running_summary}
+</Compressed Findings So Far>
+
+<New Tool Outputs>
+{tool_outputs}
+</New Tool Outputs>
+
+<Task>
+Merge the new tool outputs into the compressed findings and return the updated findings.
+- Preserve every statement that is relevant to the research topic verbatim; do not summarize or paraphrase it
+- Only remove information that is clearly irrelevant or an exact duplicate (e.g. "These three sources all stated X")
+- Assign each unique URL a single citation number, keep the numbers already used in the findings, and cite inline as [n]
+- End with ### Sources that lists every source as "[n] Source Title: URL", numbered sequentially without gaps
+- Return only the updated findings, without preamble
+</Task>
+"""
+
 compress_research_human_message = """All above messages are about research conducted by an AI Researcher for the following research topic:
 
 RESEARCH TOPIC: {research_topic}
@@ -443,6 +490,74 @@ Format the report in clear markdown with proper structure and include source ref
 </Citation Rules>
 """
 
+report_outline_prompt = """You are planning the outline of a research report that answers the following research brief:
+<Research Brief>
+{research_brief}
+</Research Brief>
+
+Today's date is {date}.
+
+The research produced the numbered notes below (long notes are truncated for planning):
+<Notes>
+{notes}
+</Notes>
+
+<Task>
+Plan the sections of the report. For each section give:
+- a title
+- a short description of what the section must cover
+- the ids of the notes that contain the information for that section
+
+Guidelines:
+- Structure the report the way that best answers the brief: a comparison may need an overview of each side and a comparison section, a list may need just one section, an overview may need one section per concept
+- Every note that is relevant to the brief should be used by at least one section
+- Sections must not overlap in scope; each fact should belong to exactly one section
+- Keep the number of sections between 1 and {max_sections}
+- Write titles in the same language as the research brief
+</Task>
+"""
+
+report_section_prompt = """You are writing one section of a research report that answers the following research brief:
+<Research Brief>
+{research_brief}
+</Research Brief>
+
+Today's date is {date}.
+
+<Report Outline>
+{outline}
+</Report Outline>
+
+You are writing ONLY this section:
+<Section>
+Title: {section_title}
+Covers: {section_description}
+</Section>
+
+Here are the research notes relevant to this section:
+<Findings>
+{findings}
+</Findings>
+
+<Task>
+Write the section in markdown:
+- Start with "## {section_title}" and use ### for subsections
+- Include specific facts and insights from the findings; stay within the scope of this section, other sections cover the rest of the outline
+- Use simple, clear language, in paragraph form by default and bullet points where appropriate
+- Be as long as necessary to answer this part of the brief thoroughly
+- Do NOT refer to yourself or describe what you are doing; do not add an introduction or conclusion for the whole report
+- Write in the same language as the research brief
+</Task>
+
+<Citation Rules>
+- Assign each unique URL a single citation number and cite it inline as [1], [2], ...
+- End with ### Sources that lists each source you cited with its number, one per line:
+  [1] Source Title: URL
+  [2] Source Title: URL
+- Only cite sources that appear in the findings
+</Citation Rules>
+"""
+
 BRIEF_CRITERIA_PROMPT = """
 <role>
 You are an expert research brief evaluator specializing in assessing whether generated research briefs accurately capture user-specified criteria without loss of important details.
@@ -0,0 +1,155 @@
+"""Lazy Model and Client Registry.
+
+Every chat model and external client used by the research system is created
+here on first use and shared across modules, instead of being constructed at
+import time in each module. Importing the graphs therefore does not load
+provider SDKs, read API keys, or open network clients, which keeps cold start
+fast for LangGraph server workers and the CLI.
+
+Models are requested by role (e.g. "research", "compress"); roles with the same
+model spec share a single instance. When the LLM response cache is enabled for a
+role (see llm_cache.py), its model is created with that cache attached. Models
+and the Tavily client go through the shared provider rate limiters when enabled (see
+rate_limiter.py), and are recorded or replayed when a cassette is active (see
+cassette.py). The model spec "stub:prompt-cache" selects a local stub that
+simulates provider prompt caching (see prompt_cache.py).
+"""
+
+import threading
+
+from typing_extensions import Any, Optional, Sequence
+
+# ===== CONFIGURATION =====
+
+# Model spec per role: keyword arguments for `init_chat_model`
+model_specs: dict[str, dict[str, Any]] = {
+    # Researcher tool-calling loop
+    "research": {"model": "anthropic:claude-sonnet-4-20250514"},
+    # Webpage summarization and context-compaction digests
+    "summarization": {"model": "openai:gpt-4.1-mini"},
+    # Research compression (model="anthropic:claude-sonnet-4-20250514", max_tokens=64000)
+    "compress": {"model": "openai:gpt-4.1", "max_tokens": 32000},
+    # Supervisor delegation loop
+    "supervisor": {"model": "anthropic:claude-sonnet-4-20250514"},
+    # Clarification and research brief
+    "scope": {"model": "openai:gpt-4.1", "temperature": 0.0},
+    # Final report (model="anthropic:claude-sonnet-4-20250514", max_tokens=64000)
+    "writer": {"model": "openai:gpt-4.1", "max_tokens": 32000},
+    # Small models tried first by the model cascade (see cascade.py); the
+    # scope model returns logprobs so its confidence can be checked
+    "scope_small": {"model": "openai:gpt-4.1-mini", "temperature": 0.0, "logprobs": True},
+    "supervisor_small": {"model": "anthropic:claude-3-5-haiku-20241022"},
+    "compress_small": {"model": "openai:gpt-4.1-mini", "max_tokens": 32000},
+}
+
+_lock = threading.Lock()
+_models: dict[tuple, Any] = {}
+_bound_models: dict[tuple, Any] = {}
+_tavily_client = None
+
+# ===== REGISTRY =====
+
+def _spec_key(spec: dict[str, Any]) -> tuple:
+    return tuple(sorted((k, repr(v)) for k, v in spec.items()))
+
+def get_model(role: str):
+    """Return the chat model for a role, creating it on first use.
+
+    Args:
+        role: Key of `model_specs`
+
+    Returns:
+        Chat model shared by every role with the same spec
+    """
+    from deep_research_from_scratch.cassette import get_cassette, get_cassette_cache
+    from deep_research_from_scratch.llm_cache import get_llm_cache
+    from deep_research_from_scratch.rate_limiter import get_rate_limiter
+
+    spec = model_specs[role]
+    # A record/replay cassette takes the place of the response cache
+    cache = get_cassette_cache(role) or get_llm_cache(role)
+    # Cached roles get their own instance so hits and misses are counted per role
+    key = _spec_key(spec) if cache is None else ("cached", role, _spec_key(spec))
+    model = _models.get(key)
+    if model is None:
+        with _lock:
+            model = _models.get(key)
+            if model is None:
+                from langchain.chat_models import init_chat_model
+
+                options = {} if cache is None else {"cache": cache}
+                limiter = get_rate_limiter(spec["model"])
+                if limiter is not None:
+                    options.update(rate_limiter=limiter, callbacks=[limiter.usage_callback])
+                cassette = get_cassette()
+                if cassette is not None and cassette.mode == "replay":
+                    # Replays never reach the provider, so no real API key is needed
+                    options["api_key"] = "replay"
+                if spec["model"].startswith("stub:"):
+                    # Local stub that simulates prompt caching (see prompt_cache.py)
+                    from deep_research_from_scratch.prompt_cache import (
+                        StubPromptCacheModel,
+                    )
+
+                    options.pop("api_key", None)
+                    model = StubPromptCacheModel(**options, **{k: v for k, v in spec.items() if k != "model"})
+                else:
+                    model = init_chat_model(**spec, **options)
+                _models[key] = model
+    return model
+
+def get_model_with_tools(role: str, tools: Sequence, **kwargs):
+    """Return the role's model bound to tools, memoized by role and tool names."""
+    key = (role, tuple(getattr(tool, "name", None) or getattr(tool, "__name__", repr(tool)) for tool in tools), _spec_key(kwargs))
+    bound = _bound_models.get(key)
+    if bound is None:
+        bound = get_model(role).bind_tools(list(tools), **kwargs)
+        _bound_models[key] = bound
+    return bound
+
+def get_tavily_client():
+    """Return the shared Tavily client, creating it on first use."""
+    global _tavily_client
+    if _tavily_client is None:
+        with _lock:
+            if _tavily_client is None:
+                from deep_research_from_scratch.cassette import (
+                    CassetteSearchClient,
+                    get_cassette,
+                )
+
+                cassette = get_cassette()
+                if cassette is not None and cassette.mode == "replay":
+                    # Replays are served from the cassette without a real client
+                    _tavily_client = CassetteSearchClient(cassette)
+                else:
+                    from tavily import TavilyClient
+
+                    from deep_research_from_scratch.rate_limiter import (
+                        RateLimitedClient,
+                        get_rate_limiter,
+                    )
+
+                    client, limiter = TavilyClient(), get_rate_limiter("tavily")
+                    _tavily_client = client if limiter is None else RateLimitedClient(client, limiter)
+                    if cassette is not None:
+                        _tavily_client = CassetteSearchClient(cassette, _tavily_client)
+    return _tavily_client
+
+def reset_providers(roles: Optional[Sequence[str]] = None) -> None:
+    """Drop cached models (all, or only those of the given roles) so they are re-created.
+
+    Call this after changing `model_specs` at runtime.
+    """
+    global _tavily_client
+    with _lock:
+        if roles is None:
+            _models.clear()
+            _bound_models.clear()
+            _tavily_client = None
+            return
+        for role in roles:
+            _models.pop(_spec_key(model_specs[role]), None)
+            _models.pop(("cached", role, _spec_key(model_specs[role])), None)
+        for key in [k for k in _bound_models if k[0] in roles]:
+            del _bound_models[key]
@@ -0,0 +1,298 @@
+"""Process-Wide Rate Limiting for Model Providers and Search.
+
+Parallel researchers each call Anthropic, OpenAI, and Tavily independently, which
+leads to bursts of 429 responses and slow retry backoff. This module puts one
+limiter per provider/model in front of every chat model and the Tavily client the
+package creates.
+
+Key features:
+- Token buckets for requests per minute and tokens per minute. Token usage is
+  only known after a response, so it is charged afterwards and the bucket may go
+  into debt, which delays the next requests until it refills
+- Priorities: waiting requests are admitted highest priority first, so the
+  supervisor (and scoping) is not starved by many researchers
+- Works for sync calls (in worker threads) and async calls alike
+
+Rate limiting is off by default (the batch runner turns it on). Enable it by
+setting DEEP_RESEARCH_RATE_LIMITS to a JSON object of per-provider limits that
+override the defaults below, e.g. '{"anthropic": {"requests_per_minute": 1000}}',
+or to '{}' to use the defaults as they are.
+"""
+
+import asyncio
+import heapq
+import itertools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from langchain_core.rate_limiters import BaseRateLimiter
+from typing_extensions import Any, Iterator, Optional
+
+# ===== CONFIGURATION =====
+
+# Limits per model string or provider prefix; None means unlimited. Match these
+# to the rate limits of your API tier
+rate_limits: dict[str, dict[str, Optional[float]]] = {
+    "anthropic": {"requests_per_minute": 50, "tokens_per_minute": 400_000},
+    "openai": {"requests_per_minute": 500, "tokens_per_minute": 800_000},
+    "tavily": {"requests_per_minute": 100, "tokens_per_minute": None},
+}
+for _name, _limits in json.loads(os.environ.get("DEEP_RESEARCH_RATE_LIMITS") or "{}").items():
+    rate_limits[_name] = {**rate_limits.get(_name, {}), **_limits}
+
+# Off unless DEEP_RESEARCH_RATE_LIMITS is set (see configure_rate_limiting)
+rate_limiting_enabled = bool(os.environ.get("DEEP_RESEARCH_RATE_LIMITS"))
+
+# Seconds of request allowance that may be used in a burst
+burst_seconds = 10.0
+
+# How often waiting callers re-check the buckets
+poll_interval = 0.05
+
+# Priorities: lower values are admitted first
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 10
+
+_priority: ContextVar[int] = ContextVar("rate_limit_priority", default=PRIORITY_NORMAL)
+
+# Seconds waited for limiters per model/tool run (read by the profiler). Chat
+# models acquire their limiter in a child task of the call, so waits are keyed
+# by the run that was current when the child task started rather than returned
+# through a context variable.
+_current_run: ContextVar[Optional[str]] = ContextVar("rate_limit_run", default=None)
+_run_waits: dict[str, float] = {}
+_run_waits_lock = threading.Lock()
+
+def track_run_wait(run_id: str) -> Token:
+    """Charge limiter waits in the current context, and tasks started from it, to a run.
+
+    Returns:
+        Token that restores the previously tracked run when passed to `untrack_run_wait`
+    """
+    with _run_waits_lock:
+        _run_waits.setdefault(run_id, 0.0)
+    return _current_run.set(run_id)
+
+def untrack_run_wait(run_id: str, token: Optional[Token] = None) -> float:
+    """Stop tracking a run and return the seconds it waited for limiters."""
+    if token is not None:
+        try:
+            _current_run.reset(token)
+        except ValueError:
+            # Finished in a different context than it started; nothing to restore
+            pass
+    with _run_waits_lock:
+        return _run_waits.pop(run_id, 0.0)
+
+@contextmanager
+def request_priority(priority: int) -> Iterator[None]:
+    """Run the model and search calls made inside the block with the given priority."""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+# ===== LIMITER =====
+
+class ProviderRateLimiter(BaseRateLimiter):
+    """Requests-per-minute and tokens-per-minute limiter shared by all users of one provider/model.
+
+    Usable as a LangChain chat model `rate_limiter`; pair it with `usage_callback`
+    so token usage of each response is charged to the bucket.
+    """
+
+    def __init__(self, name: str, requests_per_minute: Optional[float] = None, tokens_per_minute: Optional[float] = None):
+        """Create a limiter with full buckets.
+
+        Args:
+            name: Model string or service the limiter is for, used in statistics
+            requests_per_minute: Request rate; None for no request limit
+            tokens_per_minute: Token rate; None for no token limit
+        """
+        self.name = name
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._request_capacity = max(1.0, (requests_per_minute or 0) * burst_seconds / 60)
+        self._requests = self._request_capacity
+        self._tokens = float(tokens_per_minute or 0)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+        self._waiters: list[tuple[int, int]] = []
+        self._counter = itertools.count()
+        self.usage_callback = _UsageCallback(self)
+        # Statistics
+        self.admitted = 0
+        self.tokens_charged = 0
+        self.wait_time = 0.0
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        if self.requests_per_minute:
+            self._requests = min(self._request_capacity, self._requests + elapsed * self.requests_per_minute / 60)
+        if self.tokens_per_minute:
+            self._tokens = min(self.tokens_per_minute, self._tokens + elapsed * self.tokens_per_minute / 60)
+
+    def _try_admit(self, ticket: tuple[int, int]) -> bool:
+        """Admit a waiting ticket if it is first in line and both buckets allow it."""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._waiters[0] != ticket:
+                return False
+            if self.requests_per_minute and self._requests < 1:
+                return False
+            if self.tokens_per_minute and self._tokens <= 0:
+                return False
+            if self.requests_per_minute:
+                self._requests -= 1
+            heapq.heappop(self._waiters)
+            self.admitted += 1
+            return True
+
+    def _enqueue(self) -> tuple[int, int]:
+        ticket = (_priority.get(), next(self._counter))
+        with self._lock:
+            heapq.heappush(self._waiters, ticket)
+        return ticket
+
+    def _withdraw(self, ticket: tuple[int, int]) -> None:
+        with self._lock:
+            if ticket in self._waiters:
+                self._waiters.remove(ticket)
+                heapq.heapify(self._waiters)
+
+    def acquire(self, *, blocking: bool = True) -> bool:
+        """Wait (in this thread) until a request may be sent."""
+        ticket, start = self._enqueue(), time.monotonic()
+        try:
+            while not self._try_admit(ticket):
+                if not blocking:
+                    self._withdraw(ticket)
+                    return False
+                time.sleep(poll_interval)
+        except BaseException:
+            self._withdraw(ticket)
+            raise
+        self._record_wait(time.monotonic() - start)
+        return True
+
+    async def aacquire(self, *, blocking: bool = True) -> bool:
+        """Wait (without blocking the event loop) until a request may be sent."""
+        ticket, start = self._enqueue(), time.monotonic()
+        try:
+            while not self._try_admit(ticket):
+                if not blocking:
+                    self._withdraw(ticket)
+                    return False
+                await asyncio.sleep(poll_interval)
+        except BaseException:
+            self._withdraw(ticket)
+            raise
+        self._record_wait(time.monotonic() - start)
+        return True
+
+    def _record_wait(self, waited: float) -> None:
+        self.wait_time += waited
+        run_id = _current_run.get()
+        if run_id is not None:
+            with _run_waits_lock:
+                if run_id in _run_waits:
+                    _run_waits[run_id] += waited
+
+    def charge_tokens(self, tokens: int) -> None:
+        """Charge tokens used by a finished request; the bucket may go negative."""
+        if tokens <= 0:
+            return
+        with self._lock:
+            self.tokens_charged += tokens
+            if self.tokens_per_minute:
+                self._refill(time.monotonic())
+                self._tokens -= tokens
+
+    def stats(self) -> dict:
+        """Return admitted requests, charged tokens, and total wait time."""
+        return {
+            "name": self.name,
+            "admitted": self.admitted,
+            "tokens_charged": self.tokens_charged,
+            "wait_time": round(self.wait_time, 3),
+            "waiting": len(self._waiters),
+        }
+
+class _UsageCallback(BaseCallbackHandler):
+    """Charge the token usage of each model response to a limiter."""
+
+    def __init__(self, limiter: ProviderRateLimiter):
+        self.limiter = limiter
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        tokens = 0
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if usage:
+                    tokens += usage.get("total_tokens", 0)
+        if not tokens and response.llm_output:
+            tokens = (response.llm_output.get("token_usage") or {}).get("total_tokens", 0)
+        self.limiter.charge_tokens(tokens)
+
+class RateLimitedClient:
+    """Proxy that sends selected methods of a client through a limiter."""
+
+    def __init__(self, client: Any, limiter: ProviderRateLimiter, methods: tuple[str, ...] = ("search", "extract")):
+        """Wrap a client so each call of one of `methods` first acquires the limiter."""
+        self._client = client
+        self._limiter = limiter
+        self._methods = methods
+
+    def __getattr__(self, name: str) -> Any:
+        """Return the client's attribute, rate limited if it is one of the limited methods."""
+        attr = getattr(self._client, name)
+        if name not in self._methods or not callable(attr):
+            return attr
+
+        def limited(*args, **kwargs):
+            self._limiter.acquire()
+            return attr(*args, **kwargs)
+        return limited
+
+# ===== REGISTRY =====
+
+_registry_lock = threading.Lock()
+_limiters: dict[str, ProviderRateLimiter] = {}
+
+def get_rate_limiter(name: str) -> Optional[ProviderRateLimiter]:
+    """Return the shared limiter of a model string (e.g. "openai:gpt-4.1") or service.
+
+    Limits are looked up by the full name first, then by provider prefix.
+    Returns None if rate limiting is disabled or no limits are configured.
+    """
+    if not rate_limiting_enabled:
+        return None
+    limits = rate_limits.get(name) or rate_limits.get(name.split(":", 1)[0])
+    if not limits:
+        return None
+    with _registry_lock:
+        if name not in _limiters:
+            _limiters[name] = ProviderRateLimiter(name, **limits)
+        return _limiters[name]
+
+def configure_rate_limiting(enabled: bool) -> None:
+    """Turn rate limiting on or off at runtime.
+
+    Applies to models and clients created afterwards; the provider registry
+    memoizes them, so call this before the first model call.
+    """
+    global rate_limiting_enabled
+    rate_limiting_enabled = enabled
+
+def get_rate_limiter_stats() -> list[dict]:
+    """Return the statistics of every limiter created so far."""
+    return [limiter.stats() for limiter in _limiters.values()]
@@ -0,0 +1,149 @@
+"""Map-Reduce Report Generation.
+
+This module writes the final report in three steps instead of one large call:
+1. Plan an outline where each section lists the research notes it needs
+2. Write all sections concurrently, each from only its relevant notes
+3. Stitch the sections together and merge their citations into one numbering
+
+Sections are yielded as soon as they are written, so callers can stream the
+report while the remaining sections are still being generated.
+"""
+
+import asyncio
+from dataclasses import dataclass
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import HumanMessage
+from typing_extensions import AsyncIterator, List
+
+from deep_research_from_scratch.citations import format_sources, merge_citations
+from deep_research_from_scratch.prompts import (
+    report_outline_prompt,
+    report_section_prompt,
+)
+from deep_research_from_scratch.state_scope import ReportOutline, ReportSection
+from deep_research_from_scratch.utils import get_today_str
+
+# ===== CONFIGURATION =====
+
+# Upper bound on the number of sections the planner may create
+max_report_sections = 8
+
+# Maximum number of sections written at the same time
+max_concurrent_sections = 4
+
+# Characters of each note shown to the outline planner
+outline_note_preview_chars = 1500
+
+# Run tags that identify report-writing LLM calls in streamed output
+OUTLINE_TAG = "report_outline"
+SECTION_TAG_PREFIX = "report_section:"
+
+# ===== DATA =====
+
+@dataclass
+class SectionDraft:
+    """A written report section and its position in the outline."""
+    index: int
+    title: str
+    content: str
+
+# ===== PIPELINE STEPS =====
+
+async def plan_report_outline(model: BaseChatModel, research_brief: str, notes: List[str]) -> ReportOutline:
+    """Plan report sections and assign research notes to them.
+
+    Args:
+        model: Chat model used for planning
+        research_brief: Research brief the report answers
+        notes: Research notes; their list index is the note id
+
+    Returns:
+        Report outline with valid note ids only
+    """
+    previews = "\n\n".join(
+        f"<Note id={i}>\n{note[:outline_note_preview_chars]}{'...' if len(note) > outline_note_preview_chars else ''}\n</Note>"
+        for i, note in enumerate(notes)
+    )
+    outline = await model.with_structured_output(ReportOutline).ainvoke([
+        HumanMessage(content=report_outline_prompt.format(
+            research_brief=research_brief,
+            notes=previews,
+            max_sections=max_report_sections,
+            date=get_today_str(),
+        ))
+    ], config={"tags": [OUTLINE_TAG]})
+
+    # Drop hallucinated note ids and cap the section count
+    sections = outline.sections[:max_report_sections]
+    for section in sections:
+        section.note_ids = [i for i in dict.fromkeys(section.note_ids) if 0 <= i < len(notes)]
+    outline.sections = sections
+    return outline
+
+async def write_report_section(
+    model: BaseChatModel,
+    research_brief: str,
+    outline: ReportOutline,
+    section: ReportSection,
+    notes: List[str],
+    index: int = 0,
+) -> str:
+    """Write one report section from the notes assigned to it.
+
+    The LLM call is tagged `report_section:<index>` so streamed tokens can be
+    attributed to their section.
+    """
+    outline_text = "\n".join(f"{i}. {s.title}: {s.description}" for i, s in enumerate(outline.sections, 1))
+    # Sections without assigned notes fall back to all notes rather than inventing content
+    section_notes = [notes[i] for i in section.note_ids] or notes
+    response = await model.ainvoke([
+        HumanMessage(content=report_section_prompt.format(
+            research_brief=research_brief,
+            outline=outline_text,
+            section_title=section.title,
+            section_description=section.description,
+            findings="\n\n".join(section_notes),
+            date=get_today_str(),
+        ))
+    ], config={"tags": [f"{SECTION_TAG_PREFIX}{index}"]})
+    return str(response.content)
+
+async def stream_report_sections(
+    model: BaseChatModel,
+    research_brief: str,
+    outline: ReportOutline,
+    notes: List[str],
+) -> AsyncIterator[SectionDraft]:
+    """Write all outline sections concurrently and yield each one as it completes.
+
+    Sections arrive in completion order; use `SectionDraft.index` to restore
+    the outline order.
+    """
+    semaphore = asyncio.Semaphore(max_concurrent_sections)
+
+    async def write(index: int, section: ReportSection) -> SectionDraft:
+        async with semaphore:
+            content = await write_report_section(model, research_brief, outline, section, notes, index=index)
+        return SectionDraft(index=index, title=section.title, content=content)
+
+    tasks = [asyncio.ensure_future(write(i, section)) for i, section in enumerate(outline.sections)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+
+def stitch_report(title: str, sections: List[SectionDraft]) -> str:
+    """Join sections in outline order under one title and a single sources list.
+
+    Citations of each section are renumbered so every unique URL has one
+    number across the whole report.
+    """
+    ordered = sorted(sections, key=lambda section: section.index)
+    bodies, sources = merge_citations([section.content for section in ordered])
+    parts = [f"# {title}"] + [body.strip() for body in bodies if body.strip()]
+    if sources:
+        parts.append(format_sources(sources))
+    return "\n\n".join(parts)
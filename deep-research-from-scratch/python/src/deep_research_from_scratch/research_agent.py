@@ -5,16 +5,26 @@ This module implements a research agent that can perform iterative web searches
 and synthesis to answer complex research questions.
 """
 
+import asyncio
+import logging
+
 from pydantic import BaseModel, Field
-from typing_extensions import Literal
+from typing_extensions import List, Literal, Optional
 
 from langgraph.graph import StateGraph, START, END
-from langchain_core.messages import SystemMessage, HumanMessage, ToolMessage, filter_messages
-from langchain.chat_models import init_chat_model
-
+from langchain_core.messages import HumanMessage, AIMessage, ToolMessage, BaseMessage, filter_messages
+from langchain_core.messages.utils import count_tokens_approximately
+
+from deep_research_from_scratch.blob_store import store_note
+from deep_research_from_scratch.cascade import ainvoke_cascade, source_coverage
+from deep_research_from_scratch.novelty import novelty_exhausted, novelty_score
+from deep_research_from_scratch.prompt_cache import cached_system_message, with_history_breakpoint
+from deep_research_from_scratch.providers import get_model, get_model_with_tools
 from deep_research_from_scratch.state_research import ResearcherState, ResearcherOutputState
-from deep_research_from_scratch.utils import tavily_search, get_today_str, think_tool
-from deep_research_from_scratch.prompts import research_agent_prompt, compress_research_system_prompt, compress_research_human_message
+from deep_research_from_scratch.utils import tavily_search, get_today_str, think_tool, execute_tool_calls
+from deep_research_from_scratch.prompts import research_agent_prompt, compress_research_system_prompt, compress_research_human_message, fold_research_digest_prompt, fold_compressed_research_prompt
+
+logger = logging.getLogger(__name__)
 
 # ===== CONFIGURATION =====
 
@@ -22,11 +32,40 @@ from deep_research_from_scratch.prompts import research_agent_prompt, compress_r
 tools = [tavily_search, think_tool]
 tools_by_name = {tool.name: tool for tool in tools}
 
-# Initialize models
-model = init_chat_model(model="anthropic:claude-sonnet-4-20250514")
-model_with_tools = model.bind_tools(tools)
-summarization_model = init_chat_model(model="openai:gpt-4.1-mini")
-compress_model = init_chat_model(model="openai:gpt-4.1", max_tokens=32000) # model="anthropic:claude-sonnet-4-20250514", max_tokens=64000
+# Maximum number of tool calls from a single turn that run at the same time
+max_concurrent_tool_calls = 4
+# Per-call timeout in seconds; a slow call returns an error instead of blocking the others
+tool_call_timeout = 120.0
+
+# Models are created lazily on first use by the provider registry:
+# "research" (tool-calling loop), "summarization" (digests), "compress" (compression)
+
+# Context compaction: once researcher_messages exceed this many (approximate)
+# tokens, older tool outputs are folded into a rolling digest
+compaction_token_threshold = 24000
+# Number of most recent tool outputs always kept verbatim
+keep_recent_tool_outputs = 3
+
+# Placeholder left in place of a tool output that was folded into the digest
+FOLDED_TOOL_OUTPUT = "[Output folded into the research digest]"
+
+# Incremental compression: fold each round of tool outputs into a running
+# compressed summary while the next round of tools is executing, so the final
+# compression step only polishes a small document. Off by default: it adds a
+# compression model call per tool round
+incremental_compression = False
+
+# Novelty-based early stopping: each round of search results is scored by how
+# much of it is not already covered by earlier results (1.0 = all new); research
+# stops once `novelty_patience` consecutive rounds score below `novelty_threshold`.
+# Off by default: it can end research earlier than the model would
+novelty_stopping = False
+novelty_threshold = 0.2
+novelty_patience = 2
+
+# Model cascade (see cascade.py): a small model's compression is used when it
+# keeps at least this share of the source URLs it was given
+compression_min_source_coverage = 0.8
 
 # ===== AGENT NODES =====
 
@@ -39,70 +78,237 @@ def llm_call(state: ResearcherState):
 
     Returns updated state with the model's response.
     """
+    # The digest follows the static prompt so the prompt stays a cacheable prefix
+    digest = ""
+    if state.get("research_digest"):
+        digest = f"\n\n<Research Digest>\nFindings from earlier searches, folded out of the conversation:\n{state['research_digest']}\n</Research Digest>"
+    system_message = cached_system_message("research", research_agent_prompt.format(date=get_today_str()), digest)
+
     return {
         "researcher_messages": [
-            model_with_tools.invoke(
-                [SystemMessage(content=research_agent_prompt)] + state["researcher_messages"]
+            get_model_with_tools("research", tools).invoke(
+                [system_message] + with_history_breakpoint("research", state["researcher_messages"])
             )
         ]
     }
 
-def tool_node(state: ResearcherState):
+async def tool_node(state: ResearcherState):
     """Execute all tool calls from the previous LLM response.
 
-    Executes all tool calls from the previous LLM responses.
-    Returns updated state with tool execution results.
+    Independent tool calls run concurrently (bounded by `max_concurrent_tool_calls`).
+    Returns updated state with tool execution results, ordered like the tool calls.
     """
     tool_calls = state["researcher_messages"][-1].tool_calls
 
-    # Execute all tool calls
-    observations = []
-    for tool_call in tool_calls:
-        tool = tools_by_name[tool_call["name"]]
-        observations.append(tool.invoke(tool_call["args"]))
-
-    # Create tool message outputs
-    tool_outputs = [
-        ToolMessage(
-            content=observation,
-            name=tool_call["name"],
-            tool_call_id=tool_call["id"]
-        ) for observation, tool_call in zip(observations, tool_calls)
+    # Inject the research topic so search summaries can focus on it
+    tool_calls = [
+        {**tool_call, "args": {**tool_call["args"], "research_topic": state.get("research_topic", "")}}
+        if tool_call["name"] == tavily_search.name else tool_call
+        for tool_call in tool_calls
+    ]
+
+    execution = execute_tool_calls(
+        tool_calls,
+        tools_by_name,
+        max_concurrency=max_concurrent_tool_calls,
+        timeout=tool_call_timeout,
+    )
+
+    # Fold the previous round's outputs into the running summary while this round runs
+    pending = unsummarized_tool_outputs(state) if incremental_compression else []
+    if pending:
+        tool_outputs, summary_update = await asyncio.gather(execution, fold_into_running_summary(state, pending))
+    else:
+        tool_outputs, summary_update = await execution, {}
+
+    return {"researcher_messages": tool_outputs, **summary_update, **score_novelty(state, tool_outputs)}
+
+def score_novelty(state: ResearcherState, tool_outputs: List[ToolMessage]) -> dict:
+    """Score how much this round's search results add to what was already gathered.
+
+    Rounds without search results (e.g. only think_tool) are not scored.
+    """
+    new = [str(m.content) for m in tool_outputs if m.name != think_tool.name and m.status != "error"]
+    if not new:
+        return {}
+    seen = [str(m.content) for m in unsummarized_tool_outputs(state) + summarized_tool_outputs(state)]
+    seen += [state.get("research_digest") or "", state.get("running_summary") or ""]
+    return {"novelty_scores": list(state.get("novelty_scores") or []) + [novelty_score(new, seen)]}
+
+def unsummarized_tool_outputs(state: ResearcherState) -> List[ToolMessage]:
+    """Return search outputs not yet folded into the running summary.
+
+    think_tool reflections and outputs already compacted into the digest are skipped.
+    """
+    summarized = set(state.get("summarized_tool_call_ids") or [])
+    return [
+        m for m in state.get("researcher_messages", [])
+        if isinstance(m, ToolMessage)
+        and m.name != think_tool.name
+        and m.content != FOLDED_TOOL_OUTPUT
+        and m.tool_call_id not in summarized
+    ]
+
+def summarized_tool_outputs(state: ResearcherState) -> List[ToolMessage]:
+    """Return search outputs already folded into the running summary but still in the conversation."""
+    summarized = set(state.get("summarized_tool_call_ids") or [])
+    return [
+        m for m in state.get("researcher_messages", [])
+        if isinstance(m, ToolMessage) and m.content != FOLDED_TOOL_OUTPUT and m.tool_call_id in summarized
+    ]
+
+def format_tool_outputs(messages: List[ToolMessage]) -> str:
+    """Format tool outputs as plain text for a compression prompt."""
+    return "\n\n".join(f"--- {m.name} ---\n{m.content}" for m in messages)
+
+async def fold_into_running_summary(state: ResearcherState, pending: List[ToolMessage]) -> dict:
+    """Fold tool outputs into the running compressed summary.
+
+    Failures are logged and leave the outputs pending, so compress_research
+    still picks them up.
+    """
+    try:
+        response = await get_model("compress").ainvoke([
+            HumanMessage(content=fold_compressed_research_prompt.format(
+                date=get_today_str(),
+                research_topic=state.get("research_topic", ""),
+                running_summary=state.get("running_summary") or "(empty)",
+                tool_outputs=format_tool_outputs(pending),
+            ))
+        ])
+    except Exception as e:
+        logger.warning("Failed to fold tool outputs into running summary: %s", e)
+        return {}
+
+    return {
+        "running_summary": str(response.content),
+        "summarized_tool_call_ids": list(state.get("summarized_tool_call_ids") or []) + [m.tool_call_id for m in pending],
+    }
+
+async def compact_context(state: ResearcherState) -> dict:
+    """Fold older tool outputs into a rolling digest once the context is too large.
+
+    When researcher_messages exceed `compaction_token_threshold` tokens, every
+    tool output except the latest `keep_recent_tool_outputs` is summarized into
+    `research_digest` and replaced in place by a short placeholder (same message
+    id, so the tool call / tool result pairing stays intact). The folded raw
+    content is moved to the blob store and referenced from raw_notes, so
+    nothing is lost for the final report.
+    """
+    messages = state["researcher_messages"]
+    if count_tokens_approximately(messages) <= compaction_token_threshold:
+        return {}
+
+    tool_messages = [
+        m for m in messages
+        if isinstance(m, ToolMessage) and m.content != FOLDED_TOOL_OUTPUT
+    ]
+    to_fold = tool_messages[:-keep_recent_tool_outputs] if keep_recent_tool_outputs else tool_messages
+    if not to_fold:
+        return {}
+
+    tool_outputs = format_tool_outputs(to_fold)
+    response = await get_model("summarization").ainvoke([
+        HumanMessage(content=fold_research_digest_prompt.format(
+            date=get_today_str(),
+            research_topic=state.get("research_topic", ""),
+            digest=state.get("research_digest") or "(empty)",
+            tool_outputs=tool_outputs,
+        ))
+    ])
+
+    folded = [
+        ToolMessage(content=FOLDED_TOOL_OUTPUT, name=m.name, tool_call_id=m.tool_call_id, id=m.id)
+        for m in to_fold
     ]
 
-    return {"researcher_messages": tool_outputs}
+    return {
+        "researcher_messages": folded,
+        "research_digest": str(response.content),
+        "raw_notes": [store_note(tool_outputs)],
+    }
+
+def check_compression(compressed: str, messages: List[BaseMessage]) -> Optional[str]:
+    """Accept a small model compression only if it has a sources list covering most input URLs."""
+    if "sources" not in compressed.lower():
+        return "no sources"
+    if source_coverage(compressed, "\n".join(str(m.content) for m in messages)) < compression_min_source_coverage:
+        return "dropped sources"
+    return None
 
-def compress_research(state: ResearcherState) -> dict:
+async def compress_research(state: ResearcherState) -> dict:
     """Compress research findings into a concise summary.
 
     Takes all the research messages and tool outputs and creates
     a compressed summary suitable for the supervisor's decision-making.
+
+    With incremental compression, most findings are already in the running
+    summary; only that summary and the last unsummarized tool outputs are
+    sent, and the model merges and polishes them instead of compressing the
+    whole conversation.
     """
 
     system_message = compress_research_system_prompt.format(date=get_today_str())
-    messages = [SystemMessage(content=system_message)] + state.get("researcher_messages", []) + [HumanMessage(content=compress_research_human_message)]
-    response = compress_model.invoke(messages)
-
-    # Extract raw notes from tool and AI messages
+    human_message = HumanMessage(content=compress_research_human_message.format(research_topic=state.get("research_topic", "")))
+    digest_messages = []
+    if state.get("research_digest"):
+        digest_messages = [HumanMessage(content=f"Digest of earlier research findings:\n{state['research_digest']}")]
+
+    if incremental_compression and state.get("running_summary"):
+        findings = f"Compressed findings so far:\n{state['running_summary']}"
+        pending = unsummarized_tool_outputs(state)
+        if pending:
+            findings += f"\n\nNew tool outputs not yet included above:\n{format_tool_outputs(pending)}"
+        messages = digest_messages + [HumanMessage(content=findings), human_message]
+    else:
+        conversation = without_unanswered_tool_calls(state.get("researcher_messages", []))
+        messages = digest_messages + conversation + [human_message]
+    # A small model compresses first; escalate if it dropped sources
+    response = await ainvoke_cascade(
+        "compress_research",
+        lambda role: get_model(role).ainvoke([cached_system_message(role, system_message)] + messages),
+        lambda r: check_compression(str(r.content), messages),
+    )
+
+    # Extract raw notes from tool and AI messages (folded outputs are already in raw_notes)
     raw_notes = [
         str(m.content) for m in filter_messages(
             state["researcher_messages"], 
             include_types=["tool", "ai"]
         )
+        if m.content != FOLDED_TOOL_OUTPUT
     ]
 
     return {
         "compressed_research": str(response.content),
-        "raw_notes": ["\n".join(raw_notes)]
+        "raw_notes": [store_note("\n".join(raw_notes))]
     }
 
+def without_unanswered_tool_calls(messages: List[BaseMessage]) -> List[BaseMessage]:
+    """Drop tool calls that have no tool result, e.g. when research stopped early.
+
+    Providers reject conversations with unanswered tool calls; the AI message's
+    text (if any) is kept.
+    """
+    answered = {m.tool_call_id for m in messages if isinstance(m, ToolMessage)}
+    cleaned = []
+    for m in messages:
+        if isinstance(m, AIMessage) and any(call["id"] not in answered for call in m.tool_calls):
+            if m.content:
+                cleaned.append(AIMessage(content=m.content, id=m.id))
+            continue
+        cleaned.append(m)
+    return cleaned
+
 # ===== ROUTING LOGIC =====
 
 def should_continue(state: ResearcherState) -> Literal["tool_node", "compress_research"]:
     """Determine whether to continue research or provide final answer.
 
     Determines whether the agent should continue the research loop or provide
-    a final answer based on whether the LLM made tool calls.
+    a final answer based on whether the LLM made tool calls. With novelty
+    stopping, research also ends when recent search rounds kept returning
+    information that was already gathered.
 
     Returns:
         "tool_node": Continue to tool execution
@@ -111,6 +317,12 @@ def should_continue(state: ResearcherState) -> Literal["tool_node", "compress_re
     messages = state["researcher_messages"]
     last_message = messages[-1]
 
+    # Stop when searches have stopped finding anything new, even if the LLM wants more
+    if last_message.tool_calls and novelty_stopping and novelty_exhausted(
+        state.get("novelty_scores") or [], novelty_threshold, novelty_patience
+    ):
+        return "compress_research"
+
     # If the LLM makes a tool call, continue to tool execution
     if last_message.tool_calls:
         return "tool_node"
@@ -125,6 +337,7 @@ agent_builder = StateGraph(ResearcherState, output_schema=ResearcherOutputState)
 # Add nodes to the graph
 agent_builder.add_node("llm_call", llm_call)
 agent_builder.add_node("tool_node", tool_node)
+agent_builder.add_node("compact_context", compact_context)
 agent_builder.add_node("compress_research", compress_research)
 
 # Add edges to connect nodes
@@ -137,8 +350,13 @@ agent_builder.add_conditional_edges(
         "compress_research": "compress_research", # Provide final answer
     },
 )
-agent_builder.add_edge("tool_node", "llm_call") # Loop back for more research
+agent_builder.add_edge("tool_node", "compact_context") # Fold old tool outputs if context is too large
+agent_builder.add_edge("compact_context", "llm_call") # Loop back for more research
 agent_builder.add_edge("compress_research", END)
 
 # Compile the agent
 researcher_agent = agent_builder.compile()
+
+# Compiled without checkpointing, for running several researchers concurrently
+# inside a supervisor node; the supervisor persists finished units itself
+researcher_agent_unit = agent_builder.compile(checkpointer=False)
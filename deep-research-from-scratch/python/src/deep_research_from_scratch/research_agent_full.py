@@ -12,46 +12,102 @@ The system orchestrates the complete research workflow from initial user
 input through final report delivery.
 """
 
+import logging
+from dataclasses import asdict
+
 from langchain_core.messages import HumanMessage
+from langgraph.config import get_stream_writer
 from langgraph.graph import StateGraph, START, END
 
+from deep_research_from_scratch.blob_store import load_notes
+from deep_research_from_scratch.note_dedup import dedup_notes
+from deep_research_from_scratch.providers import get_model
 from deep_research_from_scratch.utils import get_today_str
 from deep_research_from_scratch.prompts import final_report_generation_prompt
 from deep_research_from_scratch.state_scope import AgentState, AgentInputState
 from deep_research_from_scratch.research_agent_scope import clarify_with_user, write_research_brief
 from deep_research_from_scratch.multi_agent_supervisor import supervisor_agent
+from deep_research_from_scratch.report_writer import plan_report_outline, stream_report_sections, stitch_report
+
+logger = logging.getLogger(__name__)
 
 # ===== Config =====
 
-from langchain.chat_models import init_chat_model
-writer_model = init_chat_model(model="openai:gpt-4.1", max_tokens=32000) # model="anthropic:claude-sonnet-4-20250514", max_tokens=64000
+# The "writer" model is created lazily by the provider registry
+
+# Merge citations and drop near-duplicate paragraphs across notes before writing
+dedup_notes_before_report = True
+
+# Run tag of the single-pass writer call, used to attribute streamed report tokens
+SINGLE_PASS_TAG = "report_single_pass"
 
 # ===== FINAL REPORT GENERATION =====
 
 from deep_research_from_scratch.state_scope import AgentState
 
+async def write_report_single_pass(research_brief: str, notes: list[str]) -> str:
+    """Write the whole report with a single writer call over all findings."""
+    final_report_prompt = final_report_generation_prompt.format(
+        research_brief=research_brief,
+        findings="\n".join(notes),
+        date=get_today_str()
+    )
+
+    final_report = await get_model("writer").ainvoke([HumanMessage(content=final_report_prompt)], config={"tags": [SINGLE_PASS_TAG]})
+    return str(final_report.content)
+
 async def final_report_generation(state: AgentState):
     """
     Final report generation node.
 
-    Synthesizes all research findings into a comprehensive final report
+    Synthesizes all research findings into a comprehensive final report:
+    deduplicates the notes, plans an outline, writes the sections concurrently
+    from their relevant notes, then stitches them with a single merged sources list. Each section
+    is emitted on the custom stream as soon as it is written. Falls back to a
+    single writer call if the outline cannot be planned.
     """
 
     notes = state.get("notes", [])
-
-    findings = "\n".join(notes)
-
-    final_report_prompt = final_report_generation_prompt.format(
-        research_brief=state.get("research_brief", ""),
-        findings=findings,
-        date=get_today_str()
-    )
-
-    final_report = await writer_model.ainvoke([HumanMessage(content=final_report_prompt)])
+    # Without compressed notes (e.g. research ended early), fall back to the raw notes
+    if not notes:
+        notes = load_notes(state.get("raw_notes", []))
+    research_brief = state.get("research_brief", "")
+    write_stream = get_stream_writer()
+
+    if dedup_notes_before_report and notes:
+        notes, dedup_stats = dedup_notes(notes)
+        write_stream({"type": "notes_deduplicated", **asdict(dedup_stats)})
+
+    try:
+        outline = await plan_report_outline(get_model("writer"), research_brief, notes)
+    except Exception as e:
+        logger.warning("Failed to plan report outline, writing in a single pass: %s", e)
+        outline = None
+
+    if outline is None or not outline.sections:
+        final_report = await write_report_single_pass(research_brief, notes)
+    else:
+        write_stream({
+            "type": "report_outline",
+            "title": outline.title,
+            "sections": [section.title for section in outline.sections],
+        })
+
+        sections = []
+        async for section in stream_report_sections(get_model("writer"), research_brief, outline, notes):
+            sections.append(section)
+            write_stream({
+                "type": "report_section",
+                "index": section.index,
+                "title": section.title,
+                "content": section.content,
+            })
+
+        final_report = stitch_report(outline.title, sections)
 
     return {
-        "final_report": final_report.content, 
-        "messages": ["Here is the final report: " + final_report.content],
+        "final_report": final_report, 
+        "messages": ["Here is the final report: " + final_report],
     }
 
 # ===== GRAPH CONSTRUCTION =====
@@ -72,3 +128,25 @@ deep_researcher_builder.add_edge("final_report_generation", END)
 
 # Compile the full workflow
 agent = deep_researcher_builder.compile()
+
+def compile_agent(checkpointer=None):
+    """Compile the full workflow with a checkpointer, e.g. from checkpointing.open_checkpointer.
+
+    The supervisor subgraph inherits the checkpointer, so runs can be resumed
+    by thread ID with checkpointing.resume_research.
+    """
+    return deep_researcher_builder.compile(checkpointer=checkpointer)
+
+# Research-only workflow for briefs that are already written (e.g. batch runs):
+# no clarification or brief writing, the input carries research_brief and
+# supervisor_messages
+brief_researcher_builder = StateGraph(AgentState)
+brief_researcher_builder.add_node("supervisor_subgraph", supervisor_agent)
+brief_researcher_builder.add_node("final_report_generation", final_report_generation)
+brief_researcher_builder.add_edge(START, "supervisor_subgraph")
+brief_researcher_builder.add_edge("supervisor_subgraph", "final_report_generation")
+brief_researcher_builder.add_edge("final_report_generation", END)
+
+def compile_brief_agent(checkpointer=None):
+    """Compile the research-only workflow that starts from a written research brief."""
+    return brief_researcher_builder.compile(checkpointer=checkpointer)
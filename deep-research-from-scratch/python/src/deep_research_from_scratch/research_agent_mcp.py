@@ -9,23 +9,33 @@ Key features:
 - MCP server integration for tool access
 - Async operations for concurrent tool execution (required by MCP protocol)
 - Filesystem operations for local document research
+- Local BM25 passage search so only relevant slices of documents are read
 - Secure directory access with permission checking
 - Research compression for efficient processing
 - Lazy MCP client initialization for LangGraph Platform compatibility
+- Persistent MCP session with cached tool discovery and model binding
 """
 
-import os
+import asyncio
+import time
+from contextlib import asynccontextmanager
 
-from typing_extensions import Literal
+import mcp.types as mcp_types
+from typing_extensions import AsyncIterator, Literal, Optional
 
-from langchain.chat_models import init_chat_model
-from langchain_core.messages import SystemMessage, HumanMessage, ToolMessage, filter_messages
+from langchain_core.messages import HumanMessage, filter_messages
 from langchain_mcp_adapters.client import MultiServerMCPClient
+from langchain_mcp_adapters.sessions import create_session
+from langchain_mcp_adapters.tools import load_mcp_tools
 from langgraph.graph import StateGraph, START, END
 
+from deep_research_from_scratch.blob_store import store_note
+from deep_research_from_scratch.document_index import search_documents, read_document_slice
+from deep_research_from_scratch.prompt_cache import cached_system_message, with_history_breakpoint
+from deep_research_from_scratch.providers import get_model
 from deep_research_from_scratch.prompts import research_agent_prompt_with_mcp, compress_research_system_prompt, compress_research_human_message
 from deep_research_from_scratch.state_research import ResearcherState, ResearcherOutputState
-from deep_research_from_scratch.utils import get_today_str, think_tool, get_current_dir
+from deep_research_from_scratch.utils import get_today_str, think_tool, get_current_dir, execute_tool_calls
 
 # ===== CONFIGURATION =====
 
@@ -42,6 +52,18 @@ mcp_config = {
     }
 }
 
+# Maximum number of tool calls from a single turn that run at the same time
+max_concurrent_tool_calls = 4
+# Per-call timeout in seconds for MCP and local tools
+tool_call_timeout = 60.0
+
+# Seconds before cached MCP tool schemas are re-discovered even without a
+# list-changed notification. None keeps them for the whole session.
+mcp_tools_ttl = 600.0
+
+# Local tools that are always offered alongside the MCP tools
+local_tools = [search_documents, read_document_slice, think_tool]
+
 # Global client variable - will be initialized lazily
 _client = None
 
@@ -52,9 +74,155 @@ def get_mcp_client():
         _client = MultiServerMCPClient(mcp_config)
     return _client
 
-# Initialize models
-compress_model = init_chat_model(model="openai:gpt-4.1", max_tokens=32000)
-model = init_chat_model(model="anthropic:claude-sonnet-4-20250514")
+# Models ("research", "compress") are created lazily by the provider registry
+
+# ===== MCP TOOL CACHE =====
+
+class MCPToolCache:
+    """Persistent MCP session with cached tool schemas and a memoized bound model.
+
+    The session (and therefore the `npx` server process) is opened on first use
+    and reused by every tool call. Tool schemas are discovered once and only
+    re-listed after the server sends a `notifications/tools/list_changed`
+    notification, after `ttl` seconds, or after `invalidate()` is called.
+    The model bound to the tools is rebuilt only when the tools are.
+
+    The session is owned by a background task rather than by the graph node
+    that first needs it: the stdio transport holds anyio task groups and cancel
+    scopes, which must be exited by the task that entered them. `aclose()`
+    (or the end of the event loop, which cancels the task) closes the session
+    and stops the server process.
+    """
+
+    def __init__(self, server_name: str, ttl: Optional[float] = None):
+        """Create the cache; nothing is started until the tools are first requested.
+
+        Args:
+            server_name: Server name in `mcp_config`
+            ttl: Seconds before tool schemas are re-listed; None keeps them until the server reports a change
+        """
+        self.server_name = server_name
+        self.ttl = ttl
+        self._session = None
+        self._session_task: Optional[asyncio.Task] = None
+        self._closing: Optional[asyncio.Event] = None
+        self._tools: Optional[list] = None
+        self._tools_by_name: dict = {}
+        self._model_with_tools = None
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def invalidate(self) -> None:
+        """Mark cached tool schemas as stale so the next access re-lists them."""
+        self._tools = None
+        self._model_with_tools = None
+
+    async def _on_message(self, message) -> None:
+        """Drop cached tools when the server announces its tool list changed."""
+        if isinstance(message, mcp_types.ServerNotification) and isinstance(
+            message.root, mcp_types.ToolListChangedNotification
+        ):
+            self.invalidate()
+
+    def _expired(self) -> bool:
+        return self.ttl is not None and time.monotonic() - self._loaded_at > self.ttl
+
+    async def _hold_session(self, ready: asyncio.Future) -> None:
+        """Open the session, hand it over through `ready`, and keep it open until closing is requested."""
+        # Route server notifications to this cache via ClientSession kwargs, on a
+        # copy of the connection so the shared client config is left unchanged
+        connection = {
+            **get_mcp_client().connections[self.server_name],
+            "session_kwargs": {"message_handler": self._on_message},
+        }
+        try:
+            async with create_session(connection) as session:
+                await session.initialize()
+                ready.set_result(session)
+                await self._closing.wait()
+        except Exception as e:
+            if ready.done():
+                raise
+            ready.set_exception(e)
+        finally:
+            if not ready.done():
+                ready.cancel()
+            # The server went away on its own: open a new session on next use
+            if self._session_task is asyncio.current_task():
+                self._session_task = None
+                self._session = None
+                self.invalidate()
+
+    async def _ensure_session(self):
+        if self._session is None:
+            ready = asyncio.get_running_loop().create_future()
+            self._closing = asyncio.Event()
+            self._session_task = asyncio.create_task(self._hold_session(ready), name=f"mcp-session-{self.server_name}")
+            self._session = await ready
+        return self._session
+
+    async def get_tools(self) -> list:
+        """Return MCP tools bound to the persistent session plus the local tools."""
+        if self._tools is not None and not self._expired():
+            return self._tools
+        async with self._lock:
+            if self._tools is None or self._expired():
+                session = await self._ensure_session()
+                mcp_tools = await load_mcp_tools(session)
+                self._tools = mcp_tools + local_tools
+                self._tools_by_name = {tool.name: tool for tool in self._tools}
+                self._model_with_tools = None
+                self._loaded_at = time.monotonic()
+        return self._tools
+
+    async def get_tools_by_name(self) -> dict:
+        """Return the cached tools keyed by name."""
+        await self.get_tools()
+        return self._tools_by_name
+
+    async def get_model_with_tools(self):
+        """Return the research model bound to the current tools, memoized."""
+        tools = await self.get_tools()
+        if self._model_with_tools is None:
+            self._model_with_tools = get_model("research").bind_tools(tools)
+        return self._model_with_tools
+
+    async def aclose(self) -> None:
+        """Close the persistent session and stop the MCP server process.
+
+        May be called from any task on the event loop the session was opened on.
+        """
+        async with self._lock:
+            task, self._session_task = self._session_task, None
+            if task is not None:
+                self._closing.set()
+                await asyncio.gather(task, return_exceptions=True)
+            self._session = None
+            self.invalidate()
+
+# Global tool cache - the session is opened lazily on first use
+_tool_cache = None
+
+def get_tool_cache() -> MCPToolCache:
+    """Get or initialize the MCP tool cache for the filesystem server."""
+    global _tool_cache
+    if _tool_cache is None:
+        _tool_cache = MCPToolCache("filesystem", ttl=mcp_tools_ttl)
+    return _tool_cache
+
+@asynccontextmanager
+async def mcp_session() -> AsyncIterator[MCPToolCache]:
+    """Scope the persistent MCP session to a block, stopping the server process on exit.
+
+    Example:
+        async with mcp_session():
+            result = await agent_mcp.ainvoke({"researcher_messages": [...]})
+    """
+    cache = get_tool_cache()
+    try:
+        yield cache
+    finally:
+        await cache.aclose()
 
 # ===== AGENT NODES =====
 
@@ -62,27 +230,22 @@ async def llm_call(state: ResearcherState):
     """Analyze current state and decide on tool usage with MCP integration.
 
     This node:
-    1. Retrieves available tools from MCP server
-    2. Binds tools to the language model
-    3. Processes user input and decides on tool usage
+    1. Retrieves the model bound to the cached MCP tools
+    2. Processes user input and decides on tool usage
+
+    Tools are discovered once per session and the bound model is memoized,
+    so this does not round-trip to the MCP server on every step.
 
     Returns updated state with model response.
     """
-    # Get available tools from MCP server
-    client = get_mcp_client()
-    mcp_tools = await client.get_tools()
-
-    # Use MCP tools for local document access
-    tools = mcp_tools + [think_tool]
-
-    # Initialize model with tool binding
-    model_with_tools = model.bind_tools(tools)
+    model_with_tools = await get_tool_cache().get_model_with_tools()
 
     # Process user input with system prompt
     return {
         "researcher_messages": [
-            model_with_tools.invoke(
-                [SystemMessage(content=research_agent_prompt_with_mcp.format(date=get_today_str()))] + state["researcher_messages"]
+            await model_with_tools.ainvoke(
+                [cached_system_message("research", research_agent_prompt_with_mcp.format(date=get_today_str()))]
+                + with_history_breakpoint("research", state["researcher_messages"])
             )
         ]
     }
@@ -92,7 +255,7 @@ async def tool_node(state: ResearcherState):
 
     This node:
     1. Retrieves current tool calls from the last message
-    2. Executes all tool calls using async operations (required for MCP)
+    2. Executes all tool calls concurrently using async operations (required for MCP)
     3. Returns formatted tool results
 
     Note: MCP requires async operations due to inter-process communication
@@ -101,36 +264,17 @@ async def tool_node(state: ResearcherState):
     tool_calls = state["researcher_messages"][-1].tool_calls
 
     async def execute_tools():
-        """Execute all tool calls. MCP tools require async execution."""
-        # Get fresh tool references from MCP server
-        client = get_mcp_client()
-        mcp_tools = await client.get_tools()
-        tools = mcp_tools + [think_tool]
-        tools_by_name = {tool.name: tool for tool in tools}
-
-        # Execute tool calls (sequentially for reliability)
-        observations = []
-        for tool_call in tool_calls:
-            tool = tools_by_name[tool_call["name"]]
-            if tool_call["name"] == "think_tool":
-                # think_tool is sync, use regular invoke
-                observation = tool.invoke(tool_call["args"])
-            else:
-                # MCP tools are async, use ainvoke
-                observation = await tool.ainvoke(tool_call["args"])
-            observations.append(observation)
-
-        # Format results as tool messages
-        tool_outputs = [
-            ToolMessage(
-                content=observation,
-                name=tool_call["name"],
-                tool_call_id=tool_call["id"],
-            )
-            for observation, tool_call in zip(observations, tool_calls)
-        ]
-
-        return tool_outputs
+        """Execute all tool calls concurrently. MCP tools require async execution."""
+        # Cached tool references bound to the persistent MCP session
+        tools_by_name = await get_tool_cache().get_tools_by_name()
+
+        # Execute tool calls concurrently; results keep the order of tool_calls
+        return await execute_tool_calls(
+            tool_calls,
+            tools_by_name,
+            max_concurrency=max_concurrent_tool_calls,
+            timeout=tool_call_timeout,
+        )
 
     messages = await execute_tools()
 
@@ -147,9 +291,9 @@ def compress_research(state: ResearcherState) -> dict:
     """
 
     system_message = compress_research_system_prompt.format(date=get_today_str())
-    messages = [SystemMessage(content=system_message)] + state.get("researcher_messages", []) + [HumanMessage(content=compress_research_human_message)]
+    messages = [cached_system_message("compress", system_message)] + state.get("researcher_messages", []) + [HumanMessage(content=compress_research_human_message)]
 
-    response = compress_model.invoke(messages)
+    response = get_model("compress").invoke(messages)
 
     # Extract raw notes from tool and AI messages
     raw_notes = [
@@ -161,7 +305,7 @@ def compress_research(state: ResearcherState) -> dict:
 
     return {
         "compressed_research": str(response.content),
-        "raw_notes": ["\n".join(raw_notes)]
+        "raw_notes": [store_note("\n".join(raw_notes))]
     }
 
 # ===== ROUTING LOGIC =====
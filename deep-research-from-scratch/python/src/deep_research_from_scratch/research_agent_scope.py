@@ -9,17 +9,26 @@ The workflow uses structured output to make deterministic decisions about
 whether sufficient context exists to proceed with research.
 """
 
+import contextvars
+import logging
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
 from datetime import datetime
-from typing_extensions import Literal
+from typing_extensions import Literal, Optional
 
-from langchain.chat_models import init_chat_model
 from langchain_core.messages import HumanMessage, AIMessage, get_buffer_string
+from langgraph.config import get_stream_writer
 from langgraph.graph import StateGraph, START, END
 from langgraph.types import Command
 
+from deep_research_from_scratch.cascade import boolean_confidence, invoke_cascade
+from deep_research_from_scratch.providers import get_model
 from deep_research_from_scratch.prompts import clarify_with_user_instructions, transform_messages_into_research_topic_prompt
 from deep_research_from_scratch.state_scope import AgentState, ClarifyWithUser, ResearchQuestion, AgentInputState
 
+logger = logging.getLogger(__name__)
+
 # ===== UTILITY FUNCTIONS =====
 
 def get_today_str() -> str:
@@ -28,39 +37,149 @@ def get_today_str() -> str:
 
 # ===== CONFIGURATION =====
 
-# Initialize model
-model = init_chat_model(model="openai:gpt-4.1", temperature=0.0)
+# The "scope" model (temperature 0) is created lazily by the provider registry
+
+# Speculative scoping: start writing the research brief at the same time as the
+# clarification check. Most requests need no clarification, so the brief is
+# usually ready when the check finishes; it is discarded if the user is asked
+# a question instead
+speculative_brief = True
+
+_speculation_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="speculative-brief")
+
+@dataclass
+class SpeculationStats:
+    """Hit rate and latency effect of speculative brief generation."""
+    hits: int = 0
+    misses: int = 0
+    failures: int = 0
+    # Sequential latency avoided on hits (the shorter of the two calls)
+    saved_seconds: float = 0.0
+    # Time spent writing briefs that were discarded
+    wasted_seconds: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of speculative briefs that were used."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def to_dict(self) -> dict:
+        """Return the stats, including the hit rate, as a plain dict."""
+        return {**asdict(self), "hit_rate": self.hit_rate}
+
+    def describe(self) -> str:
+        """Summarize the stats in one line."""
+        return (f"Speculative brief: {self.hits} hits, {self.misses} misses (hit rate {self.hit_rate:.0%}), "
+                f"{self.saved_seconds:.1f}s saved, {self.wasted_seconds:.1f}s discarded")
+
+speculation_stats = SpeculationStats()
+
+# Model cascade (see cascade.py): the small model's clarification decision is
+# used when its probability for need_clarification is at least this high
+clarify_min_confidence = 0.9
 
 # ===== WORKFLOW NODES =====
 
+def generate_research_brief(messages: list) -> str:
+    """Write the research brief for a conversation."""
+    structured_output_model = get_model("scope").with_structured_output(ResearchQuestion)
+    response = structured_output_model.invoke([
+        HumanMessage(content=transform_messages_into_research_topic_prompt.format(
+            messages=get_buffer_string(messages),
+            date=get_today_str()
+        ))
+    ])
+    return response.research_brief
+
+def check_clarification(result: dict) -> Optional[str]:
+    """Accept a small model clarification decision only if it parsed and was confident."""
+    if result.get("parsing_error") is not None or result.get("parsed") is None:
+        return "invalid output"
+    confidence = boolean_confidence(result["raw"], "need_clarification")
+    if confidence is None:
+        return "no logprobs"
+    if confidence < clarify_min_confidence:
+        return "low confidence"
+    return None
+
+def _timed(fn, *args) -> tuple:
+    start = time.perf_counter()
+    return fn(*args), time.perf_counter() - start
+
+def _start_speculative_brief(messages: list) -> Future:
+    """Start writing the brief in a worker thread (with the caller's context, for callbacks)."""
+    return _speculation_pool.submit(contextvars.copy_context().run, _timed, generate_research_brief, list(messages))
+
+def _record_wasted(done: Future) -> None:
+    if done.exception() is None:
+        speculation_stats.wasted_seconds += done.result()[1]
+
 def clarify_with_user(state: AgentState) -> Command[Literal["write_research_brief", "__end__"]]:
     """
     Determine if the user's request contains sufficient information to proceed with research.
 
     Uses structured output to make deterministic decisions and avoid hallucination.
     Routes to either research brief generation or ends with a clarification question.
+
+    The decision goes through the model cascade: a small model decides first
+    and the scope model is only asked when the small model is not confident.
+    With speculative scoping, the research brief is written concurrently and
+    handed to write_research_brief when no clarification is needed.
     """
-    # Set up structured output model
-    structured_output_model = model.with_structured_output(ClarifyWithUser)
+    speculation = _start_speculative_brief(state["messages"]) if speculative_brief else None
 
-    # Invoke the model with clarification instructions
-    response = structured_output_model.invoke([
+    prompt = [
         HumanMessage(content=clarify_with_user_instructions.format(
             messages=get_buffer_string(messages=state["messages"]), 
             date=get_today_str()
         ))
-    ])
+    ]
+
+    def decide(role: str) -> dict:
+        # Raw output is kept so the small model's confidence can be checked
+        return get_model(role).with_structured_output(ClarifyWithUser, include_raw=True).invoke(prompt)
+
+    # Invoke the small model first, escalating to the scope model when unsure
+    clarify_start = time.perf_counter()
+    result = invoke_cascade("clarify_with_user", decide, check_clarification)
+    clarify_time = time.perf_counter() - clarify_start
+    response = result["parsed"]
+    if response is None:
+        raise ValueError(f"Could not parse the clarification decision: {result.get('parsing_error')}")
+
+    # Report the decision to streaming callers (no-op when not streaming)
+    get_stream_writer()({
+        "type": "scope_decision",
+        "need_clarification": response.need_clarification,
+        "message": response.question if response.need_clarification else response.verification,
+    })
 
     # Route based on clarification need
     if response.need_clarification:
+        if speculation is not None:
+            # Discard the speculative brief without waiting for it
+            speculation_stats.misses += 1
+            speculation.add_done_callback(_record_wasted)
         return Command(
             goto=END, 
             update={"messages": [AIMessage(content=response.question)]}
         )
     else:
+        update = {"messages": [AIMessage(content=response.verification)]}
+        if speculation is not None:
+            try:
+                brief, brief_time = speculation.result()
+                speculation_stats.hits += 1
+                speculation_stats.saved_seconds += min(clarify_time, brief_time)
+                update["speculative_brief"] = brief
+            except Exception as e:
+                # write_research_brief writes the brief itself
+                speculation_stats.failures += 1
+                logger.warning("Speculative research brief failed: %s", e)
         return Command(
             goto="write_research_brief", 
-            update={"messages": [AIMessage(content=response.verification)]}
+            update=update
         )
 
 def write_research_brief(state: AgentState):
@@ -68,23 +187,18 @@ def write_research_brief(state: AgentState):
     Transform the conversation history into a comprehensive research brief.
 
     Uses structured output to ensure the brief follows the required format
-    and contains all necessary details for effective research.
+    and contains all necessary details for effective research. A brief
+    already written speculatively during clarification is used as is.
     """
-    # Set up structured output model
-    structured_output_model = model.with_structured_output(ResearchQuestion)
+    research_brief = state.get("speculative_brief") or generate_research_brief(state.get("messages", []))
 
-    # Generate research brief from conversation history
-    response = structured_output_model.invoke([
-        HumanMessage(content=transform_messages_into_research_topic_prompt.format(
-            messages=get_buffer_string(state.get("messages", [])),
-            date=get_today_str()
-        ))
-    ])
+    get_stream_writer()({"type": "brief_ready", "research_brief": research_brief})
 
     # Update state with generated research brief and pass it to the supervisor
     return {
-        "research_brief": response.research_brief,
-        "supervisor_messages": [HumanMessage(content=f"{response.research_brief}.")]
+        "research_brief": research_brief,
+        "speculative_brief": "",
+        "supervisor_messages": [HumanMessage(content=f"{research_brief}.")]
     }
 
 # ===== GRAPH CONSTRUCTION =====
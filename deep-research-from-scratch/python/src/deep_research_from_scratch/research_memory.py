@@ -0,0 +1,273 @@
+"""Cross-Run Research Memory.
+
+Every run used to start cold on the web even when the same subjects were
+researched the week before. This module keeps a persistent local store of past
+compressed research (per research topic) and of the source summaries found
+along the way, so the supervisor can serve subtopics that are already covered
+from memory and only send the gaps to live researchers.
+
+Key features:
+- SQLite store next to the other local state (.deep_research/)
+- Hybrid retrieval: BM25 over the text plus cosine similarity of hashed
+  bag-of-words vectors (local, no embedding API calls)
+- A topic counts as covered when a past research topic is nearly the same;
+  served notes carry the date they were gathered
+- Researchers sent to the gaps get the stored source summaries relevant to
+  their topic, so they do not search for those sources again
+- Time-based invalidation: entries older than `memory_max_age_days` are ignored
+  and pruned when the memory is opened
+
+The memory is off by default. Enable it by setting DEEP_RESEARCH_MEMORY to a
+database path (or with the CLI's --memory flag).
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from datetime import datetime
+
+import numpy as np
+from typing_extensions import List, Optional
+
+from deep_research_from_scratch.passage_filter import bm25_scores, tokenize
+
+# ===== CONFIGURATION =====
+
+# Database path; None disables the memory
+memory_path: Optional[str] = os.environ.get("DEEP_RESEARCH_MEMORY") or None
+
+# Entries older than this are ignored (None keeps them forever)
+memory_max_age_days: Optional[float] = 30.0
+
+# Cosine similarity between a new topic and a past one for the past research to be
+# reused; high, so only rephrasings of the same topic are served from memory
+memory_topic_threshold = 0.8
+
+# Stored source summaries given to a researcher on a topic not served from memory,
+# and the cosine similarity to the topic a summary needs to be included
+memory_sources_per_topic = 3
+memory_source_min_similarity = 0.3
+
+# Weight of the vector score in hybrid ranking (the rest is normalized BM25)
+memory_vector_weight = 0.5
+
+# Dimensions of the hashed bag-of-words vectors
+vector_dims = 1024
+
+# Separators of search results in raw notes, used to extract source summaries
+_source_block_re = re.compile(r"--- SOURCE \d+: (?P<title>.*?) ---\s*URL: (?P<url>\S+)\s*SUMMARY:\s*(?P<summary>.*?)(?=\n-{20,}|\n--- SOURCE|\Z)", re.S)
+
+# ===== VECTORS =====
+
+def embed(text: str) -> np.ndarray:
+    """Return a normalized hashed bag-of-words vector (unigrams and bigrams, sublinear tf)."""
+    terms = tokenize(text)
+    features = terms + [f"{a} {b}" for a, b in zip(terms, terms[1:])]
+    vector = np.zeros(vector_dims, dtype=np.float32)
+    if not features:
+        return vector
+    indices = np.fromiter((zlib.crc32(f.encode("utf-8")) % vector_dims for f in features), dtype=np.int64, count=len(features))
+    np.add.at(vector, indices, 1.0)
+    vector = np.log1p(vector)
+    return vector / (np.linalg.norm(vector) or 1.0)
+
+# ===== STORE =====
+
+@dataclass
+class MemoryEntry:
+    """A past research result or source summary."""
+    id: int
+    kind: str  # research | source
+    topic: str
+    content: str
+    url: str
+    created_at: float
+    score: float = 0.0
+
+    @property
+    def gathered_on(self) -> str:
+        """Date the entry was stored, as YYYY-MM-DD."""
+        return datetime.fromtimestamp(self.created_at).strftime("%Y-%m-%d")
+
+class ResearchMemory:
+    """Persistent store of past research with hybrid BM25 + vector retrieval.
+
+    Entries are loaded into memory once; vectors are stored with them so
+    nothing is recomputed across runs.
+    """
+
+    def __init__(self, path: str):
+        """Open (or create) the database at `path` and load its entries."""
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS memory ("
+            "id INTEGER PRIMARY KEY, kind TEXT NOT NULL, topic TEXT NOT NULL, content TEXT NOT NULL, "
+            "url TEXT NOT NULL DEFAULT '', created_at REAL NOT NULL, "
+            "topic_vector BLOB NOT NULL, content_vector BLOB NOT NULL)"
+        )
+        self._conn.commit()
+        self._entries: List[MemoryEntry] = []
+        self._topic_vectors: List[np.ndarray] = []
+        self._content_vectors: List[np.ndarray] = []
+        self._tokens: List[List[str]] = []
+        for row in self._conn.execute(
+            "SELECT id, kind, topic, content, url, created_at, topic_vector, content_vector FROM memory ORDER BY id"
+        ):
+            self._append(MemoryEntry(*row[:6]), np.frombuffer(row[6], dtype=np.float32), np.frombuffer(row[7], dtype=np.float32))
+
+    def _append(self, entry: MemoryEntry, topic_vector: np.ndarray, content_vector: np.ndarray) -> None:
+        self._entries.append(entry)
+        self._topic_vectors.append(topic_vector)
+        self._content_vectors.append(content_vector)
+        self._tokens.append(tokenize(f"{entry.topic}\n{entry.content}"))
+
+    def add(self, kind: str, topic: str, content: str, url: str = "") -> None:
+        """Store a research result or source summary.
+
+        A source already stored under the same URL is replaced by the newer summary.
+        """
+        topic_vector, content_vector = embed(topic), embed(content)
+        created_at = time.time()
+        with self._lock:
+            if kind == "source" and url:
+                self._conn.execute("DELETE FROM memory WHERE kind = 'source' AND url = ?", (url,))
+                keep = [i for i, e in enumerate(self._entries) if not (e.kind == "source" and e.url == url)]
+                self._select(keep)
+            cursor = self._conn.execute(
+                "INSERT INTO memory (kind, topic, content, url, created_at, topic_vector, content_vector) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (kind, topic, content, url, created_at, topic_vector.tobytes(), content_vector.tobytes()),
+            )
+            self._conn.commit()
+            self._append(MemoryEntry(cursor.lastrowid, kind, topic, content, url, created_at), topic_vector, content_vector)
+
+    def add_research(self, topic: str, compressed_research: str, raw_notes: Optional[List[str]] = None) -> None:
+        """Store a finished research unit and the source summaries found in its raw notes."""
+        self.add("research", topic, compressed_research)
+        for note in raw_notes or []:
+            for match in _source_block_re.finditer(note):
+                self.add("source", match.group("title").strip(), match.group("summary").strip(), match.group("url"))
+
+    def _select(self, indices: List[int]) -> None:
+        self._entries = [self._entries[i] for i in indices]
+        self._topic_vectors = [self._topic_vectors[i] for i in indices]
+        self._content_vectors = [self._content_vectors[i] for i in indices]
+        self._tokens = [self._tokens[i] for i in indices]
+
+    def _fresh(self, kind: Optional[str]) -> List[int]:
+        cutoff = time.time() - memory_max_age_days * 86400 if memory_max_age_days is not None else float("-inf")
+        return [i for i, e in enumerate(self._entries) if e.created_at >= cutoff and (kind is None or e.kind == kind)]
+
+    def search(
+        self,
+        query: str,
+        kind: Optional[str] = None,
+        max_results: int = 5,
+        min_similarity: float = 0.0,
+    ) -> List[MemoryEntry]:
+        """Rank fresh entries by hybrid BM25 + vector score.
+
+        Args:
+            query: Text to search for
+            kind: Only return entries of this kind ("research" or "source")
+            max_results: Maximum number of entries to return
+            min_similarity: Minimum cosine similarity of an entry's content to the query
+        """
+        with self._lock:
+            candidates = self._fresh(kind)
+            if not candidates:
+                return []
+            bm25 = bm25_scores([self._tokens[i] for i in candidates], tokenize(query))
+            if bm25.max() > 0:
+                bm25 = bm25 / bm25.max()
+            cosine = np.stack([self._content_vectors[i] for i in candidates]) @ embed(query)
+            scores = memory_vector_weight * cosine + (1 - memory_vector_weight) * bm25
+            order = [j for j in np.argsort(-scores) if cosine[j] >= min_similarity][:max_results]
+            return [MemoryEntry(**{**self._entries[candidates[j]].__dict__, "score": float(scores[j])}) for j in order]
+
+    def known_sources(self, topic: str) -> List[MemoryEntry]:
+        """Return the stored source summaries most relevant to a research topic."""
+        return self.search(
+            topic,
+            kind="source",
+            max_results=memory_sources_per_topic,
+            min_similarity=memory_source_min_similarity,
+        )
+
+    def lookup_topic(self, topic: str) -> Optional[MemoryEntry]:
+        """Return past research on a topic similar enough to reuse, or None.
+
+        Only research entries whose topic vector is within `memory_topic_threshold`
+        of the new topic qualify; among those, the best hybrid match wins.
+        """
+        with self._lock:
+            candidates = self._fresh("research")
+            if not candidates:
+                return None
+            cosine = np.stack([self._topic_vectors[i] for i in candidates]) @ embed(topic)
+            bm25 = bm25_scores([self._tokens[i] for i in candidates], tokenize(topic))
+            if bm25.max() > 0:
+                bm25 = bm25 / bm25.max()
+            scores = np.where(cosine >= memory_topic_threshold, memory_vector_weight * cosine + (1 - memory_vector_weight) * bm25, -np.inf)
+            best = int(np.argmax(scores))
+            if not np.isfinite(scores[best]):
+                return None
+            entry = self._entries[candidates[best]]
+        return MemoryEntry(**{**entry.__dict__, "score": float(cosine[best])})
+
+    def prune(self) -> int:
+        """Delete entries older than `memory_max_age_days`; returns the number deleted."""
+        if memory_max_age_days is None:
+            return 0
+        cutoff = time.time() - memory_max_age_days * 86400
+        with self._lock:
+            deleted = self._conn.execute("DELETE FROM memory WHERE created_at < ?", (cutoff,)).rowcount
+            self._conn.commit()
+            self._select([i for i, e in enumerate(self._entries) if e.created_at >= cutoff])
+        return deleted
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+# Global memory - initialized lazily
+_memory: Optional[ResearchMemory] = None
+
+def get_research_memory() -> Optional[ResearchMemory]:
+    """Return the research memory, or None if it is disabled.
+
+    Expired entries are pruned when the memory is opened.
+    """
+    global _memory
+    if _memory is None and memory_path:
+        os.makedirs(os.path.dirname(os.path.abspath(memory_path)), exist_ok=True)
+        _memory = ResearchMemory(memory_path)
+        _memory.prune()
+    return _memory
+
+def configure_research_memory(path: Optional[str]) -> None:
+    """Enable (path) or disable (None) the research memory at runtime."""
+    global _memory, memory_path
+    if _memory is not None:
+        _memory.close()
+    _memory = None
+    memory_path = path
+
+def format_memory_note(entry: MemoryEntry) -> str:
+    """Format past research served from memory, with the date it was gathered."""
+    return f"[From research memory, gathered on {entry.gathered_on}]\n\n{entry.content}"
+
+def format_known_sources(entries: List[MemoryEntry]) -> str:
+    """Format stored source summaries to append to a researcher's topic ("" if there are none)."""
+    if not entries:
+        return ""
+    output = "\n\n<Known Sources>\nSources found by earlier research; search for what they do not cover.\n"
+    for i, entry in enumerate(entries, 1):
+        output += f"\n--- SOURCE {i}: {entry.topic} (gathered on {entry.gathered_on}) ---\nURL: {entry.url}\n\nSUMMARY:\n{entry.content}\n"
+    return output + "</Known Sources>"
@@ -0,0 +1,205 @@
+"""Research Unit Scheduler.
+
+This module runs the research units (ConductResearch calls) that the supervisor
+delegates, enforcing a hard concurrency limit instead of relying on the prompt.
+
+Key features:
+- FIFO queue drained by a fixed pool of workers (at most `max_concurrency` running)
+- Optional global token and wall-clock budgets shared across supervisor iterations
+- Optional process-wide limit on running units across concurrent runs (batches)
+- Still-running units are cancelled and queued units skipped once a budget is spent
+  (a unit's tokens are charged when it finishes, see `ResearchScheduler`)
+- Per-unit report of queue wait, run time, tokens used and final status
+"""
+
+import asyncio
+import contextlib
+import time
+import weakref
+from dataclasses import asdict, dataclass
+
+from typing_extensions import AsyncContextManager, Awaitable, Callable, List, Optional
+
+# ===== REPORTING =====
+
+@dataclass
+class ResearchUnitStats:
+    """Timing and usage report for a single research unit."""
+    unit_id: str
+    research_topic: str
+    status: str = "queued"  # queued | completed | failed | cancelled | skipped | memory
+    queue_wait: float = 0.0
+    run_time: float = 0.0
+    tokens: int = 0
+    error: str = ""
+
+    def to_dict(self) -> dict:
+        """Return the stats as a plain dict for graph state."""
+        return asdict(self)
+
+def count_tokens_used(result: dict) -> int:
+    """Sum provider-reported token usage over the AI messages of a researcher result.
+
+    Results restored from a checkpoint carry their original usage in `tokens_used`.
+    """
+    if "tokens_used" in result:
+        return result["tokens_used"]
+    total = 0
+    for message in result.get("researcher_messages", []):
+        usage = getattr(message, "usage_metadata", None)
+        if usage:
+            total += usage.get("total_tokens", 0)
+    return total
+
+# ===== GLOBAL LIMIT =====
+
+# Research units allowed to run at once across all runs in the process (e.g. the
+# briefs of a batch); None leaves only each scheduler's own max_concurrency
+global_max_concurrency: Optional[int] = None
+
+# One semaphore per event loop, created lazily
+_global_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+def global_research_slot() -> AsyncContextManager:
+    """Return the process-wide research unit slot to hold while a unit runs."""
+    if global_max_concurrency is None:
+        return contextlib.nullcontext()
+    loop = asyncio.get_running_loop()
+    if loop not in _global_slots:
+        _global_slots[loop] = asyncio.Semaphore(global_max_concurrency)
+    return _global_slots[loop]
+
+# ===== SCHEDULER =====
+
+class ResearchScheduler:
+    """Run research units through a bounded worker pool with an optional budget.
+
+    The time budget is enforced while units run: at the deadline, running units
+    are cancelled. Token usage is only known from a unit's result, so a unit is
+    charged when it finishes; the token budget therefore cannot stop a unit
+    that is running, only cancel the others once a finished unit has spent it,
+    and the final total can exceed the budget by up to `max_concurrency` units.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        token_budget: Optional[int] = None,
+        tokens_used: int = 0,
+        deadline: Optional[float] = None,
+    ):
+        """Create a scheduler.
+
+        Args:
+            max_concurrency: Maximum number of research units running at once
+            token_budget: Total tokens allowed; None for no limit
+            tokens_used: Tokens already spent by earlier supervisor iterations
+            deadline: Absolute `time.time()` after which running units are cancelled
+        """
+        self.max_concurrency = max(1, max_concurrency)
+        self.token_budget = token_budget
+        self.tokens_used = tokens_used
+        self.deadline = deadline
+        self.exhausted_reason = ""
+
+    def budget_exhausted(self) -> bool:
+        """Check the token and time budgets, recording the reason when spent."""
+        if self.token_budget is not None and self.tokens_used >= self.token_budget:
+            self.exhausted_reason = f"token budget of {self.token_budget} exhausted"
+        elif self.deadline is not None and time.time() >= self.deadline:
+            self.exhausted_reason = "time budget exhausted"
+        return bool(self.exhausted_reason)
+
+    async def run(
+        self,
+        units: List[tuple[str, str, Callable[[], Awaitable[dict]]]],
+    ) -> List[tuple[Optional[dict], ResearchUnitStats]]:
+        """Run research units and return their results in submission order.
+
+        Args:
+            units: (unit_id, research_topic, factory) triples; the factory
+                creates the coroutine that runs the research unit
+
+        Returns:
+            (result, stats) pairs in the order of `units`; result is None when
+            the unit failed, was cancelled, or was skipped
+        """
+        results: List[Optional[dict]] = [None] * len(units)
+        stats = [ResearchUnitStats(unit_id=unit_id, research_topic=topic) for unit_id, topic, _ in units]
+        queue: asyncio.Queue = asyncio.Queue()
+        enqueued_at = time.monotonic()
+        for index in range(len(units)):
+            queue.put_nowait(index)
+
+        running: dict[int, asyncio.Task] = {}
+        budget_spent = asyncio.Event()
+
+        def check_budget() -> None:
+            if self.budget_exhausted() and not budget_spent.is_set():
+                budget_spent.set()
+                for task in running.values():
+                    task.cancel()
+
+        async def worker() -> None:
+            while True:
+                try:
+                    index = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                unit_stats = stats[index]
+                # Waiting for a process-wide slot counts as queue wait
+                async with global_research_slot():
+                    if budget_spent.is_set() or self.budget_exhausted():
+                        unit_stats.status = "skipped"
+                        unit_stats.error = self.exhausted_reason
+                        continue
+
+                    started_at = time.monotonic()
+                    unit_stats.queue_wait = started_at - enqueued_at
+                    task = asyncio.ensure_future(units[index][2]())
+                    running[index] = task
+                    try:
+                        result = await task
+                        results[index] = result
+                        unit_stats.tokens = count_tokens_used(result)
+                        unit_stats.status = "completed"
+                        self.tokens_used += unit_stats.tokens
+                    except asyncio.CancelledError:
+                        if not budget_spent.is_set():
+                            raise
+                        unit_stats.status = "cancelled"
+                        unit_stats.error = self.exhausted_reason
+                    except Exception as e:
+                        unit_stats.status = "failed"
+                        unit_stats.error = str(e)
+                    finally:
+                        running.pop(index, None)
+                        unit_stats.run_time = time.monotonic() - started_at
+                check_budget()
+
+        async def watchdog() -> None:
+            if self.deadline is None:
+                return
+            await asyncio.sleep(max(0.0, self.deadline - time.time()))
+            check_budget()
+
+        workers = [asyncio.ensure_future(worker()) for _ in range(min(self.max_concurrency, len(units)))]
+        timer = asyncio.ensure_future(watchdog())
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            timer.cancel()
+            for task in workers:
+                task.cancel()
+
+        return list(zip(results, stats))
+
+def format_unit_stats(stats: List[dict]) -> str:
+    """Format research unit stats as a small text table."""
+    lines = [f"{'status':<10} {'wait(s)':>8} {'run(s)':>8} {'tokens':>8}  topic"]
+    for unit in stats:
+        lines.append(
+            f"{unit['status']:<10} {unit['queue_wait']:>8.1f} {unit['run_time']:>8.1f} "
+            f"{unit['tokens']:>8}  {unit['research_topic'][:60]}"
+        )
+    return "\n".join(lines)
@@ -30,8 +30,16 @@ class SupervisorState(TypedDict):
     notes: Annotated[list[str], operator.add] = []
     # Counter tracking the number of research iterations performed
     research_iterations: int = 0
-    # Raw unprocessed research notes collected from sub-agent research
+    # References to raw unprocessed research notes from sub-agents, stored in the blob store
     raw_notes: Annotated[list[str], operator.add] = []
+    # Wall-clock time (epoch seconds) when the first research units were launched
+    research_started_at: float
+    # Tokens spent by research units so far, checked against the token budget
+    research_tokens_used: int = 0
+    # Queue wait, run time, tokens and status for every research unit
+    research_unit_stats: Annotated[list[dict], operator.add] = []
+    # Novelty (share of new findings, 0-1) of each round of research units
+    research_novelty: list[float] = []
 
 @tool
 class ConductResearch(BaseModel):
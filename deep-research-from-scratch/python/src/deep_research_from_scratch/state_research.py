@@ -20,13 +20,23 @@ class ResearcherState(TypedDict):
 
     This state tracks the researcher's conversation, iteration count for limiting
     tool calls, the research topic being investigated, compressed findings,
-    and raw research notes for detailed analysis.
+    raw research notes for detailed analysis, and the digest of tool outputs
+    compacted out of the conversation.
     """
     researcher_messages: Annotated[Sequence[BaseMessage], add_messages]
     tool_call_iterations: int
     research_topic: str
     compressed_research: str
+    # References to raw notes in the blob store (see blob_store.py), not the notes themselves
     raw_notes: Annotated[List[str], operator.add]
+    # Rolling digest of older tool outputs folded out of researcher_messages
+    research_digest: str
+    # Compressed findings built incrementally while research is still running
+    running_summary: str
+    # Tool call ids whose outputs are already folded into running_summary
+    summarized_tool_call_ids: List[str]
+    # Novelty (share of new content, 0-1) of each round of search results
+    novelty_scores: List[float]
 
 class ResearcherOutputState(TypedDict):
     """
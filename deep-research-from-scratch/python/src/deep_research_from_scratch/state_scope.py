@@ -30,9 +30,11 @@ class AgentState(MessagesState):
 
     # Research brief generated from user conversation history
     research_brief: Optional[str]
+    # Brief written speculatively during clarification, consumed by write_research_brief
+    speculative_brief: Optional[str]
     # Messages exchanged with the supervisor agent for coordination
     supervisor_messages: Annotated[Sequence[BaseMessage], add_messages]
-    # Raw unprocessed research notes collected during the research phase
+    # References to raw unprocessed research notes, loaded lazily from the blob store
     raw_notes: Annotated[list[str], operator.add] = []
     # Processed and structured notes ready for report generation
     notes: Annotated[list[str], operator.add] = []
@@ -60,3 +62,26 @@ class ResearchQuestion(BaseModel):
     research_brief: str = Field(
         description="A research question that will be used to guide the research.",
     )
+
+class ReportSection(BaseModel):
+    """Schema for one planned section of the final report."""
+
+    title: str = Field(
+        description="Title of the section.",
+    )
+    description: str = Field(
+        description="What the section must cover.",
+    )
+    note_ids: List[int] = Field(
+        description="Ids of the research notes that contain the information for this section.",
+    )
+
+class ReportOutline(BaseModel):
+    """Schema for the planned outline of the final report."""
+
+    title: str = Field(
+        description="Title of the report.",
+    )
+    sections: List[ReportSection] = Field(
+        description="Sections of the report, in reading order.",
+    )
@@ -0,0 +1,165 @@
+"""Streaming Events for the Full Research Agent.
+
+This module wraps `agent.astream` in an async iterator of typed events, so
+callers can show progress while a deep research run is still going:
+- the scoping decision and the research brief
+- each researcher starting and finishing, with its compressed findings, and
+  research ending early (budget spent or no new findings)
+- how much deduplication shrank the notes, the report outline, report tokens as they are generated, each finished
+  section, and the final report
+"""
+
+from dataclasses import dataclass, field
+
+from langchain_core.messages import AIMessageChunk, HumanMessage
+from langchain_core.runnables import RunnableConfig
+from typing_extensions import AsyncIterator, List, Optional, Union
+
+from deep_research_from_scratch.report_writer import SECTION_TAG_PREFIX
+from deep_research_from_scratch.research_agent_full import SINGLE_PASS_TAG, agent
+
+# ===== EVENTS =====
+
+@dataclass
+class ResearchEvent:
+    """Base class for events emitted during a research run."""
+    type: str = field(init=False, default="event")
+
+@dataclass
+class ScopeDecision(ResearchEvent):
+    """Scoping decided whether to ask the user a clarifying question."""
+    need_clarification: bool
+    message: str
+    type: str = field(init=False, default="scope_decision")
+
+@dataclass
+class BriefReady(ResearchEvent):
+    """The research brief was written and research is starting."""
+    research_brief: str
+    type: str = field(init=False, default="brief_ready")
+
+@dataclass
+class ResearcherStarted(ResearchEvent):
+    """A research unit started running."""
+    unit_id: str
+    research_topic: str
+    type: str = field(init=False, default="researcher_started")
+
+@dataclass
+class ResearcherFinished(ResearchEvent):
+    """A research unit finished, failed, or was cancelled or skipped."""
+    unit_id: str
+    research_topic: str
+    status: str
+    compressed_research: str
+    type: str = field(init=False, default="researcher_finished")
+
+@dataclass
+class ResearchEnded(ResearchEvent):
+    """Supervision stopped delegating research before the supervisor finished it."""
+    reason: str
+    type: str = field(init=False, default="research_ended")
+
+@dataclass
+class NotesDeduplicated(ResearchEvent):
+    """Near-duplicate paragraphs were dropped from the notes before the report."""
+    paragraphs_before: int
+    paragraphs_after: int
+    chars_before: int
+    chars_after: int
+    type: str = field(init=False, default="notes_deduplicated")
+
+@dataclass
+class ReportOutlineReady(ResearchEvent):
+    """The report outline was planned."""
+    title: str
+    sections: List[str]
+    type: str = field(init=False, default="report_outline")
+
+@dataclass
+class ReportToken(ResearchEvent):
+    """A chunk of report text; section_index is None for single-pass reports."""
+    text: str
+    section_index: Optional[int]
+    type: str = field(init=False, default="report_token")
+
+@dataclass
+class ReportSectionReady(ResearchEvent):
+    """A report section was completely written."""
+    index: int
+    title: str
+    content: str
+    type: str = field(init=False, default="report_section")
+
+@dataclass
+class ReportReady(ResearchEvent):
+    """The stitched final report is available."""
+    final_report: str
+    type: str = field(init=False, default="report_ready")
+
+_custom_events = {
+    "scope_decision": ScopeDecision,
+    "brief_ready": BriefReady,
+    "researcher_started": ResearcherStarted,
+    "researcher_finished": ResearcherFinished,
+    "research_ended": ResearchEnded,
+    "notes_deduplicated": NotesDeduplicated,
+    "report_outline": ReportOutlineReady,
+    "report_section": ReportSectionReady,
+}
+
+# ===== STREAMING =====
+
+def _report_section_index(tags: List[str]) -> Union[int, None, bool]:
+    """Return the section index of a report LLM call, None for single-pass, False otherwise."""
+    for tag in tags:
+        if tag.startswith(SECTION_TAG_PREFIX):
+            return int(tag[len(SECTION_TAG_PREFIX):])
+        if tag == SINGLE_PASS_TAG:
+            return None
+    return False
+
+async def stream_research(
+    query: Union[str, List, None],
+    config: Optional[RunnableConfig] = None,
+    graph=None,
+) -> AsyncIterator[ResearchEvent]:
+    """Run the full research agent and yield typed events as they happen.
+
+    Args:
+        query: User request, a list of messages for a multi-turn conversation,
+            or None to resume a checkpointed thread
+        config: Optional run config (e.g. thread id, callbacks)
+        graph: Compiled full agent to run, e.g. from `compile_agent`; defaults to `agent`
+
+    Yields:
+        ResearchEvent subclasses in the order they occur
+    """
+    graph = graph or agent
+    if query is None:
+        graph_input = None
+    else:
+        graph_input = {"messages": [HumanMessage(content=query)] if isinstance(query, str) else query}
+
+    async for _namespace, mode, chunk in graph.astream(
+        graph_input,
+        config=config,
+        stream_mode=["custom", "messages", "updates"],
+        subgraphs=True,
+    ):
+        if mode == "custom" and isinstance(chunk, dict) and chunk.get("type") in _custom_events:
+            payload = {k: v for k, v in chunk.items() if k != "type"}
+            yield _custom_events[chunk["type"]](**payload)
+
+        elif mode == "messages":
+            message, metadata = chunk
+            if not isinstance(message, AIMessageChunk) or not isinstance(message.content, str) or not message.content:
+                continue
+            section_index = _report_section_index(metadata.get("tags", []))
+            if section_index is not False:
+                yield ReportToken(text=message.content, section_index=section_index)
+
+        elif mode == "updates" and isinstance(chunk, dict):
+            update = chunk.get("final_report_generation")
+            if update and update.get("final_report"):
+                yield ReportReady(final_report=update["final_report"])
@@ -5,16 +5,17 @@ This module provides search and content processing utilities for the research ag
 including web search capabilities and content summarization tools.
 """
 
+import asyncio
 from pathlib import Path
 from datetime import datetime
-from typing_extensions import Annotated, List, Literal
+from typing_extensions import Annotated, List, Literal, Optional
 
-from langchain.chat_models import init_chat_model 
-from langchain_core.messages import HumanMessage
+from langchain_core.messages import HumanMessage, ToolMessage
 from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import tool, InjectedToolArg
-from tavily import TavilyClient
 
+from deep_research_from_scratch.providers import get_model, get_tavily_client
+from deep_research_from_scratch.passage_filter import estimate_tokens, select_passages
 from deep_research_from_scratch.state_research import Summary
 from deep_research_from_scratch.prompts import summarize_webpage_prompt
 
@@ -39,8 +40,12 @@ def get_current_dir() -> Path:
 
 # ===== CONFIGURATION =====
 
-summarization_model = init_chat_model(model="openai:gpt-4.1-mini")
-tavily_client = TavilyClient()
+# Models and the Tavily client are created lazily by the provider registry (providers.py)
+
+# Pages at or below this many (estimated) tokens are used as-is, without the LLM
+min_tokens_for_summary = 500
+# Token budget for the query-focused passages sent to the summarization model
+summary_input_token_budget = 3000
 
 # ===== SEARCH FUNCTIONS =====
 
@@ -65,7 +70,7 @@ def tavily_search_multiple(
     # Execute searches sequentially. Note: yon can use AsyncTavilyClient to parallelize this step.
     search_docs = []
     for query in search_queries:
-        result = tavily_client.search(
+        result = get_tavily_client().search(
             query,
             max_results=max_results,
             include_raw_content=include_raw_content,
@@ -75,18 +80,35 @@ def tavily_search_multiple(
 
     return search_docs
 
-def summarize_webpage_content(webpage_content: str) -> str:
+def summarize_webpage_content(webpage_content: str, query: str = "", research_topic: str = "") -> str:
     """Summarize webpage content using the configured summarization model.
 
+    Short pages are returned as-is. Longer pages are first cut down to the
+    passages most relevant to the query and research topic (BM25, see
+    `select_passages`), so only those are sent to the summarization model.
+
     Args:
         webpage_content: Raw webpage content to summarize
+        query: Search query that returned the page
+        research_topic: Research topic being investigated
 
     Returns:
         Formatted summary with key excerpts
     """
+    if estimate_tokens(webpage_content) <= min_tokens_for_summary:
+        return webpage_content
+
+    if query or research_topic:
+        webpage_content = select_passages(
+            webpage_content,
+            query,
+            research_topic=research_topic,
+            token_budget=summary_input_token_budget,
+        )
+
     try:
         # Set up structured output model for summarization
-        structured_model = summarization_model.with_structured_output(Summary)
+        structured_model = get_model("summarization").with_structured_output(Summary)
 
         # Generate summary
         summary = structured_model.invoke([
@@ -127,11 +149,13 @@ def deduplicate_search_results(search_results: List[dict]) -> dict:
 
     return unique_results
 
-def process_search_results(unique_results: dict) -> dict:
+def process_search_results(unique_results: dict, query: str = "", research_topic: str = "") -> dict:
     """Process search results by summarizing content where available.
 
     Args:
         unique_results: Dictionary of unique search results
+        query: Search query, used to pre-filter page content before summarization
+        research_topic: Research topic, used as a secondary pre-filter signal
 
     Returns:
         Dictionary of processed results with summaries
@@ -144,7 +168,7 @@ def process_search_results(unique_results: dict) -> dict:
             content = result['content']
         else:
             # Summarize raw content for better processing
-            content = summarize_webpage_content(result['raw_content'])
+            content = summarize_webpage_content(result['raw_content'], query=query, research_topic=research_topic)
 
         summarized_results[url] = {
             'title': result['title'],
@@ -175,6 +199,57 @@ def format_search_output(summarized_results: dict) -> str:
 
     return formatted_output
 
+# ===== TOOL EXECUTION =====
+
+async def execute_tool_calls(
+    tool_calls: List[dict],
+    tools_by_name: dict,
+    max_concurrency: int = 4,
+    timeout: Optional[float] = None,
+) -> List[ToolMessage]:
+    """Execute tool calls concurrently and return their results as tool messages.
+
+    Independent tool calls (e.g. several `tavily_search` calls emitted in one
+    turn) run concurrently, bounded by a semaphore. Sync tools are dispatched to
+    a thread by `ainvoke`, so they do not block the event loop. A call that
+    fails or exceeds the timeout produces an error message (with status
+    "error") for that call only.
+
+    Args:
+        tool_calls: Tool calls from the last AI message
+        tools_by_name: Mapping of tool name to tool
+        max_concurrency: Maximum number of tool calls running at once
+        timeout: Per-call timeout in seconds, or None for no timeout
+
+    Returns:
+        Tool messages in the same order as `tool_calls`
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def run(tool_call: dict) -> tuple[str, str]:
+        tool = tools_by_name.get(tool_call["name"])
+        if tool is None:
+            return f"Error: unknown tool '{tool_call['name']}'", "error"
+        async with semaphore:
+            try:
+                return await asyncio.wait_for(tool.ainvoke(tool_call["args"]), timeout=timeout), "success"
+            except TimeoutError:
+                return f"Error: tool '{tool_call['name']}' timed out after {timeout}s", "error"
+            except Exception as e:
+                return f"Error: tool '{tool_call['name']}' failed: {str(e)}", "error"
+
+    # gather preserves input order, so results line up with tool_calls
+    observations = await asyncio.gather(*(run(tool_call) for tool_call in tool_calls))
+
+    return [
+        ToolMessage(
+            content=observation,
+            name=tool_call["name"],
+            tool_call_id=tool_call["id"],
+            status=status,
+        ) for (observation, status), tool_call in zip(observations, tool_calls)
+    ]
+
 # ===== RESEARCH TOOLS =====
 
 @tool(parse_docstring=True)
@@ -182,6 +257,7 @@ def tavily_search(
     query: str,
     max_results: Annotated[int, InjectedToolArg] = 3,
     topic: Annotated[Literal["general", "news", "finance"], InjectedToolArg] = "general",
+    research_topic: Annotated[str, InjectedToolArg] = "",
 ) -> str:
     """Fetch results from Tavily search API with content summarization.
 
@@ -189,6 +265,7 @@ def tavily_search(
         query: A single search query to execute
         max_results: Maximum number of results to return
         topic: Topic to filter results by ('general', 'news', 'finance')
+        research_topic: Research topic of the calling agent, used to focus summaries
 
     Returns:
         Formatted string of search results with summaries
@@ -205,7 +282,7 @@ def tavily_search(
     unique_results = deduplicate_search_results(search_results)
 
     # Process results with summarization
-    summarized_results = process_search_results(unique_results)
+    summarized_results = process_search_results(unique_results, query=query, research_topic=research_topic)
 
     # Format output for consumption
     return format_search_output(summarized_results)
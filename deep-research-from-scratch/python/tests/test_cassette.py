@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+
+from deep_research_from_scratch.cassette import (
+    Cassette,
+    CassetteLLMCache,
+    CassetteMiss,
+    CassetteSearchClient,
+)
+
+
+def recorded(tmp_path, entries):
+    path = str(tmp_path / "run.cassette.jsonl")
+    cassette = Cassette(path, "record")
+    for kind, group, key, payload in entries:
+        cassette.record(kind, group, key, payload, latency=0.0)
+    return path
+
+
+def test_take_prefers_exact_match_then_falls_back_in_recorded_order(tmp_path):
+    path = recorded(tmp_path, [
+        ("llm", "researcher", "k1", "first"),
+        ("llm", "researcher", "k2", "second"),
+        ("llm", "researcher", "k3", "third"),
+        ("llm", "supervisor", "k4", "supervisor"),
+    ])
+    cassette = Cassette(path, "replay")
+
+    assert cassette.take("llm", "researcher", "k2")["payload"] == "second"
+    # Unknown prompts get the next unused response of the same role
+    assert cassette.take("llm", "researcher", "diverged")["payload"] == "first"
+    assert cassette.take("llm", "researcher", "diverged")["payload"] == "third"
+    assert (cassette.exact_matches, cassette.fallback_matches) == (1, 2)
+    # An exactly matching entry already served by fallback is not served twice
+    with pytest.raises(CassetteMiss):
+        cassette.take("llm", "researcher", "k1")
+    assert cassette.take("llm", "supervisor", "k4")["payload"] == "supervisor"
+
+
+def test_model_responses_replay_with_dates_normalized(tmp_path):
+    path = str(tmp_path / "run.cassette.jsonl")
+    prompt = "Today is Mon Oct 19, 2026. Summarize the findings."
+
+    cache = CassetteLLMCache(Cassette(path, "record"), "researcher")
+    model = GenericFakeChatModel(messages=iter([AIMessage(content="recorded answer")]), cache=cache)
+    assert model.invoke(prompt).content == "recorded answer"
+
+    cache = CassetteLLMCache(Cassette(path, "replay"), "researcher")
+    model = GenericFakeChatModel(messages=iter([]), cache=cache)
+    answer = asyncio.run(model.ainvoke(prompt.replace("Mon Oct 19, 2026", "Tue Oct 20, 2026")))
+
+    assert answer.content == "recorded answer"
+    assert cache.cassette.exact_matches == 1
+
+
+def test_search_client_records_and_replays(tmp_path):
+    class Tavily:
+        def search(self, query, **kwargs):
+            return {"query": query, "results": [{"url": "https://a.example"}], **kwargs}
+
+    path = str(tmp_path / "run.cassette.jsonl")
+    recorder = CassetteSearchClient(Cassette(path, "record"), Tavily())
+    first = recorder.search("solar", max_results=3)
+    second = recorder.search("wind", max_results=3)
+
+    replayer = CassetteSearchClient(Cassette(path, "replay"))
+    assert replayer.search("wind", max_results=3) == second
+    assert replayer.search("solar", max_results=5) == first
+    with pytest.raises(CassetteMiss):
+        replayer.search("hydro")
+
+
+def test_unknown_mode_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        Cassette(str(tmp_path / "x.jsonl"), "rewind")
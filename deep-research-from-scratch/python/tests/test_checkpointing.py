@@ -0,0 +1,71 @@
+import asyncio
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langgraph.graph import END, START, MessagesState, StateGraph
+
+from deep_research_from_scratch import checkpointing
+from deep_research_from_scratch.checkpointing import (
+    CompressedSerializer,
+    ResearchUnitStore,
+    open_checkpointer,
+)
+
+
+def test_serializer_round_trips_small_and_large_payloads():
+    serde = CompressedSerializer()
+    small = {"notes": ["short"]}
+    large = {"messages": [HumanMessage(content="question"), AIMessage(content="finding " * 500)]}
+
+    small_type, small_data = serde.dumps_typed(small)
+    large_type, large_data = serde.dumps_typed(large)
+
+    assert not small_type.startswith("zlib+")
+    assert large_type.startswith("zlib+")
+    assert len(large_data) < len(JsonPlusSerializer().dumps_typed(large)[1])
+    assert serde.loads_typed((small_type, small_data)) == small
+    assert serde.loads_typed((large_type, large_data)) == large
+
+
+def test_serializer_loads_uncompressed_checkpoints():
+    payload = {"research_brief": "brief " * 500}
+
+    assert CompressedSerializer().loads_typed(JsonPlusSerializer().dumps_typed(payload)) == payload
+
+
+def test_research_unit_store_round_trip(tmp_path):
+    path = str(tmp_path / "checkpoints.sqlite")
+    store = ResearchUnitStore(path)
+    result = {"compressed_research": "findings", "raw_notes": ["a", "b"], "tokens_used": 42}
+    store.put("thread-1", "call-1", result)
+    store.close()
+
+    reopened = ResearchUnitStore(path)
+    assert reopened.get("thread-1", "call-1") == result
+    assert reopened.get("thread-1", "call-2") is None
+    assert reopened.get("thread-2", "call-1") is None
+    reopened.close()
+
+
+def test_checkpointed_graph_state_survives_reopening(tmp_path):
+    path = str(tmp_path / "checkpoints.sqlite")
+    config = {"configurable": {"thread_id": "thread-1"}}
+
+    def reply(state: MessagesState):
+        return {"messages": [AIMessage(content="answer " * 500)]}
+
+    builder = StateGraph(MessagesState)
+    builder.add_node("reply", reply)
+    builder.add_edge(START, "reply")
+    builder.add_edge("reply", END)
+
+    async def run():
+        async with open_checkpointer(path) as checkpointer:
+            assert checkpointing.get_research_unit_store() is not None
+            await builder.compile(checkpointer=checkpointer).ainvoke({"messages": [("user", "hi")]}, config)
+        assert checkpointing.get_research_unit_store() is None
+        async with open_checkpointer(path) as checkpointer:
+            return await builder.compile(checkpointer=checkpointer).aget_state(config)
+
+    state = asyncio.run(run())
+    assert [m.content for m in state.values["messages"]] == ["hi", "answer " * 500]
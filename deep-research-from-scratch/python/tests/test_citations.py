@@ -0,0 +1,44 @@
+import logging
+
+from deep_research_from_scratch.citations import (
+    merge_citations,
+    renumber_citations,
+    split_sources,
+)
+
+
+def test_merge_gives_each_url_one_number():
+    first = "Alpha [1]. Beta [2].\n\n### Sources\n[1] A: https://a.example\n[2] B: https://b.example"
+    second = "Gamma [1, 2].\n\n### Sources\n[1] B: https://b.example/\n[2] C: https://c.example"
+
+    bodies, sources = merge_citations([first, second])
+
+    assert bodies == ["Alpha [1]. Beta [2].", "Gamma [2, 3]."]
+    assert [url for _, url in sources] == ["https://a.example", "https://b.example", "https://c.example"]
+
+
+def test_renumber_leaves_unmapped_brackets_untouched():
+    body = "Index x[0] and footnote [9], cited [1] and [1, 9]. See [link](https://x.example)."
+
+    assert renumber_citations(body, {1: 4}) == (
+        "Index x[0] and footnote [9], cited [4] and [4]. See [link](https://x.example)."
+    )
+
+
+def test_document_without_sources_list_is_not_rewritten(caplog):
+    cited = "Claim [1] without a sources list."
+    plain = "No citations here."
+
+    with caplog.at_level(logging.WARNING, logger="deep_research_from_scratch.citations"):
+        bodies, sources = merge_citations([cited, plain])
+
+    assert bodies == [cited, plain]
+    assert sources == []
+    assert len(caplog.records) == 1
+
+
+def test_sources_heading_without_entries_is_part_of_the_body():
+    text = "Claim [1].\n\n### Sources\nnone found"
+
+    assert split_sources(text) == (text, {})
+    assert merge_citations([text])[0] == [text]
@@ -0,0 +1,55 @@
+import os
+
+from deep_research_from_scratch.document_index import DocumentIndex
+
+
+def write(path, text, mtime):
+    path.write_text(text)
+    os.utime(path, (mtime, mtime))
+
+
+def paths(results):
+    return [result["path"] for result in results]
+
+
+def test_refresh_reindexes_added_modified_and_deleted_files(tmp_path):
+    root, index_dir = tmp_path / "files", tmp_path / "index"
+    root.mkdir()
+    write(root / "solar.md", "Solar panels convert sunlight into electricity.", 1_000)
+    write(root / "wind.txt", "Wind turbines convert moving air into electricity.", 1_000)
+    index = DocumentIndex(root, index_dir)
+
+    assert index.refresh()
+    assert not index.refresh()
+    assert sorted(paths(index.search("electricity"))) == ["solar.md", "wind.txt"]
+
+    # Added
+    write(root / "hydro.md", "Hydroelectric dams turn falling water into electricity.", 1_000)
+    assert index.refresh()
+    assert paths(index.search("dams")) == ["hydro.md"]
+
+    # Modified
+    write(root / "wind.txt", "Offshore wind farms are built in shallow seas.", 2_000)
+    assert index.refresh()
+    assert paths(index.search("offshore")) == ["wind.txt"]
+    assert paths(index.search("turbines")) == []
+
+    # Deleted
+    (root / "solar.md").unlink()
+    assert index.refresh()
+    assert paths(index.search("sunlight")) == []
+    assert not (index_dir / "docs" / "solar.md.json").exists()
+    index.close()
+
+
+def test_index_is_reused_from_disk(tmp_path):
+    root, index_dir = tmp_path / "files", tmp_path / "index"
+    root.mkdir()
+    write(root / "notes.md", "Battery storage smooths renewable supply.", 1_000)
+    DocumentIndex(root, index_dir).refresh()
+
+    reopened = DocumentIndex(root, index_dir)
+    assert not reopened.refresh()
+    [result] = reopened.search("battery storage")
+    assert reopened.read_slice(result["path"], result["start"], result["end"]).startswith("Battery storage")
+    reopened.close()
@@ -0,0 +1,29 @@
+from deep_research_from_scratch.note_dedup import dedup_notes
+
+FACT = ("The James Webb Space Telescope observes in the infrared, which lets it see through "
+        "dust clouds and detect light from the earliest galaxies")
+OTHER = ("Solid state batteries replace the liquid electrolyte with a ceramic or polymer layer, "
+         "promising higher energy density and better safety")
+
+
+def test_duplicate_paragraph_is_dropped_and_its_citation_kept():
+    first = f"{FACT} [1].\n\n### Sources\n[1] NASA: https://nasa.example"
+    second = f"{FACT} [1].\n\n{OTHER} [2].\n\n### Sources\n[1] ESA: https://esa.example\n[2] Lab: https://lab.example"
+
+    notes, stats = dedup_notes([first, second])
+
+    assert notes == [
+        f"{FACT} [1] [2].\n\n### Sources\n\n[1] NASA: https://nasa.example\n[2] ESA: https://esa.example",
+        f"{OTHER} [3].\n\n### Sources\n\n[3] Lab: https://lab.example",
+    ]
+    assert (stats.paragraphs_before, stats.paragraphs_after) == (3, 2)
+
+
+def test_note_without_sources_section_is_kept_unchanged():
+    sourced = f"{FACT} [1].\n\n### Sources\n[1] NASA: https://nasa.example"
+    unsourced = f"{FACT} [1].\n\n{OTHER} [2]."
+
+    notes, stats = dedup_notes([sourced, unsourced])
+
+    assert notes == [f"{FACT} [1].\n\n### Sources\n\n[1] NASA: https://nasa.example", unsourced]
+    assert (stats.paragraphs_before, stats.paragraphs_after) == (3, 3)
@@ -0,0 +1,52 @@
+import pytest
+
+from deep_research_from_scratch.novelty import (
+    max_similarities,
+    novelty_exhausted,
+    novelty_score,
+    similarity,
+    split_chunks,
+)
+
+SOLAR = ("Solar panels convert sunlight directly into electricity using photovoltaic cells made "
+         "from silicon, and their efficiency has improved steadily over the last decade")
+SOLAR_EDITED = ("Solar panels convert sunlight directly into electricity using photovoltaic cells made "
+                "from silicon, and their efficiency has improved steadily over the past ten years")
+WIND = ("Offshore wind farms place large turbines in shallow coastal waters where strong and "
+        "steady winds allow them to generate power for most hours of the year")
+
+
+def test_similarity_separates_near_duplicates_from_unrelated_text():
+    assert similarity(SOLAR, SOLAR) == 1.0
+    assert similarity(SOLAR, SOLAR_EDITED) > 0.6
+    assert similarity(SOLAR, WIND) < 0.1
+
+
+def test_max_similarities_takes_best_reference_per_chunk():
+    scores = max_similarities([SOLAR_EDITED, WIND], [SOLAR])
+
+    assert scores[0] > 0.6
+    assert scores[1] < 0.1
+    assert list(max_similarities([SOLAR], [])) == [0.0]
+
+
+def test_split_chunks_prefers_search_sources_over_paragraphs():
+    search_output = f"Search results:\n--- SOURCE 1: solar ---\n{SOLAR}\n\n{WIND}\n--- SOURCE 2: short ---\ntiny"
+
+    assert split_chunks(f"{SOLAR}\n\n{WIND}\n\ntiny") == [SOLAR, WIND]
+    assert len(split_chunks(search_output)) == 1
+
+
+def test_novelty_score():
+    assert novelty_score([SOLAR], []) == 1.0
+    assert novelty_score([SOLAR], [SOLAR]) == 0.0
+    assert novelty_score(["too short"], [SOLAR]) == 0.0
+    # Half of the new content repeats what was seen
+    assert novelty_score([f"{SOLAR_EDITED}\n\n{WIND}"], [SOLAR]) == pytest.approx(0.5 + (1 - similarity(SOLAR, SOLAR_EDITED)) / 2)
+
+
+def test_novelty_exhausted_needs_patience_rounds_below_threshold():
+    assert not novelty_exhausted([0.05], threshold=0.1, patience=2)
+    assert novelty_exhausted([0.9, 0.05, 0.02], threshold=0.1, patience=2)
+    assert not novelty_exhausted([0.05, 0.5], threshold=0.1, patience=2)
+    assert not novelty_exhausted([0.0, 0.0], threshold=0.1, patience=0)
@@ -0,0 +1,66 @@
+import asyncio
+import time
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langgraph.graph import END, START, MessagesState, StateGraph
+
+from deep_research_from_scratch.profiler import ResearchProfiler
+from deep_research_from_scratch.rate_limiter import ProviderRateLimiter
+
+
+def drained_limiter() -> ProviderRateLimiter:
+    """A 600 requests/minute limiter with an empty bucket: the next request waits ~0.1s."""
+    limiter = ProviderRateLimiter("test", requests_per_minute=600)
+    limiter._requests = 0.0
+    limiter._last_refill = time.monotonic()
+    return limiter
+
+
+def fake_model(limiter: ProviderRateLimiter) -> GenericFakeChatModel:
+    return GenericFakeChatModel(messages=iter([AIMessage(content="done")]), rate_limiter=limiter)
+
+
+def test_ainvoke_records_limiter_wait_on_llm_span():
+    limiter = drained_limiter()
+    model = fake_model(limiter)
+    profiler = ResearchProfiler()
+
+    asyncio.run(model.ainvoke("hi", config={"callbacks": [profiler]}))
+
+    [span] = [s for s in profiler.finished if s.kind == "llm"]
+    assert limiter.wait_time > 0.05
+    assert span.queue_time == limiter.wait_time
+
+
+def test_node_queue_time_includes_its_model_calls():
+    limiter = drained_limiter()
+    model = fake_model(limiter)
+
+    async def call_model(state: MessagesState):
+        return {"messages": [await model.ainvoke(state["messages"])]}
+
+    builder = StateGraph(MessagesState)
+    builder.add_node("call_model", call_model)
+    builder.add_edge(START, "call_model")
+    builder.add_edge("call_model", END)
+    graph = builder.compile()
+    profiler = ResearchProfiler()
+
+    asyncio.run(graph.ainvoke({"messages": [("user", "hi")]}, config={"callbacks": [profiler]}))
+
+    spans = {span.kind: span for span in profiler.finished}
+    assert spans["llm"].queue_time > 0.05
+    assert spans["node"].queue_time == spans["llm"].queue_time
+    assert spans["graph"].queue_time == spans["llm"].queue_time
+
+
+def test_sync_invoke_records_limiter_wait():
+    limiter = drained_limiter()
+    model = fake_model(limiter)
+    profiler = ResearchProfiler()
+
+    model.invoke("hi", config={"callbacks": [profiler]})
+
+    [span] = [s for s in profiler.finished if s.kind == "llm"]
+    assert span.queue_time > 0.05
@@ -0,0 +1,107 @@
+import asyncio
+import threading
+import time
+
+from deep_research_from_scratch import rate_limiter
+from deep_research_from_scratch.rate_limiter import (
+    PRIORITY_HIGH,
+    PRIORITY_NORMAL,
+    ProviderRateLimiter,
+    RateLimitedClient,
+    request_priority,
+)
+
+
+def drained(requests_per_minute=600, tokens_per_minute=None) -> ProviderRateLimiter:
+    limiter = ProviderRateLimiter("test", requests_per_minute=requests_per_minute, tokens_per_minute=tokens_per_minute)
+    limiter._requests = 0.0
+    limiter._last_refill = time.monotonic()
+    return limiter
+
+
+def test_high_priority_requests_are_admitted_first_under_contention():
+    limiter = drained()
+    admitted = []
+
+    async def request(label, priority, delay):
+        await asyncio.sleep(delay)
+        with request_priority(priority):
+            await limiter.aacquire()
+        admitted.append(label)
+
+    async def run():
+        # Normal requests queue up first; the supervisor's request arrives last
+        await asyncio.gather(
+            *(request(f"researcher-{i}", PRIORITY_NORMAL, 0.0) for i in range(3)),
+            request("supervisor", PRIORITY_HIGH, 0.01),
+        )
+
+    asyncio.run(run())
+    assert admitted == ["supervisor", "researcher-0", "researcher-1", "researcher-2"]
+    assert limiter.admitted == 4
+
+
+def test_sync_and_async_callers_share_one_queue():
+    limiter = drained()
+    admitted = []
+
+    def sync_request():
+        with request_priority(PRIORITY_HIGH):
+            limiter.acquire()
+        admitted.append("sync")
+
+    async def run():
+        waiter = asyncio.ensure_future(limiter.aacquire())
+        await asyncio.sleep(0.01)
+        thread = threading.Thread(target=sync_request)
+        thread.start()
+        await waiter
+        admitted.append("async")
+        await asyncio.to_thread(thread.join)
+
+    asyncio.run(run())
+    assert admitted == ["sync", "async"]
+
+
+def test_non_blocking_acquire_withdraws_from_the_queue():
+    limiter = drained()
+
+    assert limiter.acquire(blocking=False) is False
+    assert limiter.stats()["waiting"] == 0
+    assert limiter.acquire() is True
+
+
+def test_token_debt_delays_the_next_request():
+    limiter = ProviderRateLimiter("test", tokens_per_minute=6_000)
+    assert limiter.acquire()
+    limiter.charge_tokens(6_010)
+
+    started = time.monotonic()
+    limiter.acquire()
+
+    assert time.monotonic() - started >= 0.09
+    assert limiter.tokens_charged == 6_010
+
+
+def test_rate_limited_client_only_limits_selected_methods():
+    class Client:
+        version = "1"
+
+        def search(self, query):
+            return f"results for {query}"
+
+        def usage(self):
+            return "usage"
+
+    limiter = ProviderRateLimiter("tavily", requests_per_minute=600)
+    client = RateLimitedClient(Client(), limiter)
+
+    assert client.search("x") == "results for x"
+    assert client.usage() == "usage"
+    assert client.version == "1"
+    assert limiter.admitted == 1
+
+
+def test_disabled_rate_limiting_returns_no_limiter(monkeypatch):
+    monkeypatch.setattr(rate_limiter, "rate_limiting_enabled", False)
+    assert rate_limiter.get_rate_limiter("openai:gpt-4.1") is None
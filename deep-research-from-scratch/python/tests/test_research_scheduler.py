@@ -0,0 +1,72 @@
+import asyncio
+import time
+
+from deep_research_from_scratch.research_scheduler import ResearchScheduler
+
+
+def unit(delay: float, tokens: int = 0):
+    async def run():
+        await asyncio.sleep(delay)
+        return {"tokens_used": tokens}
+    return run
+
+
+def statuses(results):
+    return [stats.status for _, stats in results]
+
+
+def test_deadline_cancels_running_unit_and_skips_queued_ones():
+    scheduler = ResearchScheduler(max_concurrency=1, deadline=time.time() + 0.2)
+    units = [("u1", "fast", unit(0.0, 5)), ("u2", "slow", unit(10.0)), ("u3", "queued", unit(0.0))]
+
+    started = time.monotonic()
+    results = asyncio.run(scheduler.run(units))
+
+    assert time.monotonic() - started < 2
+    assert statuses(results) == ["completed", "cancelled", "skipped"]
+    assert results[0][0] == {"tokens_used": 5}
+    assert results[1][0] is None
+    assert results[1][1].error == "time budget exhausted"
+    assert scheduler.tokens_used == 5
+
+
+def test_token_budget_cancels_other_units_once_spent():
+    scheduler = ResearchScheduler(max_concurrency=2, token_budget=100, tokens_used=40)
+    units = [("u1", "spender", unit(0.05, 60)), ("u2", "slow", unit(10.0)), ("u3", "queued", unit(0.0))]
+
+    results = asyncio.run(scheduler.run(units))
+
+    assert statuses(results) == ["completed", "cancelled", "skipped"]
+    assert scheduler.tokens_used == 100
+    assert "token budget" in results[2][1].error
+
+
+def test_concurrency_limit_and_submission_order():
+    running = peak = 0
+
+    def tracked(value: int):
+        async def run():
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01 * (3 - value))
+            running -= 1
+            return {"value": value}
+        return run
+
+    scheduler = ResearchScheduler(max_concurrency=2)
+    results = asyncio.run(scheduler.run([(f"u{i}", "topic", tracked(i)) for i in range(3)]))
+
+    assert peak == 2
+    assert [result["value"] for result, _ in results] == [0, 1, 2]
+    assert statuses(results) == ["completed"] * 3
+
+
+def test_failed_unit_does_not_stop_the_others():
+    async def boom():
+        raise RuntimeError("search failed")
+
+    results = asyncio.run(ResearchScheduler(max_concurrency=2).run([("u1", "a", boom), ("u2", "b", unit(0.0))]))
+
+    assert statuses(results) == ["failed", "completed"]
+    assert results[0][1].error == "search failed"